@@ -0,0 +1,53 @@
+"""
+Benchmark of quiz scoring against a large career catalog.
+
+Builds the recommendation index and feature matrix over the app's careers
+replicated up to --careers entries, then times scoring every combination
+of quiz options (one matrix-vector product plus argpartition each).
+Run from the repository root:
+
+    python benchmarks/bench_feature_scoring.py [--careers N]
+"""
+
+import argparse
+import itertools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import utils
+from career_features import QUIZ_OPTIONS, FeatureMatrix
+from recommender import CareerIndex
+
+def build_catalog(size):
+    documents = utils.build_career_documents()
+    return [dict(documents[i % len(documents)], title=f"{documents[i % len(documents)]['title']} #{i}")
+            for i in range(size)]
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark quiz scoring against the career feature matrix.')
+    parser.add_argument('--careers', type=int, default=5000, help='catalog size')
+    parser.add_argument('--k', type=int, default=utils.RECOMMENDATION_COUNT, help='careers returned per submission')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    features = FeatureMatrix(CareerIndex(build_catalog(args.careers)))
+    print(f"Built {features.matrix.shape[0]} x {features.matrix.shape[1]} matrix in {time.perf_counter() - start:.2f}s")
+
+    fields = list(QUIZ_OPTIONS)
+    submissions = [dict(zip(fields, values)) for values in itertools.product(*(QUIZ_OPTIONS[field] for field in fields))]
+    timings = []
+    for answers in submissions:
+        start = time.perf_counter()
+        features.top_k(features.scores(answers), args.k)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    print(f"{len(submissions)} submissions: "
+          f"mean {sum(timings) / len(timings) * 1e6:.1f} us, "
+          f"p50 {timings[len(timings) // 2] * 1e6:.1f} us, "
+          f"p99 {timings[int(len(timings) * 0.99)] * 1e6:.1f} us")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Cold-start import profile of the app.
+
+Imports the app module in fresh interpreters under `python -X importtime`,
+reports the best total import time and the slowest top-level imports, and
+checks that the modules the app defers to first use (the Gemini SDK, the
+HTTP clients and NumPy) were not imported. Exits non-zero if one was.
+Run from the repository root:
+
+    python benchmarks/bench_import_time.py [--module M] [--runs N] [--top K]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules only the routes that need them should import
+DEFERRED_MODULES = ('google.generativeai', 'httpx', 'numpy')
+
+def profile(module):
+    """Import module in a fresh interpreter; return {name: (self us, cumulative us, depth)}."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    imports = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.setdefault(name.strip(), (int(self_us), int(cumulative_us), depth))
+    return imports
+
+def main():
+    parser = argparse.ArgumentParser(description='Profile the import time of the app.')
+    parser.add_argument('--module', default='career_app', help='module to import')
+    parser.add_argument('--runs', type=int, default=5, help='fresh interpreters to run (best is reported)')
+    parser.add_argument('--top', type=int, default=10, help='slowest top-level imports to list')
+    args = parser.parse_args()
+
+    runs = [profile(args.module) for _ in range(args.runs)]
+    best = min(runs, key=lambda imports: imports[args.module][1])
+    print(f"import {args.module}: best {best[args.module][1] / 1000:.1f} ms "
+          f"of {args.runs} runs, {len(best)} modules")
+
+    # Direct imports of the app module, and the app module's own body
+    top = [(name, cumulative) for name, (_, cumulative, depth) in best.items() if depth == 1]
+    top.sort(key=lambda item: -item[1])
+    for name, cumulative in top[:args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    imported = [name for name in DEFERRED_MODULES if name in best]
+    if imported:
+        print(f"FAIL: imported at startup: {', '.join(imported)}")
+        sys.exit(1)
+    print(f"OK: deferred until first use: {', '.join(DEFERRED_MODULES)}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Micro-benchmark of tech-career title classification.
+
+Compares the precompiled KeywordMatcher with the per-keyword substring scan
+it replaced, over a corpus of ONET occupation titles: the titles in the
+occupation snapshot when one has been built, plus a built-in sample,
+repeated up to --titles entries. Run from the repository root:
+
+    python benchmarks/bench_keyword_matcher.py [--titles N] [--repeat R]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import snapshot
+from keyword_matcher import TECH_KEYWORDS, tech_matcher
+
+# A sample of ONET occupation titles, tech and non-tech
+SAMPLE_TITLES = [
+    'Software Developers', 'Software Quality Assurance Analysts and Testers', 'Web Developers',
+    'Web and Digital Interface Designers', 'Computer Systems Analysts', 'Information Security Analysts',
+    'Database Administrators', 'Database Architects', 'Network and Computer Systems Administrators',
+    'Computer Network Architects', 'Computer User Support Specialists', 'Computer Programmers',
+    'Data Scientists', 'Data Warehousing Specialists', 'Computer and Information Research Scientists',
+    'Robotics Engineers', 'Electrical Engineers', 'Mechanical Engineers', 'Civil Engineers',
+    'Aerospace Engineering and Operations Technologists and Technicians', 'Statisticians',
+    'Blockchain Engineers', 'Geographic Information Systems Technologists and Technicians',
+    'Registered Nurses', 'Nursing Assistants', 'Home Health Aides', 'Retail Salespersons',
+    'Maintenance and Repair Workers, General', 'Aircraft Mechanics and Service Technicians',
+    'Chief Executives', 'Elementary School Teachers, Except Special Education', 'Accountants and Auditors',
+    'Cooks, Restaurant', 'Carpenters', 'Electricians', 'Plumbers, Pipefitters, and Steamfitters',
+    'Heavy and Tractor-Trailer Truck Drivers', 'Graphic Designers', 'Market Research Analysts and Marketing Specialists',
+    'Human Resources Specialists', 'Lawyers', 'Paralegals and Legal Assistants', 'Pharmacists',
+    'Physical Therapists', 'Dental Hygienists', 'Police and Sheriff\'s Patrol Officers', 'Firefighters',
+    'Video Game Designers', 'Penetration Testers', 'Digital Forensics Analysts', 'Clinical Data Managers',
+    'Automation Engineers', 'Mobile Equipment Mechanics', 'Virtual Reality Developers', 'Quantum Physicists'
+]
+
+# The per-call keyword list and substring scan KeywordMatcher replaced
+LEGACY_KEYWORDS = [keyword for keywords in TECH_KEYWORDS.values() for keyword in keywords]
+
+def legacy_matches(title):
+    title_lower = title.lower()
+    return any(keyword in title_lower for keyword in LEGACY_KEYWORDS)
+
+def build_corpus(size):
+    titles = list(dict.fromkeys(
+        SAMPLE_TITLES + [occupation['title'] for occupation in snapshot.get_snapshot()['occupations'].values()]
+    ))
+    return [titles[i % len(titles)] for i in range(size)], len(titles)
+
+def bench(name, func, corpus, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        matched = sum(1 for title in corpus if func(title))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{name:<28} {len(corpus) / best:>12,.0f} titles/s  {best * 1e6 / len(corpus):6.2f} us/title  {matched} matched")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark tech-career title classification.')
+    parser.add_argument('--titles', type=int, default=200000, help='corpus size')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per variant (best is reported)')
+    args = parser.parse_args()
+
+    corpus, distinct = build_corpus(args.titles)
+    print(f"{len(corpus)} titles ({distinct} distinct), {len(LEGACY_KEYWORDS)} keywords")
+    bench('substring scan (legacy)', legacy_matches, corpus, args.repeat)
+    bench('KeywordMatcher.matches', tech_matcher.matches, corpus, args.repeat)
+    bench('KeywordMatcher.categories', tech_matcher.categories, corpus, args.repeat)
+
+if __name__ == '__main__':
+    main()
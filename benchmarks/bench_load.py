@@ -0,0 +1,168 @@
+"""
+Offline load test of the app's main routes.
+
+Starts a local CareerOneStop stand-in and a fake Gemini model (see
+fake_services), points the app at them, then drives /quiz,
+/career/<name>, /volunteer and /chatbot/<career> through the Flask app
+from --concurrency threads. For each route it reports throughput,
+p50/p95/p99 latency and the upstream calls it caused. No credentials or
+network access are needed. Run from the repository root:
+
+    python benchmarks/bench_load.py [--requests N] [--concurrency C]
+        [--latency S] [--error-rate R] [--gemini-latency S] [--routes quiz,career,...]
+
+The on-disk caches and the occupation snapshot are off unless --disk-cache
+or --snapshot is given, so runs start from the same cold state.
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARKS_DIR))
+sys.path.insert(0, BENCHMARKS_DIR)
+
+from fake_services import Faults, FakeCareerOneStop, FakeChatModel
+
+ROUTES = ('quiz', 'career', 'volunteer', 'chatbot')
+UPSTREAM_CALLS = ('search', 'detail', 'videos', 'gemini')
+
+# Questions students ask the chatbot; repeats exercise the reply cache
+CHAT_QUESTIONS = [
+    'What does a typical day look like?',
+    'What should I study in high school?',
+    'How much does this job pay?',
+    'Which programming language should I learn first?',
+    'Are there internships for high school students?',
+    'What free courses can I take this summer?'
+]
+
+def configure_environment(args, base_url):
+    """Point the app at the fakes; must run before the app is imported."""
+    os.environ['CAREER_API_BASE_URL'] = base_url
+    os.environ.setdefault('CAREER_USER_ID', 'bench')
+    os.environ.setdefault('CAREER_API_TOKEN', 'bench')
+    os.environ.setdefault('GOOGLE_API_KEY', 'bench')
+    if not args.disk_cache:
+        os.environ['CAREER_CACHE_DIR'] = ''
+    if not args.snapshot:
+        os.environ['CAREER_SNAPSHOT_PATH'] = os.path.join(BENCHMARKS_DIR, 'no-snapshot.json.gz')
+
+def build_requests(route, count, rng, career_titles, quiz_options):
+    """Return count (method, path, form data) tuples for a route."""
+    requests = []
+    for _ in range(count):
+        career = rng.choice(career_titles)
+        if route == 'quiz':
+            answers = {field: rng.choice(list(options)) for field, options in quiz_options.items()}
+            requests.append(('POST', '/quiz', answers))
+        elif route == 'career':
+            requests.append(('GET', f"/career/{career.replace(' ', '-')}", None))
+        elif route == 'volunteer':
+            requests.append(('GET', f'/volunteer?career={career}&zip_code=95747&radius=25', None))
+        elif route == 'chatbot':
+            requests.append(('POST', f'/chatbot/{career}', {'message': rng.choice(CHAT_QUESTIONS)}))
+    return requests
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+def run_phase(app, requests, concurrency):
+    """Send requests from `concurrency` threads; return (latencies, errors, elapsed seconds)."""
+    local = threading.local()
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+
+    def send(request):
+        # One client (and so one session) per worker thread, like a returning visitor
+        client = getattr(local, 'client', None)
+        if client is None:
+            client = local.client = app.test_client()
+        method, path, data = request
+        start = time.perf_counter()
+        try:
+            response = client.open(path, method=method, data=data)
+            failed = response.status_code >= 500
+            response.close()
+        except Exception as e:
+            failed = True
+            print(f"Request to {path} failed: {str(e)}")
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+            if failed:
+                errors.append(path)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(send, requests))
+    return latencies, errors, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the app against local CareerOneStop and Gemini stand-ins.')
+    parser.add_argument('--requests', type=int, default=200, help='requests per route')
+    parser.add_argument('--concurrency', type=int, default=16, help='concurrent clients')
+    parser.add_argument('--routes', default=','.join(ROUTES), help='comma-separated routes to drive')
+    parser.add_argument('--latency', type=float, default=0.05, help='CareerOneStop latency in seconds')
+    parser.add_argument('--jitter', type=float, default=0.02, help='+/- latency jitter in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of CareerOneStop calls that fail with 503')
+    parser.add_argument('--gemini-latency', type=float, default=0.3, help='Gemini latency in seconds')
+    parser.add_argument('--gemini-error-rate', type=float, default=0.0, help='fraction of Gemini calls that fail')
+    parser.add_argument('--seed', type=int, default=1, help='random seed for the request mix and fault injection')
+    parser.add_argument('--disk-cache', action='store_true', help='keep the on-disk response caches enabled')
+    parser.add_argument('--snapshot', action='store_true', help='serve from the occupation snapshot when present')
+    args = parser.parse_args()
+
+    routes = [route.strip() for route in args.routes.split(',') if route.strip()]
+    unknown = [route for route in routes if route not in ROUTES]
+    if unknown:
+        parser.error(f"unknown routes: {', '.join(unknown)} (choose from {', '.join(ROUTES)})")
+
+    careeronestop = FakeCareerOneStop(Faults(args.latency, args.jitter, args.error_rate, seed=args.seed)).start()
+    chat_model = FakeChatModel(Faults(args.gemini_latency, args.gemini_latency / 5, args.gemini_error_rate, seed=args.seed))
+    configure_environment(args, careeronestop.base_url)
+
+    import career_app
+    from career_features import QUIZ_OPTIONS
+    from catalog import catalog
+
+    career_app.get_chat_model = lambda career: chat_model
+    app = career_app.app
+
+    rng = random.Random(args.seed)
+    career_titles = sorted({career['title'] for career in catalog.careers})
+    print(f"{len(routes)} routes x {args.requests} requests, {args.concurrency} clients, "
+          f"CareerOneStop {args.latency * 1000:.0f} ms +/- {args.jitter * 1000:.0f} ms ({args.error_rate:.0%} errors), "
+          f"Gemini {args.gemini_latency * 1000:.0f} ms ({args.gemini_error_rate:.0%} errors)")
+    print(f"{'route':<10} {'requests':>8} {'errors':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}  "
+          + ' '.join(f'{call:>7}' for call in UPSTREAM_CALLS))
+
+    try:
+        for route in routes:
+            requests = build_requests(route, args.requests, rng, career_titles, QUIZ_OPTIONS)
+            before = dict(careeronestop.calls, gemini=sum(chat_model.calls.values()))
+            latencies, errors, elapsed = run_phase(app, requests, args.concurrency)
+            after = dict(careeronestop.calls, gemini=sum(chat_model.calls.values()))
+            latencies.sort()
+            print(f"{route:<10} {len(latencies):>8} {len(errors):>6} {len(latencies) / elapsed:>8.1f} "
+                  f"{percentile(latencies, 0.50) * 1000:>8.1f} {percentile(latencies, 0.95) * 1000:>8.1f} "
+                  f"{percentile(latencies, 0.99) * 1000:>8.1f}  "
+                  + ' '.join(f'{after.get(call, 0) - before.get(call, 0):>7}' for call in UPSTREAM_CALLS))
+    finally:
+        careeronestop.stop()
+
+    if careeronestop.errors or chat_model.errors:
+        print(f"Injected failures: CareerOneStop {dict(careeronestop.errors)}, Gemini {dict(chat_model.errors)}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,187 @@
+"""
+Local stand-ins for CareerOneStop and Gemini, for benchmarks and load tests.
+
+FakeCareerOneStop is an HTTP server answering the three endpoints the app
+calls (OccupationList search, OccupationDetail and Videos) with sample
+payloads in CareerOneStop's response shapes (fixtures/careeronestop.json).
+FakeChatModel replaces the Gemini model object in-process. Both add a
+configurable latency and fail a configurable fraction of calls, and count
+every call they receive.
+"""
+
+import asyncio
+import copy
+import json
+import os
+import random
+import threading
+import time
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import unquote, urlsplit
+
+FIXTURES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'careeronestop.json')
+
+def load_fixtures(path=FIXTURES_PATH):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def onet_code_for(title):
+    """A stable, made-up ONET code for a search keyword."""
+    return f'15-{zlib.crc32(title.lower().encode("utf-8")) % 10000:04d}.00'
+
+class Faults:
+    """Latency and error injection shared by the fakes."""
+
+    def __init__(self, latency=0.05, jitter=0.0, error_rate=0.0, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def draw(self):
+        """Return (delay in seconds, whether this call fails)."""
+        with self._lock:
+            delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+            return delay, self._random.random() < self.error_rate
+
+class FakeCareerOneStop:
+    """A threaded HTTP server standing in for the CareerOneStop API.
+
+    Point the app at it by setting CAREER_API_BASE_URL to `base_url` before
+    utils is imported. `calls` counts requests per endpoint ('search',
+    'detail', 'videos') and `errors` the injected failures.
+    """
+
+    def __init__(self, faults=None, fixtures=None):
+        self.faults = faults or Faults()
+        self.fixtures = fixtures or load_fixtures()
+        self.calls = Counter()
+        self.errors = Counter()
+        self._lock = threading.Lock()
+        # Titles of the codes handed out so far, so details match the search that found them
+        self._titles = dict(self.fixtures['OccupationDetail']['RelatedOnetTitles'])
+
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                fake.handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.base_url = f'http://127.0.0.1:{self.server.server_port}/'
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name='fake-careeronestop', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def route(self, path):
+        """Map a request path to (endpoint, payload), or (None, None) if it isn't one we serve."""
+        parts = [unquote(part) for part in urlsplit(path).path.strip('/').split('/')]
+        # occupation/<user>/<keyword>/N/0/10 (keywords like "UI/UX Designer" span several parts)
+        if len(parts) >= 6 and parts[0] == 'occupation' and parts[-3:] == ['N', '0', '10']:
+            title = '/'.join(parts[2:-3])
+            code = onet_code_for(title)
+            with self._lock:
+                self._titles.setdefault(code, title)
+            return 'search', {'OccupationList': [{
+                'OnetTitle': title,
+                'OnetCode': code,
+                'OccupationDescription': f'Sample description of {title}.'
+            }]}
+        # occupation/<user>/<onet code>/<location>
+        if len(parts) == 4 and parts[0] == 'occupation':
+            code = parts[2]
+            detail = copy.deepcopy(self.fixtures['OccupationDetail'])
+            with self._lock:
+                detail['OnetTitle'] = self._titles.get(code, f'Occupation {code}')
+            detail['OnetCode'] = code
+            return 'detail', {'RecordCount': 1, 'OccupationDetail': [detail]}
+        # video/<user>/<onet code>
+        if len(parts) == 3 and parts[0] == 'video':
+            return 'videos', self.fixtures['Videos']
+        return None, None
+
+    def handle(self, request):
+        endpoint, payload = self.route(request.path)
+        with self._lock:
+            self.calls[endpoint or 'unknown'] += 1
+        delay, fail = self.faults.draw()
+        time.sleep(delay)
+        if endpoint is None:
+            status, body = 404, b'{}'
+        elif fail:
+            with self._lock:
+                self.errors[endpoint] += 1
+            status, body = 503, b'{"Message": "Service Unavailable"}'
+        else:
+            status, body = 200, json.dumps(payload).encode('utf-8')
+        request.send_response(status)
+        request.send_header('Content-Type', 'application/json')
+        request.send_header('Content-Length', str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
+
+class FakeChatModel:
+    """Stands in for a google.generativeai GenerativeModel.
+
+    Install it with `career_app.get_chat_model = lambda career: model`.
+    `calls` counts generation calls ('gemini' and 'gemini_stream').
+    """
+
+    def __init__(self, faults=None, reply=None, chunk_size=24):
+        self.faults = faults or Faults(latency=0.3)
+        self.reply = reply or load_fixtures()['ChatReply']
+        self.chunk_size = chunk_size
+        self.calls = Counter()
+        self.errors = Counter()
+        self._lock = threading.Lock()
+
+    def _start(self, call):
+        with self._lock:
+            self.calls[call] += 1
+        delay, fail = self.faults.draw()
+        if fail:
+            with self._lock:
+                self.errors[call] += 1
+        return delay, fail
+
+    async def generate_content_async(self, contents):
+        delay, fail = self._start('gemini')
+        await asyncio.sleep(delay)
+        if fail:
+            raise RuntimeError('503 The model is overloaded. Please try again later.')
+        return SimpleNamespace(text=self.reply)
+
+    def generate_content(self, contents, stream=False):
+        delay, fail = self._start('gemini_stream' if stream else 'gemini')
+        if fail:
+            time.sleep(delay)
+            raise RuntimeError('503 The model is overloaded. Please try again later.')
+        if not stream:
+            time.sleep(delay)
+            return SimpleNamespace(text=self.reply)
+
+        def chunks():
+            # Half the latency before the first chunk, the rest spread over the reply
+            pieces = [self.reply[i:i + self.chunk_size] for i in range(0, len(self.reply), self.chunk_size)]
+            time.sleep(delay / 2)
+            for piece in pieces:
+                time.sleep(delay / 2 / len(pieces))
+                yield SimpleNamespace(text=piece)
+        return chunks()
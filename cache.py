@@ -0,0 +1,516 @@
+"""
+Response caching for the CareerOneStop lookups.
+
+Caches implement the small CacheBackend interface. TTLCache keeps entries in
+process memory, SQLiteCache persists them on disk so that a fresh worker (or
+a serverless cold start) can reuse what earlier workers fetched, and
+TieredCache puts the former in front of the latter.
+
+Backends created with a `stale_ttl` keep entries that long past their expiry.
+get() no longer returns them, but get_stale() does, so a caller can fall back
+to the last known good value while the upstream is unavailable.
+"""
+
+import asyncio
+import functools
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+import settings
+
+# Directory for the persistent cache files; set to an empty string to keep caches in memory only
+CACHE_DIR = os.getenv('CAREER_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'careermatch-cache'))
+
+# Classes whose instances the persistent caches can store, by name (see json_type)
+JSON_TYPES = {}
+
+def json_type(cls):
+    """Class decorator letting instances be stored in a SQLiteCache.
+
+    The class must have a to_dict() method and a from_dict() classmethod.
+    Instances are written as {"__type__": name, "fields": to_dict()} and
+    rebuilt on read, wherever they are nested in the cached value.
+    """
+    JSON_TYPES[cls.__name__] = cls
+    return cls
+
+def _encode_object(value):
+    cls = JSON_TYPES.get(type(value).__name__)
+    if cls is None or not isinstance(value, cls):
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+    return {'__type__': type(value).__name__, 'fields': value.to_dict()}
+
+def _decode_object(data):
+    cls = JSON_TYPES.get(data.get('__type__')) if len(data) == 2 and 'fields' in data else None
+    return data if cls is None else cls.from_dict(data['fields'])
+
+def encode_value(value):
+    """Serialize a cached value to JSON, including instances of json_type classes."""
+    return json.dumps(value, default=_encode_object)
+
+def decode_value(text):
+    """Parse a value written by encode_value()."""
+    return json.loads(text, object_hook=_decode_object)
+
+def normalize_key(text):
+    """Normalize a keyword or code so equivalent lookups share one cache entry."""
+    return ' '.join(str(text).lower().split())
+
+class CacheBackend:
+    """Interface every cache backend implements."""
+
+    def get(self, key, default=None):
+        """Return the cached value for key, or default if it is missing or expired."""
+        raise NotImplementedError
+
+    def get_stale(self, key, default=None):
+        """Return the value for key even if it expired within the stale window, or default."""
+        return self.get(key, default)
+
+    def contains(self, key):
+        """Whether key has a live entry, without counting a hit or miss or refreshing its LRU position."""
+        raise NotImplementedError
+
+    def set(self, key, value, ttl=None):
+        """Store a value for ttl seconds (the backend default if None)."""
+        raise NotImplementedError
+
+    def update(self, key, func, ttl=None):
+        """Store func(current value or None) for key and return it.
+
+        Backends override this to make the read-modify-write atomic.
+        """
+        value = func(self.get(key))
+        self.set(key, value, ttl)
+        return value
+
+    def delete(self, key):
+        """Remove the entry for key, if any."""
+        raise NotImplementedError
+
+    def clear(self):
+        """Drop every entry."""
+        raise NotImplementedError
+
+    def stats(self):
+        """Return usage counters for this cache."""
+        raise NotImplementedError
+
+    async def aget(self, key, default=None):
+        """get() for callers on an event loop; backends doing disk I/O run it in a thread."""
+        return self.get(key, default)
+
+    async def aset(self, key, value, ttl=None):
+        """set() for callers on an event loop; backends doing disk I/O run it in a thread."""
+        self.set(key, value, ttl)
+
+    async def aget_stale(self, key, default=None):
+        """get_stale() for callers on an event loop."""
+        return self.get_stale(key, default)
+
+class TTLCache(CacheBackend):
+    """A thread-safe, size-bounded LRU cache whose entries expire after a TTL."""
+
+    def __init__(self, maxsize=256, ttl=3600, stale_ttl=0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        """Return the cached value for key, or default if it is missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            now = time.monotonic()
+            if expires_at <= now:
+                # Expired entries stay around (still LRU bounded) for get_stale()
+                if expires_at + self.stale_ttl <= now:
+                    del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def get_stale(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[1] + self.stale_ttl <= time.monotonic():
+                return default
+            return entry[0]
+
+    def contains(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and entry[1] > time.monotonic()
+
+    def set(self, key, value, ttl=None):
+        """Store a value, evicting the least recently used entries when full."""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def update(self, key, func, ttl=None):
+        with self._lock:
+            entry = self._data.get(key)
+            current = entry[0] if entry is not None and entry[1] > time.monotonic() else None
+            value = func(current)
+            self._data[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl))
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        """Return the hit/miss/eviction counters for this cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+class SQLiteCache(CacheBackend):
+    """A persistent cache in a SQLite file, safe to share between worker processes.
+
+    Keys and values must be JSON serializable (values may also contain
+    instances of json_type classes). Every write is a single atomic
+    statement, WAL journaling lets readers in other processes proceed while
+    one process writes, and every `compact_every` writes the table is pruned
+    of expired entries and trimmed to `max_entries`.
+    """
+
+    def __init__(self, path, ttl=3600, max_entries=5000, compact_every=64, stale_ttl=0):
+        self.path = path
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.compact_every = compact_every
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _connect(self):
+        """Get this thread's connection, creating the database on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS entries ('
+                'key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS entries_expires_at ON entries (expires_at)')
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def get_entry(self, key, stale=False):
+        """Return (value, expires_at) for a live entry (or one in the stale window), or None."""
+        try:
+            row = self._connect().execute(
+                'SELECT value, expires_at FROM entries WHERE key = ? AND expires_at > ?',
+                (json.dumps(key), time.time() - (self.stale_ttl if stale else 0))
+            ).fetchone()
+        except (sqlite3.Error, OSError) as e:
+            print(f"Error reading cache {self.path}: {str(e)}")
+            self._count('errors')
+            return None
+        if row is None:
+            self._count('misses')
+            return None
+        self._count('hits')
+        return decode_value(row[0]), row[1]
+
+    def get(self, key, default=None):
+        entry = self.get_entry(key)
+        return default if entry is None else entry[0]
+
+    def contains(self, key):
+        try:
+            row = self._connect().execute(
+                'SELECT 1 FROM entries WHERE key = ? AND expires_at > ?', (json.dumps(key), time.time())
+            ).fetchone()
+        except (sqlite3.Error, OSError) as e:
+            print(f"Error reading cache {self.path}: {str(e)}")
+            self._count('errors')
+            return False
+        return row is not None
+
+    def get_stale(self, key, default=None):
+        entry = self.get_entry(key, stale=True)
+        return default if entry is None else entry[0]
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        try:
+            conn = self._connect()
+            conn.execute(
+                'INSERT OR REPLACE INTO entries (key, value, expires_at) VALUES (?, ?, ?)',
+                (json.dumps(key), encode_value(value), expires_at)
+            )
+            self._wrote(conn)
+        except (sqlite3.Error, OSError, TypeError, ValueError) as e:
+            print(f"Error writing cache {self.path}: {str(e)}")
+            self._count('errors')
+
+    def update(self, key, func, ttl=None):
+        """Atomically store func(current value or None), even across processes.
+
+        The read and the write happen in one BEGIN IMMEDIATE transaction, so
+        concurrent updates of the same key are serialized instead of lost.
+        Returns the new value, or None if the database couldn't be written.
+        """
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        try:
+            conn = self._connect()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = conn.execute(
+                    'SELECT value FROM entries WHERE key = ? AND expires_at > ?',
+                    (json.dumps(key), time.time())
+                ).fetchone()
+                value = func(None if row is None else decode_value(row[0]))
+                conn.execute(
+                    'INSERT OR REPLACE INTO entries (key, value, expires_at) VALUES (?, ?, ?)',
+                    (json.dumps(key), encode_value(value), expires_at)
+                )
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            self._wrote(conn)
+            return value
+        except (sqlite3.Error, OSError, TypeError, ValueError) as e:
+            print(f"Error writing cache {self.path}: {str(e)}")
+            self._count('errors')
+            return None
+
+    def _wrote(self, conn):
+        """Count a write and compact the table every compact_every writes."""
+        with self._lock:
+            self._writes += 1
+            compact = self._writes % self.compact_every == 0
+        if compact:
+            self.compact(conn)
+
+    def compact(self, conn=None):
+        """Delete entries past their stale window, then the soonest-to-expire ones beyond max_entries."""
+        conn = conn or self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('DELETE FROM entries WHERE expires_at <= ?', (time.time() - self.stale_ttl,))
+            conn.execute(
+                'DELETE FROM entries WHERE key NOT IN '
+                '(SELECT key FROM entries ORDER BY expires_at DESC LIMIT ?)',
+                (self.max_entries,)
+            )
+            conn.execute('COMMIT')
+        except sqlite3.Error:
+            conn.execute('ROLLBACK')
+            raise
+
+    def delete(self, key):
+        try:
+            self._connect().execute('DELETE FROM entries WHERE key = ?', (json.dumps(key),))
+        except (sqlite3.Error, OSError) as e:
+            print(f"Error deleting from cache {self.path}: {str(e)}")
+
+    def clear(self):
+        try:
+            self._connect().execute('DELETE FROM entries')
+        except (sqlite3.Error, OSError) as e:
+            print(f"Error clearing cache {self.path}: {str(e)}")
+
+    async def aget(self, key, default=None):
+        return await asyncio.get_running_loop().run_in_executor(None, self.get, key, default)
+
+    async def aset(self, key, value, ttl=None):
+        await asyncio.get_running_loop().run_in_executor(None, self.set, key, value, ttl)
+
+    async def aget_stale(self, key, default=None):
+        return await asyncio.get_running_loop().run_in_executor(None, self.get_stale, key, default)
+
+    def __len__(self):
+        return self._connect().execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+    def stats(self):
+        try:
+            size = len(self)
+        except (sqlite3.Error, OSError):
+            size = None
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'path': self.path,
+                'size': size,
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'errors': self.errors,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+class TieredCache(CacheBackend):
+    """An in-memory cache in front of a persistent one.
+
+    Reads try memory first and promote disk hits into memory for the rest of
+    their lifetime. Writes go to both.
+    """
+
+    def __init__(self, memory, disk):
+        self.memory = memory
+        self.disk = disk
+
+    def get(self, key, default=None):
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+        entry = self.disk.get_entry(key)
+        if entry is None:
+            return default
+        value, expires_at = entry
+        self.memory.set(key, value, ttl=max(0, expires_at - time.time()))
+        return value
+
+    def contains(self, key):
+        return self.memory.contains(key) or self.disk.contains(key)
+
+    def set(self, key, value, ttl=None):
+        self.memory.set(key, value, ttl)
+        self.disk.set(key, value, ttl)
+
+    def update(self, key, func, ttl=None):
+        # The disk tier is the source of truth for a read-modify-write
+        value = self.disk.update(key, func, ttl)
+        if value is not None:
+            self.memory.set(key, value, ttl)
+        return value
+
+    async def aget(self, key, default=None):
+        # Memory hits are answered inline; only the disk lookup leaves the event loop
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+        entry = await asyncio.get_running_loop().run_in_executor(None, self.disk.get_entry, key)
+        if entry is None:
+            return default
+        value, expires_at = entry
+        self.memory.set(key, value, ttl=max(0, expires_at - time.time()))
+        return value
+
+    async def aset(self, key, value, ttl=None):
+        self.memory.set(key, value, ttl)
+        await self.disk.aset(key, value, ttl)
+
+    def get_stale(self, key, default=None):
+        value = self.memory.get_stale(key)
+        if value is not None:
+            return value
+        return self.disk.get_stale(key, default)
+
+    async def aget_stale(self, key, default=None):
+        value = self.memory.get_stale(key)
+        if value is not None:
+            return value
+        return await self.disk.aget_stale(key, default)
+
+    def delete(self, key):
+        self.memory.delete(key)
+        self.disk.delete(key)
+
+    def clear(self):
+        self.memory.clear()
+        self.disk.clear()
+
+    def stats(self):
+        return {'memory': self.memory.stats(), 'disk': self.disk.stats()}
+
+def create_cache(name, maxsize, ttl, max_disk_entries=5000, stale_ttl=0):
+    """Create the cache for one endpoint, backed by disk when CACHE_DIR is set."""
+    memory = TTLCache(maxsize, ttl, stale_ttl)
+    if not CACHE_DIR:
+        return memory
+    disk = SQLiteCache(os.path.join(CACHE_DIR, f'{name}.sqlite3'), ttl, max_disk_entries, stale_ttl=stale_ttl)
+    return TieredCache(memory, disk)
+
+def async_cached(cache, key_func, flight=None, stale_on=(), mark_stale=None):
+    """Decorator caching a coroutine function's non-None results under key_func(*args).
+
+    With an AsyncSingleFlight, concurrent misses for the same key share one call.
+    Lookups go through the cache's aget/aset so disk tiers never block the event loop.
+    If the function raises one of the `stale_on` exceptions, the last known
+    good value (see get_stale) is returned instead, passed through
+    `mark_stale` if given; the exception propagates when there is none.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = key_func(*args, **kwargs)
+            value = await cache.aget(key)
+            if value is not None:
+                return value
+
+            async def load():
+                try:
+                    value = await func(*args, **kwargs)
+                except stale_on:
+                    value = await cache.aget_stale(key)
+                    if value is None:
+                        raise
+                    return mark_stale(value) if mark_stale else value
+                if value is not None:
+                    await cache.aset(key, value)
+                return value
+
+            if flight is None:
+                return await load()
+            return await flight.do(key, load)
+        wrapper.cache = cache
+        wrapper.flight = flight
+        return wrapper
+    return decorator
@@ -1,25 +1,65 @@
-from flask import Flask, request, render_template, redirect, url_for, session
-import google.generativeai as genai
+from flask import Flask, Response, g, jsonify, make_response, request, render_template, redirect, url_for, session
+from flask import before_render_template, template_rendered
+import contextvars
+import functools
+import hashlib
 import os
+import threading
+import time
 from datetime import datetime
-from dotenv import load_dotenv
+import settings
+from cache import normalize_key
+from catalog import PAGE_SIZE, catalog
+from chat_cache import ChatResponseCache
+from chat_store import create_chat_store
+from http_client import run_blocking, run_coroutine
+import metrics
+from metrics import track_upstream
+from snapshot import ONET_CODE_PATTERN, get_snapshot
 import utils
 import json
 import secrets
 
-# Load environment variables
-load_dotenv()
+# Gemini model used for the chatbot
+GEMINI_MODEL_NAME = 'gemini-2.0-flash-lite-001'  # Using stable version
 
-# Configure Google's Gemini API
-GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY')
-genai.configure(api_key=GOOGLE_API_KEY)
+# Number of previous chat messages sent along with each new message
+CHAT_HISTORY_WINDOW = 6
 
-# Initialize the Gemini model
-model = genai.GenerativeModel('gemini-2.0-flash-lite-001')  # Using stable version
+# Shared pages are revalidated by browsers after PAGE_MAX_AGE seconds and by the edge cache after PAGE_SHARED_MAX_AGE
+PAGE_MAX_AGE = int(os.getenv('CAREER_PAGE_MAX_AGE', '300'))
+PAGE_SHARED_MAX_AGE = int(os.getenv('CAREER_PAGE_SHARED_MAX_AGE', '3600'))
 
-app = Flask(__name__)
+# The Gemini SDK, imported and configured on first use (see get_genai)
+_genai = None
+_genai_lock = threading.Lock()
+
+class CareerApp(Flask):
+    """Flask app whose async views run on the shared background event loop.
+
+    Flask's default runs each async view in a new event loop, but the
+    upstream clients live on the one loop started by http_client, so the
+    views await the async lookups there directly. Whatever an async view
+    does between awaits holds up every other request's upstream I/O, so
+    blocking work (stores, snapshot reads, template rendering) goes through
+    run_blocking and render_page.
+    """
+
+    def async_to_sync(self, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return run_coroutine(func(*args, **kwargs))
+        return wrapper
+
+app = CareerApp(__name__)
 app.secret_key = secrets.token_hex(16)
 
+# Chat messages live server-side; the session cookie only holds the conversation ID
+chat_store = create_chat_store()
+
+# Replies to repeated questions, shared across users of the same career
+chat_response_cache = ChatResponseCache()
+
 # Add these constants after the app initialization
 BADGES = {
     'quiz_completed': {
@@ -44,6 +84,9 @@ BADGES = {
     }
 }
 
+# Badges awarded from the browser, for pages that are shared by every user
+CLIENT_BADGES = frozenset(['career_researched'])
+
 # ------ Helper Functions ------
 
 def format_response(response_text):
@@ -59,57 +102,157 @@ def format_response(response_text):
     
     return formatted_text
 
-def get_chat_response(message, career, chat_history):
+class StreamingFormatter:
+    """Apply format_response to a response that arrives in pieces.
+
+    The pieces returned for every chunk add up to exactly what format_response
+    returns for the complete text. Whitespace is held back until it's known
+    not to be at the end of a paragraph.
+    """
+
+    def __init__(self):
+        self.line_started = False
+        self.emitted_any = False
+        self.pending_space = ''
+
+    def feed(self, text):
+        """Return the formatted text that can be emitted for the next chunk."""
+        out = []
+        for char in text.replace('*', '').replace('_', '').replace('`', ''):
+            if char == '\n':
+                # Trailing whitespace is stripped from each paragraph
+                self.line_started = False
+                self.pending_space = ''
+            elif char.isspace():
+                if self.line_started:
+                    self.pending_space += char
+            else:
+                if not self.line_started:
+                    if self.emitted_any:
+                        out.append('\n\n')
+                    self.line_started = True
+                    self.emitted_any = True
+                out.append(self.pending_space)
+                out.append(char)
+                self.pending_space = ''
+        return ''.join(out)
+
+def build_system_instruction(career):
+    """Build the career counselor system instruction for a career."""
+    # Enhanced context with better role-prompting and actionable guidance
+    context = [
+        "You are a friendly high school career counselor with expertise in career guidance and development.",
+        f"Focus on providing specific, actionable advice for careers in {career}.",
+        "Structure your responses to include:",
+        "1. A clear, concise answer to the student's question",
+        "2. 2-3 specific, actionable steps they can take",
+        "3. At least one free or low-cost resource (course, workshop, or local opportunity)",
+        "4. A relevant question to encourage further exploration",
+        "Keep responses under 150 words but make them specific and actionable.",
+        "Always include concrete examples and real-world applications.",
+        "Consider current market trends and recent developments in the field.",
+        "Include information about emerging technologies and industry changes.",
+        "Mention any recent news or developments relevant to the career field."
+    ]
+    return '\n'.join(context)
+
+def get_genai():
+    """Get the configured Gemini SDK, importing it on first use.
+
+    The SDK takes most of a cold start to import, and only the chatbot needs
+    it. Importing it blocks, so async callers get their model through
+    run_blocking (see get_chat_response_async).
+    """
+    global _genai
+    if _genai is None:
+        with _genai_lock:
+            if _genai is None:
+                import google.generativeai as genai
+                genai.configure(api_key=os.getenv('GOOGLE_API_KEY'))
+                _genai = genai
+    return _genai
+
+@functools.lru_cache(maxsize=64)
+def get_chat_model(career):
+    """Get a Gemini model carrying the system instruction for a career."""
+    return get_genai().GenerativeModel(GEMINI_MODEL_NAME, system_instruction=build_system_instruction(career))
+
+def build_chat_contents(message, chat_history):
+    """Build the structured conversation for one generation call."""
+    # For flash-lite model, limit the chat history to the last 3 exchanges
+    recent_history = chat_history[-CHAT_HISTORY_WINDOW:]
+
+    contents = []
+    for msg in recent_history:
+        role = 'model' if msg['role'] == 'assistant' else 'user'
+        contents.append({'role': role, 'parts': [msg['content']]})
+    contents.append({'role': 'user', 'parts': [message]})
+    return contents
+
+async def get_chat_response_async(message, career, chat_history):
     """Get a response from the Gemini model with proper context and history."""
     try:
-        # Create a new chat
-        chat = model.start_chat(history=[])
-        
-        # Enhanced context with better role-prompting and actionable guidance
-        context = [
-            "You are a friendly high school career counselor with expertise in career guidance and development.",
-            f"Focus on providing specific, actionable advice for careers in {career}.",
-            "Structure your responses to include:",
-            "1. A clear, concise answer to the student's question",
-            "2. 2-3 specific, actionable steps they can take",
-            "3. At least one free or low-cost resource (course, workshop, or local opportunity)",
-            "4. A relevant question to encourage further exploration",
-            "Keep responses under 150 words but make them specific and actionable.",
-            "Always include concrete examples and real-world applications.",
-            "Consider current market trends and recent developments in the field.",
-            "Include information about emerging technologies and industry changes.",
-            "Mention any recent news or developments relevant to the career field."
-        ]
-        
-        # Send context
-        response = chat.send_message('\n'.join(context))
-        if not response or not response.text:
-            print("Empty response from context")
-            raise ValueError("Empty response from context")
-        
-        # For flash-lite model, limit the chat history to the last 3 exchanges
-        recent_history = chat_history[-6:] if len(chat_history) > 6 else chat_history
-        
-        # Add recent chat history
-        for msg in recent_history:
-            response = chat.send_message(msg['content'])
-            if not response or not response.text:
-                print(f"Empty response from message: {msg['content']}")
-                raise ValueError(f"Empty response from message: {msg['content']}")
-        
-        # Get response for the current message
-        response = chat.send_message(message)
-        
+        # Repeated questions about the same career are answered from the cache
+        cached_response = chat_response_cache.get(career, message, chat_history)
+        if cached_response is not None:
+            return cached_response
+
+        # The first model built imports the SDK, which would stall the shared loop
+        model = await run_blocking(get_chat_model, career)
+
+        # System instruction, recent history and the new message go out in a single call
+        with track_upstream('gemini'):
+            response = await model.generate_content_async(build_chat_contents(message, chat_history))
+
         if not response or not response.text:
             print("Empty response from API")
             raise ValueError("Empty response from API")
         
-        return format_response(response.text)
+        response_text = format_response(response.text)
+        chat_response_cache.set(career, message, chat_history, response_text)
+        return response_text
         
     except Exception as e:
         print(f"Error in get_chat_response: {str(e)}")
         return f"I'm having trouble connecting to the AI service right now. The error is: {str(e)}. Please try again in a moment."
 
+def get_chat_response(message, career, chat_history):
+    """Get a response from the Gemini model with proper context and history."""
+    return run_coroutine(get_chat_response_async(message, career, chat_history))
+
+def stream_chat_response(message, career, chat_history):
+    """Yield the raw text of a Gemini response as it is generated."""
+    with track_upstream('gemini_stream'):
+        response = get_chat_model(career).generate_content(build_chat_contents(message, chat_history), stream=True)
+        for chunk in response:
+            try:
+                text = chunk.text
+            except ValueError:
+                # Chunks without text parts (e.g. the final finish-reason chunk)
+                continue
+            if text:
+                yield text
+
+def format_sse(data, event=None):
+    """Format one server-sent event carrying JSON data."""
+    lines = [f"event: {event}"] if event else []
+    lines.append(f"data: {json.dumps(data)}")
+    return '\n'.join(lines) + '\n\n'
+
+def get_conversation_id():
+    """Get this session's conversation ID, creating one if needed."""
+    if 'conversation_id' not in session:
+        session['conversation_id'] = secrets.token_urlsafe(16)
+    return session['conversation_id']
+
+def chat_message(role, content):
+    """Build a chat history entry stamped with the current time."""
+    return {
+        'role': role,
+        'content': content,
+        'time': datetime.now().strftime('%I:%M %p')
+    }
+
 def get_user_progress():
     """Get or initialize user progress from session."""
     if 'progress' not in session:
@@ -129,6 +272,88 @@ def award_badge(badge_id):
         return True
     return False
 
+@functools.lru_cache(maxsize=1)
+def get_app_version():
+    """Get the version of the rendering code: the deploy's commit, if known, and the templates."""
+    digest = hashlib.sha1((os.getenv('CAREER_APP_VERSION') or os.getenv('VERCEL_GIT_COMMIT_SHA', '')).encode('utf-8'))
+    for name in sorted(app.jinja_env.list_templates()):
+        source = app.jinja_loader.get_source(app.jinja_env, name)[0]
+        digest.update(name.encode('utf-8'))
+        digest.update(source.encode('utf-8'))
+    return digest.hexdigest()
+
+def page_etag(*versions):
+    """Build a page's ETag from the versions of the code and data it is rendered from."""
+    parts = (get_app_version(),) + tuple(str(version) for version in versions)
+    return hashlib.sha1('\0'.join(parts).encode('utf-8')).hexdigest()[:32]
+
+def shared_page(response, etag):
+    """Mark a response as the same for every user, so browsers and the edge cache can keep it."""
+    response = make_response(response)
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = PAGE_MAX_AGE
+    response.cache_control.s_maxage = PAGE_SHARED_MAX_AGE
+    return response
+
+def not_modified(etag):
+    """Return a 304 response if the client already has this version of the page, otherwise None."""
+    if request.if_none_match.contains_weak(etag):
+        return shared_page(Response(status=304), etag)
+    return None
+
+# ------ Metrics ------
+
+@app.before_request
+def start_request_metrics():
+    # Label by URL rule rather than path, so the number of series stays bounded
+    g.metrics_route = request.url_rule.rule if request.url_rule else 'unmatched'
+    g.request_started = time.perf_counter()
+    metrics.REQUESTS_IN_FLIGHT.labels(g.metrics_route).inc()
+
+def record_request_metrics(route, method, started, failed):
+    metrics.REQUEST_DURATION.labels(route, method).observe(time.perf_counter() - started)
+    if failed:
+        metrics.REQUEST_ERRORS.labels(route, method).inc()
+    metrics.REQUESTS_IN_FLIGHT.labels(route).dec()
+
+@app.after_request
+def record_response_status(response):
+    g.response_status = response.status_code
+    if response.is_streamed and 'request_started' in g:
+        # A streamed body (the chat SSE reply) is sent after teardown, so the request is
+        # counted once the server closes the response, i.e. when the stream has finished
+        response.call_on_close(functools.partial(
+            record_request_metrics, g.metrics_route, request.method, g.pop('request_started'),
+            response.status_code >= 500
+        ))
+    return response
+
+@app.teardown_request
+def finish_request_metrics(error):
+    started = g.pop('request_started', None)
+    if started is None:
+        return
+    record_request_metrics(g.metrics_route, request.method, started,
+                           error is not None or g.get('response_status', 500) >= 500)
+
+def start_render_metrics(sender, template, context, **extra):
+    g.setdefault('render_started', {})[template.name] = time.perf_counter()
+
+def finish_render_metrics(sender, template, context, **extra):
+    started = g.get('render_started', {}).pop(template.name, None)
+    if started is not None:
+        metrics.TEMPLATE_RENDER_DURATION.labels(template.name).observe(time.perf_counter() - started)
+
+before_render_template.connect(start_render_metrics, app)
+template_rendered.connect(finish_render_metrics, app)
+
+async def render_page(template_name, **context):
+    """Render a template in a worker thread, keeping the shared event loop free for upstream I/O."""
+    # The copied context carries the current app and request into the thread
+    render = functools.partial(render_template, template_name, **context)
+    return await run_blocking(contextvars.copy_context().run, render)
+
 # ------ Routes ------
 
 @app.route('/')
@@ -148,7 +373,7 @@ def index():
                          all_badges=BADGES)
 
 @app.route('/quiz', methods=['GET', 'POST'])
-def quiz():
+async def quiz():
     if request.method == 'POST':
         interests = request.form.get('interests', '')
         strengths = request.form.get('strengths', '')
@@ -158,94 +383,61 @@ def quiz():
         # Store the user's programming interest in the session for later use
         session['programming_interest'] = interests
         
-        # Enhance the inputs with tech-specific context
-        tech_interests = {
-            'web': 'web development, frontend, backend, full stack',
-            'mobile': 'mobile app development, iOS, Android',
-            'ai': 'artificial intelligence, machine learning, deep learning',
-            'data': 'data science, data analytics, big data',
-            'game': 'game development, game design, game engines',
-            'security': 'cybersecurity, information security, network security',
-            'cloud': 'cloud computing, DevOps, infrastructure',
-            'embedded': 'embedded systems, IoT, hardware programming'
-        }
-        
-        tech_skills = {
-            'frontend': 'HTML, CSS, JavaScript, React, Angular, Vue',
-            'backend': 'Python, Java, Node.js, PHP, Ruby',
-            'database': 'SQL, NoSQL, MongoDB, PostgreSQL',
-            'algorithms': 'algorithms, data structures, problem solving',
-            'networking': 'networking, security protocols, system administration',
-            'ui': 'UI/UX design, user interface, user experience',
-            'mobile': 'iOS development, Android development, mobile apps',
-            'ai': 'machine learning, neural networks, AI frameworks'
-        }
-        
-        # Get the enhanced descriptions
-        enhanced_interests = tech_interests.get(interests, interests)
-        enhanced_skills = tech_skills.get(skills, skills)
-        
-        # Add tech-specific context to strengths
-        enhanced_strengths = f"{strengths} in technology and programming"
-        
-        # Add tech-specific context to personality
-        enhanced_personality = f"{personality} in a technology environment"
-        
-        # Get career recommendations from the CareerMatch API
-        careers = utils.get_career_recommendations(
-            enhanced_interests,
-            enhanced_strengths,
-            enhanced_skills,
-            enhanced_personality
-        )
-        
-        # Filter for tech-related careers if possible
-        tech_keywords = ['software', 'programming', 'developer', 'engineer', 'data', 'security', 
-                        'cloud', 'devops', 'ai', 'machine learning', 'cyber', 'web', 'mobile']
-        
-        # If the API returns career titles, try to filter for tech careers
-        if isinstance(careers, list) and careers and isinstance(careers[0], dict) and 'title' in careers[0]:
-            tech_careers = []
-            for career in careers:
-                title = career['title'].lower()
-                if any(keyword in title for keyword in tech_keywords):
-                    tech_careers.append(career)
-            
-            # If we found tech careers, use those
-            if tech_careers:
-                careers = tech_careers
-        
-        # Get career data for each recommended career
-        career_data = {}
-        for career in careers:
-            if isinstance(career, dict) and 'title' in career:
-                career_title = career['title']
-            else:
-                career_title = career
-            career_data[career_title] = utils.get_career_data(career_title)
+        # Score the answers and fetch every recommended career's data, or reuse the results for the same answers
+        careers, career_data = await utils.get_quiz_results_async(interests, strengths, skills, personality)
         
         # Award badge for completing quiz
         award_badge('quiz_completed')
         
-        return render_template('results.html', careers=careers, career_data=career_data)
+        return await render_page('results.html', careers=careers, career_data=career_data)
     
-    return render_template('quiz.html')
+    return await render_page('quiz.html')
 
 @app.route('/career/<career_name>')
-def career_details(career_name):
-    # Award badge for researching a career
-    award_badge('career_researched')
-    
+async def career_details(career_name):
     # Convert URL-friendly format back to original career name
     original_career_name = career_name.replace('-', ' ')
+    onet_code = request.args.get('code', '')
     
-    # Get career data from the CareerMatch API
-    career_data = utils.get_career_data(original_career_name)
+    # The first snapshot read unzips the file, so it runs off the loop like every other snapshot read
+    occupation_snapshot = await run_blocking(get_snapshot)
+
+    # The page is the same for every user until the data behind it changes, so a revisit
+    # is answered before any lookup. Occupation data is refetched once per detail cache TTL.
+    etag = page_etag('career', normalize_key(original_career_name), onet_code, catalog.version,
+                     occupation_snapshot.get('built_at', ''), int(time.time() // utils.DETAIL_CACHE_TTL))
+    response = not_modified(etag)
+    if response is not None:
+        return response
+    
+    # Get career data from the CareerMatch API, skipping the title search when the link carries a valid ONET code
+    if ONET_CODE_PATTERN.match(onet_code):
+        career_data = await utils.get_career_data_by_code_async(onet_code)
+    else:
+        career_data = await utils.get_career_data_async(original_career_name)
     
     if not career_data:
         return redirect(url_for('index'))
     
-    return render_template('career_details.html', career=original_career_name, career_data=career_data)
+    html = await render_page('career_details.html',
+                             career=original_career_name,
+                             career_data=career_data,
+                             career_info=catalog.get(original_career_name))
+    if career_data.get('stale'):
+        # Outage fallback data isn't worth keeping once the upstream is back
+        response = make_response(html)
+        response.cache_control.no_store = True
+        return response
+    # Students often click through to a related career next; have it cached by then
+    utils.prefetch_related_careers(career_data)
+    return shared_page(html, etag)
+
+@app.route('/badges/<badge_id>', methods=['POST'])
+def earn_badge(badge_id):
+    """Award a badge reported by a shared page's script."""
+    if badge_id not in CLIENT_BADGES:
+        return jsonify({'error': 'Unknown badge'}), 404
+    return jsonify({'badge': badge_id, 'awarded': award_badge(badge_id)})
 
 @app.route('/volunteer', methods=['GET'])
 def volunteer_opportunities():
@@ -273,46 +465,24 @@ def volunteer_opportunities():
                          opportunities=opportunities)
 
 @app.route('/chatbot/<career>', methods=['GET', 'POST'])
-def chatbot(career):
-    # Initialize session variables if they don't exist
-    if 'chat_history' not in session:
-        session['chat_history'] = []
+async def chatbot(career):
+    conversation_id = get_conversation_id()
+    chat_history = await run_blocking(chat_store.get_history, conversation_id)
     
     # Handle initial message only on GET requests
     if request.method == 'GET':
         initial_message = request.args.get('initial_message')
         # Only process if message exists AND chat history is currently empty
-        if initial_message and not session['chat_history']:
-            # Add user message to chat history
-            session['chat_history'].append({
-                'role': 'user',
-                'content': initial_message,
-                'time': datetime.now().strftime('%I:%M %p')
-            })
-            
+        if initial_message and not chat_history:
             try:
                 # Get response from Gemini - pass empty history for initial query
-                response_text = get_chat_response(initial_message, career, [])
-                
-                # Add bot response to chat history
-                session['chat_history'].append({
-                    'role': 'assistant',
-                    'content': response_text,
-                    'time': datetime.now().strftime('%I:%M %p')
-                })
-                
-                # Save the updated chat history
-                session.modified = True
-                
+                response_text = await get_chat_response_async(initial_message, career, [])
             except Exception as e:
                 print(f"Error generating initial chat response: {str(e)}")
-                error_message = f"I'm having trouble connecting to the AI service right now. The error is: {str(e)}. Please try again in a moment."
-                session['chat_history'].append({
-                    'role': 'assistant',
-                    'content': error_message,
-                    'time': datetime.now().strftime('%I:%M %p')
-                })
-                session.modified = True
+                response_text = f"I'm having trouble connecting to the AI service right now. The error is: {str(e)}. Please try again in a moment."
+
+            # Add user message and bot response to chat history
+            await run_blocking(chat_store.append, conversation_id, chat_message('user', initial_message), chat_message('assistant', response_text))
     
     # Handle POST requests (user sending a message from the input field)
     if request.method == 'POST':
@@ -321,367 +491,106 @@ def chatbot(career):
             # Award badge for engaging with chatbot
             award_badge('chat_engaged')
             
-            # Add user message to chat history
-            session['chat_history'].append({
-                'role': 'user',
-                'content': message,
-                'time': datetime.now().strftime('%I:%M %p')
-            })
-            
+            user_message = chat_message('user', message)
             try:
                 # Get response from Gemini, passing the history *before* the current message
-                response_text = get_chat_response(message, career, session['chat_history'][:-1])
-                
-                # Add bot response to chat history
-                session['chat_history'].append({
-                    'role': 'assistant',
-                    'content': response_text,
-                    'time': datetime.now().strftime('%I:%M %p')
-                })
-                
-                # Save the updated chat history
-                session.modified = True
-                
+                response_text = await get_chat_response_async(message, career, chat_history)
             except Exception as e:
                 print(f"Error generating subsequent chat response: {str(e)}")
-                error_message = f"I'm having trouble connecting to the AI service right now. The error is: {str(e)}. Please try again in a moment."
-                session['chat_history'].append({
-                    'role': 'assistant',
-                    'content': error_message,
-                    'time': datetime.now().strftime('%I:%M %p')
-                })
-                session.modified = True
+                response_text = f"I'm having trouble connecting to the AI service right now. The error is: {str(e)}. Please try again in a moment."
+
+            # Add user message and bot response to chat history
+            await run_blocking(chat_store.append, conversation_id, user_message, chat_message('assistant', response_text))
     
-    return render_template('chatbot.html',
-                         career=career,
-                         chat_history=session.get('chat_history', []),
-                         now=datetime.now())
+    return await render_page('chatbot.html',
+                             career=career,
+                             chat_history=await run_blocking(chat_store.get_history, conversation_id),
+                             now=datetime.now())
+
+@app.route('/chatbot/<career>/stream', methods=['POST'])
+def chatbot_stream(career):
+    """Stream the chatbot's reply to a message as server-sent events."""
+    message = request.form.get('message', '')
+    if not message:
+        return Response(format_sse({'error': 'Message is required'}, event='error'), status=400, mimetype='text/event-stream')
+
+    # Award badge for engaging with chatbot
+    award_badge('chat_engaged')
+
+    conversation_id = get_conversation_id()
+    chat_history = chat_store.get_history(conversation_id)
+    user_message = chat_message('user', message)
+
+    def generate():
+        formatter = StreamingFormatter()
+        parts = []
+        try:
+            content = chat_response_cache.get(career, message, chat_history)
+            if content is not None:
+                yield format_sse({'text': content})
+            else:
+                for chunk in stream_chat_response(message, career, chat_history):
+                    text = formatter.feed(chunk)
+                    if text:
+                        parts.append(text)
+                        yield format_sse({'text': text})
+                content = ''.join(parts)
+                if not content:
+                    raise ValueError("Empty response from API")
+                chat_response_cache.set(career, message, chat_history, content)
+        except Exception as e:
+            print(f"Error streaming chat response: {str(e)}")
+            content = f"I'm having trouble connecting to the AI service right now. The error is: {str(e)}. Please try again in a moment."
+            yield format_sse({'error': content}, event='error')
+
+        # The completed exchange is saved once the whole reply is known
+        reply = chat_message('assistant', content)
+        chat_store.append(conversation_id, user_message, reply)
+        yield format_sse({'time': reply['time']}, event='done')
+
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
 
 @app.route('/career-explorer')
 def career_explorer():
-    # Define careers directly in the route for testing
-    careers = [
-        # Software Development (5 careers)
-        {
-            'title': 'Software Developer',
-            'description': 'Design and develop software applications and systems.',
-            'category': 'Software Development',
-            'growth_rate': 25,
-            'avg_salary': 85000
-        },
-        {
-            'title': 'Full Stack Developer',
-            'description': 'Develop both frontend and backend of web applications.',
-            'category': 'Software Development',
-            'growth_rate': 28,
-            'avg_salary': 95000
-        },
-        {
-            'title': 'Mobile App Developer',
-            'description': 'Create applications for iOS and Android platforms.',
-            'category': 'Software Development',
-            'growth_rate': 22,
-            'avg_salary': 88000
-        },
-        {
-            'title': 'DevOps Engineer',
-            'description': 'Combine development and operations to improve deployment efficiency.',
-            'category': 'Software Development',
-            'growth_rate': 35,
-            'avg_salary': 105000
-        },
-        {
-            'title': 'Backend Developer (Software Dev)',
-            'description': 'Build server-side logic for software applications.',
-            'category': 'Software Development',
-            'growth_rate': 26,
-            'avg_salary': 90000
-        },
-        
-        # Data Science & Analytics (6 careers)
-        {
-            'title': 'Data Scientist',
-            'description': 'Analyze complex data sets to help organizations make better decisions.',
-            'category': 'Data Science',
-            'growth_rate': 36,
-            'avg_salary': 95000
-        },
-        {
-            'title': 'Data Engineer',
-            'description': 'Build systems to collect, process, and store data at scale.',
-            'category': 'Data Science',
-            'growth_rate': 33,
-            'avg_salary': 92000
-        },
-        {
-            'title': 'Machine Learning Engineer',
-            'description': 'Design, develop, and deploy machine learning models and systems. Build scalable ML pipelines, implement algorithms, and optimize model performance for real-world applications.',
-            'category': 'Data Science',
-            'growth_rate': 40,
-            'avg_salary': 110000
-        },
-        {
-            'title': 'Business Intelligence Analyst',
-            'description': 'Transform data into actionable business insights.',
-            'category': 'Data Science',
-            'growth_rate': 29,
-            'avg_salary': 85000
-        },
-        {
-            'title': 'Statistician',
-            'description': 'Apply statistical methods to analyze data and solve problems.',
-            'category': 'Data Science',
-            'growth_rate': 30,
-            'avg_salary': 90000
-        },
-        {
-            'title': 'Big Data Engineer',
-            'description': 'Focus on large-scale data processing and storage systems.',
-            'category': 'Data Science',
-            'growth_rate': 34,
-            'avg_salary': 100000
-        },
-        
-        # Cybersecurity (4 careers)
-        {
-            'title': 'Cybersecurity Analyst',
-            'description': 'Protect computer systems and networks from cyber threats.',
-            'category': 'Cybersecurity',
-            'growth_rate': 32,
-            'avg_salary': 90000
-        },
-        {
-            'title': 'Security Engineer',
-            'description': 'Design and implement security systems and protocols.',
-            'category': 'Cybersecurity',
-            'growth_rate': 34,
-            'avg_salary': 98000
-        },
-        {
-            'title': 'Penetration Tester',
-            'description': 'Test systems for security vulnerabilities.',
-            'category': 'Cybersecurity',
-            'growth_rate': 30,
-            'avg_salary': 92000
-        },
-        {
-            'title': 'Information Security Officer',
-            'description': 'Develop and enforce security policies and procedures.',
-            'category': 'Cybersecurity',
-            'growth_rate': 35,
-            'avg_salary': 100000
-        },
-        
-        # Cloud Computing (4 careers)
-        {
-            'title': 'Cloud Architect',
-            'description': 'Design and implement cloud infrastructure solutions.',
-            'category': 'Cloud Computing',
-            'growth_rate': 38,
-            'avg_salary': 115000
-        },
-        {
-            'title': 'Cloud Engineer',
-            'description': 'Build and maintain cloud-based systems and applications.',
-            'category': 'Cloud Computing',
-            'growth_rate': 35,
-            'avg_salary': 105000
-        },
-        {
-            'title': 'Cloud Security Engineer',
-            'description': 'Secure cloud environments and data.',
-            'category': 'Cloud Computing',
-            'growth_rate': 37,
-            'avg_salary': 112000
-        },
-        {
-            'title': 'Cloud Administrator',
-            'description': 'Manage and monitor cloud services and resources.',
-            'category': 'Cloud Computing',
-            'growth_rate': 30,
-            'avg_salary': 98000
-        },
-        
-        # Artificial Intelligence (5 careers)
-        {
-            'title': 'AI Research Scientist',
-            'description': 'Research and develop new AI algorithms and models.',
-            'category': 'Artificial Intelligence',
-            'growth_rate': 42,
-            'avg_salary': 120000
-        },
-        {
-            'title': 'Natural Language Processing Engineer',
-            'description': 'Develop systems that understand and process human language.',
-            'category': 'Artificial Intelligence',
-            'growth_rate': 38,
-            'avg_salary': 110000
-        },
-        {
-            'title': 'Computer Vision Engineer',
-            'description': 'Develop systems that can interpret visual information.',
-            'category': 'Artificial Intelligence',
-            'growth_rate': 36,
-            'avg_salary': 108000
-        },
-        {
-            'title': 'Machine Learning Engineer',
-            'description': 'Design, develop, and deploy machine learning models and systems. Build scalable ML pipelines, implement algorithms, and optimize model performance for real-world applications.',
-            'category': 'Artificial Intelligence',
-            'growth_rate': 40,
-            'avg_salary': 110000
-        },
-        {
-            'title': 'Robotics Engineer',
-            'description': 'Design, build, and program robots.',
-            'category': 'Artificial Intelligence',
-            'growth_rate': 39,
-            'avg_salary': 115000
-        },
-        
-        # Game Development (4 careers)
-        {
-            'title': 'Game Developer',
-            'description': 'Design, develop, and produce video games.',
-            'category': 'Game Development',
-            'growth_rate': 18,
-            'avg_salary': 75000
-        },
-        {
-            'title': 'Game Designer',
-            'description': 'Create the concepts, rules, and story of video games.',
-            'category': 'Game Development',
-            'growth_rate': 15,
-            'avg_salary': 70000
-        },
-        {
-            'title': 'Game Programmer',
-            'description': 'Write code for game mechanics, AI, and graphics.',
-            'category': 'Game Development',
-            'growth_rate': 20,
-            'avg_salary': 80000
-        },
-        {
-            'title': '3D Artist (Games)',
-            'description': 'Create 3D models and textures for game environments and characters.',
-            'category': 'Game Development',
-            'growth_rate': 17,
-            'avg_salary': 72000
-        },
-
-        # Web Development (5 careers)
-        {
-            'title': 'Frontend Developer',
-            'description': 'Build the user-facing part of websites and web applications.',
-            'category': 'Web Development',
-            'growth_rate': 22,
-            'avg_salary': 80000
-        },
-        {
-            'title': 'Backend Developer',
-            'description': 'Build the server-side logic and databases for web applications.',
-            'category': 'Web Development',
-            'growth_rate': 23,
-            'avg_salary': 88000
-        },
-        {
-            'title': 'Full Stack Web Developer',
-            'description': 'Work on both the frontend and backend of web applications.',
-            'category': 'Web Development',
-            'growth_rate': 25,
-            'avg_salary': 92000
-        },
-        {
-            'title': 'Web Designer',
-            'description': 'Focus on the visual and user experience aspects of websites.',
-            'category': 'Web Development',
-            'growth_rate': 18,
-            'avg_salary': 75000
-        },
-        {
-            'title': 'UI/UX Designer (Web)',
-            'description': 'Design user interfaces and user experiences for web applications.',
-            'category': 'Web Development',
-            'growth_rate': 20,
-            'avg_salary': 82000
-        },
-
-        # Blockchain (4 careers)
-        {
-            'title': 'Blockchain Developer',
-            'description': 'Design and develop blockchain-based applications and smart contracts.',
-            'category': 'Blockchain',
-            'growth_rate': 45,
-            'avg_salary': 120000
-        },
-        {
-            'title': 'Cryptocurrency Analyst',
-            'description': 'Research and analyze cryptocurrency markets and trends.',
-            'category': 'Blockchain',
-            'growth_rate': 40,
-            'avg_salary': 95000
-        },
-        {
-            'title': 'Smart Contract Auditor',
-            'description': 'Review and audit smart contracts for security vulnerabilities.',
-            'category': 'Blockchain',
-            'growth_rate': 42,
-            'avg_salary': 110000
-        },
-        {
-            'title': 'Decentralized Application (dApp) Developer',
-            'description': 'Build applications that run on a decentralized network.',
-            'category': 'Blockchain',
-            'growth_rate': 48,
-            'avg_salary': 115000
-        },
-
-        # Internet of Things (4 careers)
-        {
-            'title': 'IoT Solutions Architect',
-            'description': 'Design and oversee the implementation of IoT solutions.',
-            'category': 'Internet of Things',
-            'growth_rate': 35,
-            'avg_salary': 110000
-        },
-        {
-            'title': 'Embedded Systems Engineer',
-            'description': 'Develop software for embedded devices and IoT devices.',
-            'category': 'Internet of Things',
-            'growth_rate': 32,
-            'avg_salary': 95000
-        },
-        {
-            'title': 'IoT Hardware Engineer',
-            'description': 'Design and develop hardware components for IoT devices.',
-            'category': 'Internet of Things',
-            'growth_rate': 30,
-            'avg_salary': 100000
-        },
-        {
-            'title': 'IoT Data Scientist',
-            'description': 'Analyze data generated from IoT devices to extract insights.',
-            'category': 'Internet of Things',
-            'growth_rate': 38,
-            'avg_salary': 105000
-        }
-    ]
-    
-    # Group careers by category
-    career_categories = {}
-    for career in careers:
-        category = career.get('category', 'Other')
-        if category not in career_categories:
-            career_categories[category] = []
-        career_categories[category].append(career)
+    etag = page_etag('career-explorer', catalog.version)
+    response = not_modified(etag)
+    if response is not None:
+        return response
     
-    return render_template('career_explorer.html', career_categories=career_categories)
+    # Only the first page is rendered; the page fetches the rest from career_search
+    results = catalog.search()
+    return shared_page(render_template('career_explorer.html', results=results), etag)
+
+@app.route('/api/careers')
+def career_search():
+    """Search the career catalog, returning one page of matches as JSON."""
+    try:
+        results = catalog.search(request.args.get('q', ''),
+                                 category=request.args.get('category') or None,
+                                 cursor=request.args.get('cursor') or None,
+                                 limit=request.args.get('limit', PAGE_SIZE, type=int))
+    except ValueError:
+        return jsonify({'error': 'Invalid cursor'}), 400
+    return jsonify(dict(results, careers=[dict(career) for career in results['careers']]))
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Expose the app's metrics in the Prometheus text format."""
+    token = os.getenv('CAREER_METRICS_TOKEN')
+    if token and request.headers.get('Authorization') != f'Bearer {token}':
+        return Response('Unauthorized\n', status=401, mimetype='text/plain')
+    response = Response(metrics.render(), content_type=metrics.CONTENT_TYPE)
+    response.cache_control.no_store = True
+    return response
 
 @app.route('/reset-chat/<career>')
 def reset_chat(career):
-    # Clear the chat history from the session
-    if 'chat_history' in session:
-        session.pop('chat_history')
+    # Clear the stored chat history for this session's conversation
+    if 'conversation_id' in session:
+        chat_store.clear(session['conversation_id'])
     
     # Redirect back to the chatbot page with the same career
     return redirect(url_for('chatbot', career=career))
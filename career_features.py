@@ -0,0 +1,104 @@
+"""
+Dense feature vectors for scoring quiz answers against every known career.
+
+Each quiz option (an interest, skill, strength or work-style preference) is
+one feature, described by a short text. A career's value for a feature is
+its BM25F score for that text in the recommendation index, scaled so the
+best career for each feature scores 1. All careers' vectors form one
+contiguous float32 matrix, so scoring a quiz submission is a single
+matrix-vector product plus an argpartition for the top k.
+"""
+
+import numpy as np
+from recommender import QUIZ_FIELD_WEIGHTS
+
+# Every quiz option with the text describing it
+QUIZ_OPTIONS = {
+    'interests': {
+        'web': 'web development, frontend, backend, full stack',
+        'mobile': 'mobile app development, iOS, Android',
+        'ai': 'artificial intelligence, machine learning, deep learning',
+        'data': 'data science, data analytics, big data',
+        'game': 'game development, game design, game engines',
+        'security': 'cybersecurity, information security, network security',
+        'cloud': 'cloud computing, DevOps, infrastructure',
+        'embedded': 'embedded systems, IoT, hardware programming'
+    },
+    'skills': {
+        'frontend': 'HTML, CSS, JavaScript, React, Angular, Vue, user-facing websites',
+        'backend': 'Python, Java, Node.js, PHP, Ruby, server-side logic',
+        'database': 'SQL, NoSQL, MongoDB, PostgreSQL, databases, store data',
+        'algorithms': 'algorithms, data structures, problem solving',
+        'networking': 'networking, security protocols, system administration',
+        'ui': 'UI/UX design, user interface, user experience',
+        'mobile': 'iOS development, Android development, mobile apps',
+        'ai': 'machine learning, neural networks, AI frameworks'
+    },
+    'strengths': {
+        'analytical': 'analyze data, statistical methods, insights, systematic',
+        'creative': 'design, create, creative, visual, concepts, story',
+        'practical': 'build, implement, maintain, deploy, solutions',
+        'research': 'research, develop new algorithms and models',
+        'collaborative': 'team, collaborate, operations, policies'
+    },
+    'personality': {
+        'startup': 'startup, innovative, build applications, decentralized',
+        'enterprise': 'enterprise, business, infrastructure, security policies',
+        'remote': 'remote, freelance, web, mobile, open source',
+        'research': 'research, scientist, academic, algorithms',
+        'agency': 'client, projects, websites, design'
+    }
+}
+
+class FeatureMatrix:
+    """Careers x quiz-option feature matrix derived from a CareerIndex."""
+
+    def __init__(self, index, options=QUIZ_OPTIONS):
+        self.titles = index.titles
+        self.columns = [(field, option) for field, field_options in options.items() for option in field_options]
+        self._column_of = {column: j for j, column in enumerate(self.columns)}
+
+        matrix = np.zeros((len(self.titles), len(self.columns)), dtype=np.float32)
+        for j, (field, option) in enumerate(self.columns):
+            for doc_id, score in index.score_all({field: options[field][option]}, {field: 1.0}).items():
+                matrix[doc_id, j] = score
+        peaks = matrix.max(axis=0) if len(self.titles) else np.ones(len(self.columns), dtype=np.float32)
+        peaks[peaks == 0] = 1.0
+        self.matrix = np.ascontiguousarray(matrix / peaks, dtype=np.float32)
+
+    def __len__(self):
+        return len(self.titles)
+
+    def has_option(self, field, value):
+        """Return whether value is one of the quiz's options for field."""
+        return (field, value) in self._column_of
+
+    def vector(self, answers, field_weights=QUIZ_FIELD_WEIGHTS):
+        """Encode quiz answers as a weighted one-hot query vector."""
+        query = np.zeros(len(self.columns), dtype=np.float32)
+        for field, value in answers.items():
+            j = self._column_of.get((field, value))
+            if j is not None:
+                query[j] += field_weights.get(field, 1.0)
+        return query
+
+    def scores(self, answers, field_weights=QUIZ_FIELD_WEIGHTS):
+        """Score every career against the answers."""
+        return self.matrix @ self.vector(answers, field_weights)
+
+    def dense(self, scores):
+        """Spread {career index: score} into a vector aligned with the matrix rows."""
+        vector = np.zeros(len(self.titles), dtype=np.float32)
+        for doc_id, score in scores.items():
+            vector[doc_id] = score
+        return vector
+
+    def top_k(self, scores, k=10):
+        """Return up to k (title, score) pairs with a positive score, best first."""
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        # Best first; equal scores keep catalog order
+        top = top[np.lexsort((top, -scores[top]))]
+        return [(self.titles[i], float(scores[i])) for i in top if scores[i] > 0]
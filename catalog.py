@@ -0,0 +1,218 @@
+"""
+The career catalog behind the Career Explorer.
+
+The catalog's careers are read once, at import, from data/careers.json, and
+everything the routes look them up by is precomputed then: the careers
+grouped by category, keyed by normalized title, ordered by growth rate and
+by average salary, and a search index over titles and descriptions.
+Records are read-only mappings and the indexes are tuples and frozensets,
+so every request shares the same structures.
+"""
+
+import bisect
+import hashlib
+import json
+import os
+import re
+from collections import defaultdict
+from types import MappingProxyType
+import settings
+
+CATALOG_VERSION = 1
+CATALOG_PATH = os.getenv(
+    'CAREER_CATALOG_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'careers.json')
+)
+
+# Fields query() can sort by, highest first
+SORT_FIELDS = ('growth_rate', 'avg_salary')
+PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+WORD_PATTERN = re.compile(r'\w+')
+TRIGRAM_LENGTH = 3
+NO_MATCHES = frozenset()
+
+def title_key(title):
+    """Normalize a career title, so "full-stack Developer" finds "Full Stack Developer"."""
+    return ' '.join(re.split(r'[\s-]+', str(title).lower())).strip()
+
+def trigrams(text):
+    """Return the set of three-character substrings of text."""
+    return {text[i:i + TRIGRAM_LENGTH] for i in range(len(text) - TRIGRAM_LENGTH + 1)}
+
+def encode_cursor(key):
+    return f'{key[0]}.{key[1]}'
+
+def decode_cursor(cursor):
+    """Parse a search cursor, raising ValueError if it is malformed."""
+    rank, doc_id = cursor.split('.')
+    return int(rank), int(doc_id)
+
+class SearchIndex:
+    """Case-insensitive search over career titles and descriptions.
+
+    A query matches a career when every one of its terms does. Terms of
+    three or more characters are looked up by their trigrams and the
+    candidates checked for the whole term, so they match anywhere in the
+    text; shorter terms match the start of a word ("ai" finds "AI
+    Engineer" but not "Maintenance").
+    """
+
+    def __init__(self, careers):
+        self._titles = [career['title'].lower() for career in careers]
+        # The newline keeps a term from matching across the title and description
+        self._texts = [f"{title}\n{career.get('description', '').lower()}"
+                       for title, career in zip(self._titles, careers)]
+        postings = defaultdict(set)
+        prefixes = defaultdict(set)
+        for doc_id, text in enumerate(self._texts):
+            for gram in trigrams(text):
+                postings[gram].add(doc_id)
+            for word in WORD_PATTERN.findall(text):
+                for length in range(1, TRIGRAM_LENGTH):
+                    prefixes[word[:length]].add(doc_id)
+        self._trigrams = {gram: frozenset(ids) for gram, ids in postings.items()}
+        self._prefixes = {prefix: frozenset(ids) for prefix, ids in prefixes.items()}
+
+    def match(self, text):
+        """Return the ids of the careers matching text, in catalog order."""
+        terms = text.lower().split()
+        if not terms:
+            return list(range(len(self._texts)))
+        candidates = None
+        for term in terms:
+            if len(term) >= TRIGRAM_LENGTH:
+                ids = frozenset.intersection(*(self._trigrams.get(gram, NO_MATCHES) for gram in trigrams(term)))
+            else:
+                ids = self._prefixes.get(term, NO_MATCHES)
+            candidates = ids if candidates is None else candidates & ids
+            if not candidates:
+                return []
+        long_terms = [term for term in terms if len(term) >= TRIGRAM_LENGTH]
+        return sorted(doc_id for doc_id in candidates if all(term in self._texts[doc_id] for term in long_terms))
+
+    def rank(self, doc_id, text):
+        """Rank a match: 0 for a title starting with text, 1 for other title matches, 2 for description matches."""
+        text = ' '.join(text.lower().split())
+        title = self._titles[doc_id]
+        if title.startswith(text):
+            return 0
+        return 1 if all(term in title for term in text.split()) else 2
+
+class CareerCatalog:
+    """Immutable, indexed collection of career records."""
+
+    def __init__(self, careers):
+        self.careers = tuple(MappingProxyType(dict(career)) for career in careers)
+        # Changes whenever any record does; pages built from the catalog derive their ETags from it
+        self.version = hashlib.sha1(
+            json.dumps([dict(career) for career in self.careers], sort_keys=True).encode('utf-8')
+        ).hexdigest()[:16]
+
+        by_category = {}
+        by_title = {}
+        for career in self.careers:
+            by_category.setdefault(career.get('category', 'Other'), []).append(career)
+            by_title.setdefault(title_key(career['title']), career)
+        self.by_category = MappingProxyType({category: tuple(careers) for category, careers in by_category.items()})
+        self.by_title = MappingProxyType(by_title)
+
+        # Highest first; ties keep catalog order
+        self.by_growth_rate = tuple(sorted(self.careers, key=lambda career: -career.get('growth_rate', 0)))
+        self.by_avg_salary = tuple(sorted(self.careers, key=lambda career: -career.get('avg_salary', 0)))
+        self._sorted = {'growth_rate': self.by_growth_rate, 'avg_salary': self.by_avg_salary}
+        self.search_index = SearchIndex(self.careers)
+
+    def __len__(self):
+        return len(self.careers)
+
+    @property
+    def categories(self):
+        return tuple(self.by_category)
+
+    def get(self, title):
+        """Get the record for a career title, or None if it isn't in the catalog."""
+        return self.by_title.get(title_key(title))
+
+    def query(self, category=None, text=None, min_growth_rate=None, min_avg_salary=None,
+              sort=None, page=1, per_page=PAGE_SIZE):
+        """Filter, sort and paginate the catalog.
+
+        Returns a dict with the page's careers, the total number of matches,
+        the (clamped) page number and the number of pages. `sort` is one of
+        SORT_FIELDS, or None for catalog order.
+        """
+        if sort is None:
+            careers = self.by_category.get(category, ()) if category is not None else self.careers
+        elif sort in self._sorted:
+            careers = self._sorted[sort]
+            if category is not None:
+                careers = [career for career in careers if career.get('category') == category]
+        else:
+            raise ValueError(f"Unknown sort field: {sort}")
+
+        if text:
+            text = text.lower()
+            careers = [career for career in careers
+                       if text in career['title'].lower() or text in career.get('description', '').lower()]
+        if min_growth_rate is not None:
+            careers = [career for career in careers if career.get('growth_rate', 0) >= min_growth_rate]
+        if min_avg_salary is not None:
+            careers = [career for career in careers if career.get('avg_salary', 0) >= min_avg_salary]
+
+        per_page = max(1, per_page)
+        pages = max(1, -(-len(careers) // per_page))
+        page = min(max(1, page), pages)
+        start = (page - 1) * per_page
+        return {
+            'careers': tuple(careers[start:start + per_page]),
+            'total': len(careers),
+            'page': page,
+            'pages': pages
+        }
+
+    def search(self, text='', category=None, cursor=None, limit=PAGE_SIZE):
+        """Search the catalog a page at a time.
+
+        Returns a dict with the page's careers (best matches first), the
+        total number of matches, the match count for every category (before
+        filtering by `category`) and the cursor of the next page, or None on
+        the last page. Raises ValueError for a malformed cursor.
+        """
+        text = text or ''
+        matches = self.search_index.match(text)
+        counts = defaultdict(int)
+        for doc_id in matches:
+            counts[self.careers[doc_id].get('category', 'Other')] += 1
+        facets = [{'category': category_name, 'count': counts[category_name]}
+                  for category_name in self.by_category if counts[category_name]]
+        if category is not None:
+            matches = [doc_id for doc_id in matches if self.careers[doc_id].get('category', 'Other') == category]
+
+        ranked = sorted((self.search_index.rank(doc_id, text), doc_id) for doc_id in matches)
+        start = bisect.bisect_right(ranked, decode_cursor(cursor)) if cursor else 0
+        limit = min(max(1, limit), MAX_PAGE_SIZE)
+        page = ranked[start:start + limit]
+        return {
+            'careers': tuple(self.careers[doc_id] for _, doc_id in page),
+            'total': len(ranked),
+            'facets': facets,
+            'next_cursor': encode_cursor(page[-1]) if start + limit < len(ranked) else None
+        }
+
+def load_catalog(path=CATALOG_PATH):
+    """Read a catalog file, returning an empty catalog if it is missing, unreadable or outdated."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Error loading career catalog: {str(e)}")
+        return CareerCatalog([])
+
+    if data.get('version') != CATALOG_VERSION:
+        print(f"Ignoring career catalog with version {data.get('version')}")
+        return CareerCatalog([])
+    return CareerCatalog(data['careers'])
+
+catalog = load_catalog()
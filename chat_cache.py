@@ -0,0 +1,150 @@
+"""
+Cache of chatbot replies for repeated questions about the same career.
+
+Messages are reduced to a set of normalized tokens (lowercase, punctuation and
+filler words removed, simple plural stripping), so rephrasings such as "What
+does a Data Scientist do?" and "what do data scientists do" share one entry.
+When no exact match exists, cached questions for the same career and
+conversation context are compared by token-set (Jaccard) similarity.
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+import settings
+
+CHAT_CACHE_TTL = int(os.getenv('CHAT_CACHE_TTL', '86400'))
+CHAT_CACHE_MAX_ENTRIES = int(os.getenv('CHAT_CACHE_MAX_ENTRIES', '2000'))
+CHAT_CACHE_SIMILARITY = float(os.getenv('CHAT_CACHE_SIMILARITY', '0.8'))
+
+# Number of previous messages that make up the conversation context of a reply
+HISTORY_FINGERPRINT_MESSAGES = 2
+
+# Cap on how many candidates a similarity lookup compares against
+MAX_CANDIDATES = 64
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9+#]+")
+# Filler words only; interrogatives (how, what, why, ...) are kept because they
+# change the answer, e.g. "how to become X" vs "why become X"
+STOPWORDS = frozenset("""
+a an and are as at be can could do does for from get i if in into is it me my
+of on or should so tell than that the their them there this to want was will with
+would you your
+""".split())
+
+def tokenize(text):
+    """Reduce a message to its set of meaningful, normalized tokens."""
+    tokens = set()
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        tokens.add(token)
+    return frozenset(tokens)
+
+def history_fingerprint(chat_history):
+    """Short hash of the recent conversation a message is answered in."""
+    recent = chat_history[-HISTORY_FINGERPRINT_MESSAGES:] if chat_history else []
+    digest = hashlib.sha1()
+    for msg in recent:
+        digest.update(msg['role'].encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(' '.join(sorted(tokenize(msg['content']))).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()[:16]
+
+def jaccard(a, b):
+    """Token-set similarity between 0 and 1."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+class ChatResponseCache:
+    """A TTL + LRU bounded cache of replies keyed on (career, message, history)."""
+
+    def __init__(self, maxsize=CHAT_CACHE_MAX_ENTRIES, ttl=CHAT_CACHE_TTL, similarity=CHAT_CACHE_SIMILARITY):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.similarity = similarity
+        self._entries = OrderedDict()
+        self._groups = {}
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _keys(self, career, message, chat_history):
+        group = (' '.join(career.lower().split()), history_fingerprint(chat_history))
+        tokens = tokenize(message)
+        return group, tokens, group + (' '.join(sorted(tokens)),)
+
+    def _remove(self, key):
+        self._entries.pop(key, None)
+        group_keys = self._groups.get(key[:2])
+        if group_keys is not None:
+            group_keys.pop(key, None)
+            if not group_keys:
+                del self._groups[key[:2]]
+
+    def get(self, career, message, chat_history):
+        """Return a cached reply for an equivalent or near-identical message, or None."""
+        group, tokens, key = self._keys(career, message, chat_history)
+        if not tokens:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] > now:
+                self._entries.move_to_end(key)
+                self.exact_hits += 1
+                return entry[0]
+
+            best_key, best_score = None, self.similarity
+            for candidate_key in list(self._groups.get(group, {}))[-MAX_CANDIDATES:]:
+                response, candidate_tokens, expires_at = self._entries[candidate_key]
+                if expires_at <= now:
+                    self._remove(candidate_key)
+                    continue
+                score = jaccard(tokens, candidate_tokens)
+                if score >= best_score:
+                    best_key, best_score = candidate_key, score
+            if best_key is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(best_key)
+            self.similar_hits += 1
+            return self._entries[best_key][0]
+
+    def set(self, career, message, chat_history, response):
+        """Cache the reply to a message."""
+        group, tokens, key = self._keys(career, message, chat_history)
+        if not tokens:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (response, tokens, time.monotonic() + self.ttl)
+            self._groups.setdefault(group, OrderedDict())[key] = None
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def stats(self):
+        """Return the hit/miss/eviction counters."""
+        with self._lock:
+            hits = self.exact_hits + self.similar_hits
+            lookups = hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'exact_hits': self.exact_hits,
+                'similar_hits': self.similar_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': hits / lookups if lookups else 0.0
+            }
@@ -0,0 +1,52 @@
+"""
+Server-side storage for chatbot conversations.
+
+The session cookie only carries an opaque conversation ID; the messages live
+in a cache backend, in process memory or in a local SQLite file.
+"""
+
+import os
+import settings
+from cache import CACHE_DIR, SQLiteCache, TTLCache
+
+# Backend for conversations: "sqlite" (when CAREER_CACHE_DIR is set) or "memory"
+CHAT_STORE_BACKEND = os.getenv('CHAT_STORE_BACKEND', 'sqlite')
+MAX_CONVERSATION_MESSAGES = int(os.getenv('CHAT_MAX_MESSAGES', '50'))
+CONVERSATION_IDLE_TIMEOUT = int(os.getenv('CHAT_IDLE_TIMEOUT', '86400'))
+MAX_CONVERSATIONS = int(os.getenv('CHAT_MAX_CONVERSATIONS', '1000'))
+
+class ChatStore:
+    """Bounded per-conversation message lists that expire after being idle."""
+
+    def __init__(self, backend, max_messages=MAX_CONVERSATION_MESSAGES, idle_timeout=CONVERSATION_IDLE_TIMEOUT):
+        self.backend = backend
+        self.max_messages = max_messages
+        self.idle_timeout = idle_timeout
+
+    def get_history(self, conversation_id):
+        """Get a conversation's messages, oldest first."""
+        if not conversation_id:
+            return []
+        return self.backend.get(conversation_id) or []
+
+    def append(self, conversation_id, *messages):
+        """Add messages to a conversation, keeping only the most recent max_messages."""
+        def add(history):
+            return ((history or []) + list(messages))[-self.max_messages:]
+
+        # The backend does the read-modify-write atomically; every write restarts the idle timer
+        self.backend.update(conversation_id, add, ttl=self.idle_timeout)
+
+    def clear(self, conversation_id):
+        """Delete a conversation."""
+        self.backend.delete(conversation_id)
+
+    def stats(self):
+        """Return the backend's usage counters."""
+        return self.backend.stats()
+
+def create_chat_store(backend=CHAT_STORE_BACKEND):
+    """Create the app's conversation store."""
+    if backend == 'sqlite' and CACHE_DIR:
+        return ChatStore(SQLiteCache(os.path.join(CACHE_DIR, 'chat.sqlite3'), CONVERSATION_IDLE_TIMEOUT, MAX_CONVERSATIONS))
+    return ChatStore(TTLCache(MAX_CONVERSATIONS, CONVERSATION_IDLE_TIMEOUT))
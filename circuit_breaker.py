@@ -0,0 +1,99 @@
+"""
+Circuit breakers for the upstream CareerOneStop endpoints.
+
+A breaker counts consecutive failed or abnormally slow calls to one endpoint.
+After `failure_threshold` of them it opens, and calls fail immediately with
+CircuitOpenError instead of waiting on an upstream that is down. Once
+`reset_timeout` seconds have passed, one call is let through as a probe
+(half-open): if it succeeds the circuit closes again, otherwise it stays
+open for another `reset_timeout`.
+"""
+
+import os
+import threading
+import time
+import settings
+
+BREAKER_FAILURE_THRESHOLD = int(os.getenv('CAREER_BREAKER_FAILURES', '5'))
+BREAKER_RESET_TIMEOUT = float(os.getenv('CAREER_BREAKER_RESET_TIMEOUT', '30'))
+# Calls slower than this count as failures, so a latency spike trips the breaker too
+BREAKER_SLOW_CALL = float(os.getenv('CAREER_BREAKER_SLOW_CALL', '5'))
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+class UpstreamError(Exception):
+    """An upstream call failed (connection error, timeout or 5xx/429 response)."""
+
+class CircuitOpenError(UpstreamError):
+    """Raised instead of calling an endpoint whose circuit is open."""
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one upstream endpoint."""
+
+    def __init__(self, name, failure_threshold=BREAKER_FAILURE_THRESHOLD,
+                 reset_timeout=BREAKER_RESET_TIMEOUT, slow_call=BREAKER_SLOW_CALL):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.slow_call = slow_call
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+        self.slow_calls = 0
+        self.rejected = 0
+        self.opens = 0
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may go through now."""
+        with self._lock:
+            if self.state != CLOSED:
+                now = time.monotonic()
+                if now - self.opened_at < self.reset_timeout:
+                    self.rejected += 1
+                    raise CircuitOpenError(f"Circuit open for {self.name}")
+                # Let this call probe the upstream; everyone else keeps failing
+                # fast until it reports back or another reset_timeout passes
+                self.state = HALF_OPEN
+                self.opened_at = now
+            self.calls += 1
+
+    def record_success(self, duration):
+        """Report a finished call; slow ones count as failures."""
+        if duration >= self.slow_call:
+            with self._lock:
+                self.slow_calls += 1
+            self.record_failure()
+            return
+        with self._lock:
+            self.state = CLOSED
+            self.consecutive_failures = 0
+
+    def record_failure(self):
+        """Report a failed call, opening the circuit once there are enough in a row."""
+        with self._lock:
+            self.failures += 1
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state == CLOSED:
+                    self.opens += 1
+                    print(f"Circuit opened for {self.name} after {self.consecutive_failures} failures")
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+    def stats(self):
+        """Return the breaker's state and counters."""
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'calls': self.calls,
+                'failures': self.failures,
+                'slow_calls': self.slow_calls,
+                'rejected': self.rejected,
+                'opens': self.opens
+            }
@@ -0,0 +1,128 @@
+"""
+Shared pooled HTTP client used for all CareerOneStop API calls.
+
+AsyncHttpClient runs on one background event loop per process (see
+run_coroutine) so many upstream requests can be in flight at once; the
+blocking callers reach it through run_coroutine.
+
+httpx is imported when the client is first used, so routes that never
+call upstream don't pay for it on a cold start.
+"""
+
+import asyncio
+import concurrent.futures
+import os
+import random
+import threading
+import settings
+
+# Connection and retry settings, overridable from the environment
+CONNECT_TIMEOUT = float(os.getenv('CAREER_CONNECT_TIMEOUT', '3.05'))
+READ_TIMEOUT = float(os.getenv('CAREER_READ_TIMEOUT', '10'))
+MAX_RETRIES = int(os.getenv('CAREER_MAX_RETRIES', '2'))
+BACKOFF_BASE = float(os.getenv('CAREER_BACKOFF_BASE', '0.25'))
+BACKOFF_MAX = float(os.getenv('CAREER_BACKOFF_MAX', '4'))
+MAX_CONNECTIONS_PER_HOST = int(os.getenv('CAREER_MAX_CONNECTIONS_PER_HOST', '10'))
+MAX_ASYNC_CONNECTIONS = int(os.getenv('CAREER_MAX_ASYNC_CONNECTIONS', '100'))
+
+# Responses worth retrying: rate limiting and server-side errors
+RETRY_STATUS_CODES = frozenset([429, 500, 502, 503, 504])
+
+_loop = None
+_loop_lock = threading.Lock()
+
+def backoff_delay(attempt, retry_after, backoff_base, backoff_max):
+    """Seconds to wait before the next attempt (full jitter, honouring Retry-After)."""
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), backoff_max)
+    return random.uniform(0, min(backoff_max, backoff_base * (2 ** attempt)))
+
+class AsyncHttpClient:
+    """A keep-alive httpx client with timeouts, retries and connection limits.
+
+    The underlying httpx client is created on first use and must only be
+    used from the event loop it was created on (the shared background loop).
+    """
+
+    def __init__(self, headers=None, connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT,
+                 max_retries=MAX_RETRIES, backoff_base=BACKOFF_BASE, backoff_max=BACKOFF_MAX,
+                 max_connections=MAX_ASYNC_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS_PER_HOST):
+        self.headers = dict(headers or {})
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                headers=self.headers,
+                timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_keepalive_connections)
+            )
+        return self._client
+
+    async def get(self, url, params=None):
+        """Send a GET request, retrying 429 and 5xx responses with jittered backoff."""
+        import httpx
+
+        if params:
+            # Encode booleans as "True"/"False", as the API has always been sent them
+            params = {k: str(v) if isinstance(v, bool) else v for k, v in params.items()}
+        attempt = 0
+        while True:
+            retry_after = None
+            try:
+                response = await self.client.get(url, params=params)
+            except (httpx.ConnectError, httpx.ConnectTimeout):
+                # Nothing reached the server yet, so a GET is always safe to retry
+                if attempt >= self.max_retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                    return response
+                retry_after = response.headers.get('Retry-After')
+
+            await asyncio.sleep(backoff_delay(attempt, retry_after, self.backoff_base, self.backoff_max))
+            attempt += 1
+
+    async def close(self):
+        """Close all pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+def get_event_loop():
+    """Get the background event loop all async upstream I/O runs on, starting it if needed."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name='upstream-io', daemon=True).start()
+            _loop = loop
+    return _loop
+
+def run_coroutine(coro, timeout=None):
+    """Run a coroutine on the background loop and block until it finishes.
+
+    This is how the synchronous helpers and Flask routes call into the async
+    I/O layer. It must not be called from the background loop itself.
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, get_event_loop())
+    try:
+        return future.result(timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise
+
+async def run_blocking(func, *args):
+    """Run blocking work (disk caches, the snapshot file) in a thread so the event loop stays free."""
+    return await asyncio.get_running_loop().run_in_executor(None, func, *args)
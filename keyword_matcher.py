@@ -0,0 +1,85 @@
+"""
+Precompiled keyword matching for classifying career titles as tech careers.
+
+Every keyword is compiled once into a single regex, with the alternation
+factored into a prefix trie so each position of a title costs one character
+dispatch rather than one attempt per keyword, and the longest keyword wins
+("database" over "data"). Keywords of three letters or fewer ("ai", "iot",
+"web") must be whole words, so "ai" doesn't match "Maintenance" or
+"Aircraft"; longer ones match at the start of a word, so "engineer" also
+matches "Engineering".
+"""
+
+import re
+
+# Keywords grouped by the tech category they indicate
+TECH_KEYWORDS = {
+    'software': ('software', 'programming', 'developer'),
+    'engineering': ('engineer',),
+    'data': ('data', 'database'),
+    'ai': ('ai', 'machine learning'),
+    'security': ('security', 'cyber'),
+    'cloud': ('cloud', 'devops'),
+    'web': ('web',),
+    'mobile': ('mobile',),
+    'computing': ('computer', 'information', 'technology', 'system', 'network', 'application',
+                  'code', 'digital', 'technical'),
+    'emerging': ('robotics', 'automation', 'blockchain', 'quantum', 'virtual', 'augmented',
+                 'reality', 'iot')
+}
+
+# The core categories the quiz results are narrowed down to
+CORE_TECH_CATEGORIES = frozenset(['software', 'engineering', 'data', 'ai', 'security', 'cloud', 'web', 'mobile'])
+
+# Keywords this short only match as whole words
+WHOLE_WORD_MAX_LENGTH = 3
+
+def trie_pattern(words):
+    """Build a regex matching any of `words`, with shared prefixes factored out."""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [(r'\s+' if char == ' ' else re.escape(char)) + build(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # A word ending here makes the rest optional; the greedy match still prefers longer words
+        return f'(?:{pattern})?' if '' in node else pattern
+
+    return build(trie)
+
+class KeywordMatcher:
+    """Classify text by the categories of the keywords it contains."""
+
+    def __init__(self, keywords_by_category):
+        self._categories = {}
+        for category, keywords in keywords_by_category.items():
+            for keyword in keywords:
+                self._categories[' '.join(keyword.lower().split())] = category
+        prefixes = [keyword for keyword in self._categories if len(keyword) > WHOLE_WORD_MAX_LENGTH]
+        words = [keyword for keyword in self._categories if len(keyword) <= WHOLE_WORD_MAX_LENGTH]
+        branches = []
+        if prefixes:
+            branches.append(trie_pattern(prefixes))
+        if words:
+            branches.append(f'(?:{trie_pattern(words)})\\b')
+        self.pattern = re.compile(r'\b(?:' + '|'.join(branches) + ')')
+
+    def categories(self, text):
+        """Return the set of categories whose keywords appear in text."""
+        return frozenset(self._categories[' '.join(match.group().split())] for match in self.pattern.finditer(text.lower()))
+
+    def matches(self, text, categories=None):
+        """Return whether text contains a keyword (from one of `categories`, if given)."""
+        if categories is None:
+            return self.pattern.search(text.lower()) is not None
+        return any(self._categories[' '.join(match.group().split())] in categories
+                   for match in self.pattern.finditer(text.lower()))
+
+tech_matcher = KeywordMatcher(TECH_KEYWORDS)
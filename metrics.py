@@ -0,0 +1,261 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+Counters, gauges and histograms are updated without taking a lock: every
+thread adds to its own array of values, and a scrape sums the arrays of
+all threads. A thread's values are folded into a retired total when the
+thread exits, so per-request threads don't accumulate. Only the first
+update from a new thread, or to a new label combination, takes a lock.
+
+    from metrics import track_upstream
+    with track_upstream('search'):
+        response = await client.get(url)
+"""
+
+import bisect
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+
+# Latency buckets in seconds, from a cache hit to a slow upstream call
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+class _ShardOwner:
+    """Lives in a thread's local storage; its finalizer runs when the thread exits."""
+
+class _Shards:
+    """Per-thread arrays of float values, summed on read."""
+
+    def __init__(self, size):
+        self.size = size
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._live = {}
+        self._retired = [0.0] * size
+
+    def values(self):
+        """Get the calling thread's array, creating it on the thread's first update."""
+        try:
+            return self._local.values
+        except AttributeError:
+            values = [0.0] * self.size
+            owner = _ShardOwner()
+            with self._lock:
+                self._live[id(owner)] = values
+            weakref.finalize(owner, self._retire, id(owner))
+            self._local.owner = owner
+            self._local.values = values
+            return values
+
+    def _retire(self, key):
+        with self._lock:
+            values = self._live.pop(key, None)
+            if values is not None:
+                for i, value in enumerate(values):
+                    self._retired[i] += value
+
+    def total(self):
+        """Sum the arrays of every thread, live or exited."""
+        with self._lock:
+            total = list(self._retired)
+            for values in self._live.values():
+                for i, value in enumerate(values):
+                    total[i] += value
+        return total
+
+class _CounterChild:
+    def __init__(self):
+        self._shards = _Shards(1)
+
+    def inc(self, amount=1.0):
+        self._shards.values()[0] += amount
+
+    def samples(self, name, labels):
+        return [(name, labels, self._shards.total()[0])]
+
+class _GaugeChild(_CounterChild):
+    def dec(self, amount=1.0):
+        self._shards.values()[0] -= amount
+
+class _HistogramChild:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        # One count per bucket, then the +Inf count and the sum
+        self._shards = _Shards(len(buckets) + 2)
+
+    def observe(self, value):
+        values = self._shards.values()
+        values[bisect.bisect_left(self.buckets, value)] += 1
+        values[-1] += value
+
+    def samples(self, name, labels):
+        total = self._shards.total()
+        samples = []
+        cumulative = 0.0
+        for bound, count in zip(self.buckets + (float('inf'),), total):
+            cumulative += count
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            samples.append((f'{name}_bucket', labels + (('le', le),), cumulative))
+        samples.append((f'{name}_sum', labels, total[-1]))
+        samples.append((f'{name}_count', labels, cumulative))
+        return samples
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=(), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+        (REGISTRY if registry is None else registry).register(self)
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values, **kwargs):
+        """Get the child metric for one combination of label values."""
+        if kwargs:
+            values = tuple(kwargs[name] for name in self.labelnames)
+        # Label values are nearly always strings already, which makes this lookup the only work
+        child = self._children.get(values)
+        if child is None:
+            key = tuple(str(value) for value in values)
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} takes labels {self.labelnames}, got {key}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def samples(self):
+        """Return (name, labels, value) for every sample of every child."""
+        samples = []
+        for key, child in sorted(list(self._children.items())):
+            samples.extend(child.samples(self.name, tuple(zip(self.labelnames, key))))
+        return samples
+
+class Counter(_Metric):
+    """A value that only goes up."""
+
+    kind = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1.0):
+        self.labels().inc(amount)
+
+class Gauge(_Metric):
+    """A value that goes up and down, such as the number of calls in flight."""
+
+    kind = 'gauge'
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def inc(self, amount=1.0):
+        self.labels().inc(amount)
+
+    def dec(self, amount=1.0):
+        self.labels().dec(amount)
+
+class Histogram(_Metric):
+    """Counts of observations (e.g. durations) in cumulative buckets, with their sum."""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS, registry=None):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value):
+        self.labels().observe(value)
+
+def escape_label(value):
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+class Registry:
+    """The set of metrics, plus collectors of stats kept elsewhere, rendered on a scrape."""
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+
+    def add_collector(self, collect):
+        """Add a function returning [(name, kind, help, [(labels dict, value), ...]), ...] at scrape time."""
+        with self._lock:
+            self._collectors.append(collect)
+
+    def render(self):
+        """Render every metric in the Prometheus text format."""
+        with self._lock:
+            families = [(metric.name, metric.kind, metric.documentation, metric.samples()) for metric in self._metrics]
+            collectors = list(self._collectors)
+        for collect in collectors:
+            try:
+                for name, kind, documentation, samples in collect():
+                    families.append((name, kind, documentation,
+                                     [(name, tuple(sorted(labels.items())), value) for labels, value in samples]))
+            except Exception as e:
+                print(f"Error collecting metrics: {str(e)}")
+
+        lines = []
+        for name, kind, documentation, samples in families:
+            lines.append(f'# HELP {name} {documentation}')
+            lines.append(f'# TYPE {name} {kind}')
+            for sample_name, labels, value in samples:
+                if labels:
+                    label_text = ','.join(f'{label}="{escape_label(str(label_value))}"' for label, label_value in labels)
+                    lines.append(f'{sample_name}{{{label_text}}} {format_value(value)}')
+                else:
+                    lines.append(f'{sample_name} {format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+REGISTRY = Registry()
+
+# Incoming requests, by URL rule
+REQUEST_DURATION = Histogram('career_request_duration_seconds', 'Time spent handling a request.', ('route', 'method'))
+REQUEST_ERRORS = Counter('career_request_errors_total', 'Requests that raised an exception or returned a 5xx.', ('route', 'method'))
+REQUESTS_IN_FLIGHT = Gauge('career_requests_in_flight', 'Requests being handled.', ('route',))
+TEMPLATE_RENDER_DURATION = Histogram('career_template_render_duration_seconds', 'Time spent rendering a template.', ('template',))
+
+# Outbound calls to CareerOneStop (search, videos, detail) and Gemini (gemini, gemini_stream)
+UPSTREAM_DURATION = Histogram('career_upstream_duration_seconds', 'Duration of an outbound call.', ('call',))
+UPSTREAM_ERRORS = Counter('career_upstream_errors_total', 'Outbound calls that failed.', ('call',))
+UPSTREAM_IN_FLIGHT = Gauge('career_upstream_in_flight', 'Outbound calls in progress.', ('call',))
+
+@contextmanager
+def track_upstream(call):
+    """Time an outbound call, counting it as failed if the block raises."""
+    in_flight = UPSTREAM_IN_FLIGHT.labels(call)
+    in_flight.inc()
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        UPSTREAM_ERRORS.labels(call).inc()
+        raise
+    finally:
+        UPSTREAM_DURATION.labels(call).observe(time.perf_counter() - start)
+        in_flight.dec()
+
+def render():
+    """Render the app's metrics in the Prometheus text format."""
+    return REGISTRY.render()
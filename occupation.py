@@ -0,0 +1,98 @@
+"""
+Compact occupation records for the career pages.
+
+An OccupationProfile holds the handful of fields the templates read from a
+CareerOneStop OccupationDetail response. Instances use __slots__, keep lists
+as tuples and intern the strings many occupations share (education levels,
+task titles, related career titles and codes), so the detail cache and the
+snapshot hold far less than the parsed JSON they were built from.
+
+Profiles also answer `profile['title']` and `profile.get('title')`, so code
+and templates written against the old dicts keep working.
+"""
+
+import sys
+from cache import json_type
+
+# Occupation detail sections each profile field is built from. Only these are
+# requested from the API (see utils.OCCUPATION_DETAIL_PARAMS); the title,
+# description and bright outlook fields come with every response.
+PROFILE_SECTIONS = {
+    'salary_range': ('wages',),
+    'education_required': ('training',),
+    'daily_tasks': ('dwas',),
+    'growth_projections': ('projectedEmployment',),
+    'related_careers': ('relatedOnetTitles',),
+    'training_programs': ('trainingPrograms',),
+    'video_url': ('videos',),
+}
+
+def intern(value):
+    """Intern a string so repeated values share one object; other values pass through."""
+    return sys.intern(value) if type(value) is str else value
+
+@json_type
+class OccupationProfile:
+    """The fields of one occupation that the app renders."""
+
+    __slots__ = (
+        'onet_code', 'title', 'description', 'salary_range', 'education_required', 'daily_tasks',
+        'growth_potential', 'growth_projections', 'related_careers', 'training_programs',
+        'volunteer_link', 'video_url', 'stale'
+    )
+
+    def __init__(self, onet_code, title, description=None, salary_range=None, education_required='N/A',
+                 daily_tasks=(), growth_potential=None, growth_projections=None, related_careers=None,
+                 training_programs=(), volunteer_link=None, video_url=None, stale=False):
+        self.onet_code = intern(onet_code)
+        self.title = intern(title)
+        self.description = description
+        self.salary_range = salary_range
+        self.education_required = intern(education_required)
+        self.daily_tasks = tuple(intern(task) for task in daily_tasks or ())
+        self.growth_potential = intern(growth_potential)
+        self.growth_projections = growth_projections
+        self.related_careers = {intern(key): intern(value) for key, value in (related_careers or {}).items()}
+        self.training_programs = tuple(intern(program) for program in training_programs or ())
+        self.volunteer_link = volunteer_link
+        self.video_url = video_url
+        self.stale = stale
+
+    def to_dict(self):
+        """Return the profile as a JSON-serializable dict (the snapshot and disk cache format)."""
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data['daily_tasks'] = list(self.daily_tasks)
+        data['training_programs'] = list(self.training_programs)
+        if not self.stale:
+            del data['stale']
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a profile from to_dict() output, ignoring keys it doesn't know."""
+        return cls(**{name: data[name] for name in cls.__slots__ if name in data})
+
+    def replace(self, **changes):
+        """Return a copy with some fields changed, e.g. profile.replace(stale=True)."""
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data.update(changes)
+        return type(self)(**data)
+
+    def get(self, name, default=None):
+        return getattr(self, name, default) if name in self.__slots__ else default
+
+    def __getitem__(self, name):
+        if name not in self.__slots__:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def __contains__(self, name):
+        return name in self.__slots__
+
+    def __eq__(self, other):
+        if not isinstance(other, OccupationProfile):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return f'OccupationProfile({self.onet_code!r}, {self.title!r})'
@@ -0,0 +1,126 @@
+"""
+Background prefetching of lookups a user is likely to make next.
+
+After a career page is served, the occupations it links to are fetched in
+the background so the click-through finds them in the cache:
+
+    related = Prefetcher('related', fetch_occupation, skip=is_cached, idle=upstream_idle)
+    related.submit(['15-1252.00', '15-1254.00'])
+
+Prefetching is strictly best effort. Keys wait in a small bounded queue,
+a few worker tasks on the shared event loop work through it, and anything
+that doesn't get its turn soon enough is dropped rather than queued up.
+"""
+
+import asyncio
+import threading
+from collections import deque
+from http_client import get_event_loop
+
+class Prefetcher:
+    """Warms a cache in the background, within a fixed budget.
+
+    submit() takes keys from any thread. Keys already queued or in progress
+    are ignored. When the queue is full the oldest key is dropped for the
+    newest, since the latest page is the likeliest next hop. At most
+    `workers` lookups run at once, and only while `idle()` is true, so
+    requests being served go first; a key that waits `idle_timeout` seconds
+    is dropped. Once `budget` lookups have been made the prefetcher stops
+    for the life of the process.
+
+    `fetch(key)` and `skip(key)` are coroutine functions; keys for which
+    skip() is true (e.g. already cached) aren't fetched or counted. fetch()
+    raises if the lookup failed, which counts as an error.
+    """
+
+    def __init__(self, name, fetch, workers=2, max_queued=16, budget=500,
+                 skip=None, idle=None, idle_timeout=1.0, idle_poll=0.05):
+        self.name = name
+        self.fetch = fetch
+        self.workers = workers
+        self.max_queued = max_queued
+        self.budget = budget
+        self.skip = skip
+        self.idle = idle
+        self.idle_timeout = idle_timeout
+        self.idle_poll = idle_poll
+        # Only touched on the event loop
+        self._queue = deque()
+        self._seen = set()
+        self._active = 0
+        self._started = 0
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.prefetched = 0
+        self.skipped = 0
+        self.dropped = 0
+        self.errors = 0
+
+    def submit(self, keys):
+        """Queue keys for prefetching; returns immediately."""
+        keys = list(keys)
+        if keys and self.workers > 0 and self._started < self.budget:
+            get_event_loop().call_soon_threadsafe(self._enqueue, keys)
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def _enqueue(self, keys):
+        for key in keys:
+            if key in self._seen:
+                continue
+            self._count('submitted')
+            if len(self._queue) >= self.max_queued:
+                self._seen.discard(self._queue.popleft())
+                self._count('dropped')
+            self._queue.append(key)
+            self._seen.add(key)
+        while self._active < min(self.workers, len(self._queue)):
+            self._active += 1
+            asyncio.ensure_future(self._work())
+
+    async def _wait_until_idle(self):
+        """Wait for idle() to be true; False if it wasn't within idle_timeout."""
+        if self.idle is None:
+            return True
+        waited = 0.0
+        while not self.idle():
+            if waited >= self.idle_timeout:
+                return False
+            await asyncio.sleep(self.idle_poll)
+            waited += self.idle_poll
+        return True
+
+    async def _work(self):
+        try:
+            while self._queue:
+                key = self._queue.popleft()
+                try:
+                    if self.skip is not None and await self.skip(key):
+                        self._count('skipped')
+                    elif not await self._wait_until_idle() or self._started >= self.budget:
+                        self._count('dropped')
+                    else:
+                        self._started += 1
+                        await self.fetch(key)
+                        self._count('prefetched')
+                except Exception as e:
+                    print(f"Error prefetching {key}: {str(e)}")
+                    self._count('errors')
+                finally:
+                    # Once cached, skip() is what keeps the key from being fetched again
+                    self._seen.discard(key)
+        finally:
+            self._active -= 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'submitted': self.submitted,
+                'prefetched': self.prefetched,
+                'skipped': self.skipped,
+                'dropped': self.dropped,
+                'errors': self.errors,
+                'budget_left': max(0, self.budget - self._started)
+            }
@@ -0,0 +1,115 @@
+"""
+Local career recommendation engine.
+
+Careers are indexed once as documents with a title, category, description
+and daily tasks (DWAs), and quiz answers are ranked against them with BM25F:
+each field's term frequency is length-normalized and weighted before the
+usual BM25 saturation, so a match in a title counts for more than one in a
+task list. Every query term also carries the weight of the quiz field it
+came from. Ranking is a few dictionary lookups per query term, with no
+network call.
+"""
+
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# How much a match in each career field counts
+DOCUMENT_FIELD_WEIGHTS = {
+    'title': 3.0,
+    'category': 2.0,
+    'description': 1.0,
+    'tasks': 0.5
+}
+
+# How much each quiz answer counts towards the ranking
+QUIZ_FIELD_WEIGHTS = {
+    'interests': 3.0,
+    'skills': 2.0,
+    'strengths': 1.0,
+    'personality': 0.5
+}
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9+#]+")
+STOPWORDS = frozenset("""
+a an and are as at be by for from in into is it of on or that the their them to with
+""".split())
+SUFFIXES = ('ment', 'ing', 'ers', 'er', 'es', 's')
+
+def stem(token):
+    """Strip up to two common suffixes, so "development", "developer" and "developers" agree."""
+    for _ in range(2):
+        for suffix in SUFFIXES:
+            if token.endswith(suffix) and len(token) - len(suffix) >= 4:
+                token = token[:-len(suffix)]
+                break
+        else:
+            break
+    return token
+
+def tokenize(text):
+    """Split text into stemmed terms, dropping stopwords."""
+    return [stem(token) for token in TOKEN_PATTERN.findall(str(text).lower()) if token not in STOPWORDS]
+
+class CareerIndex:
+    """An immutable BM25F index over career documents.
+
+    Each document is a dict with a "title" and any of the other
+    DOCUMENT_FIELD_WEIGHTS fields (strings, or lists of strings).
+    """
+
+    def __init__(self, documents, field_weights=DOCUMENT_FIELD_WEIGHTS, k1=K1, b=B):
+        self.titles = [document['title'] for document in documents]
+        field_terms = [
+            {field: tokenize(' '.join(value) if isinstance(value, (list, tuple)) else value or '')
+             for field, value in document.items() if field in field_weights}
+            for document in documents
+        ]
+        average_length = {
+            field: (sum(len(terms.get(field, ())) for terms in field_terms) / len(documents)) or 1.0
+            for field in field_weights
+        } if documents else {}
+
+        # Length-normalized, field-weighted term frequency of every term in every document
+        weighted_tf = defaultdict(dict)
+        for doc_id, terms_by_field in enumerate(field_terms):
+            for field, terms in terms_by_field.items():
+                norm = 1 - b + b * len(terms) / average_length[field]
+                for term, count in Counter(terms).items():
+                    weighted_tf[term][doc_id] = weighted_tf[term].get(doc_id, 0.0) + field_weights[field] * count / norm
+
+        # Postings hold each document's final BM25 contribution for the term
+        self.postings = {}
+        for term, docs in weighted_tf.items():
+            idf = math.log(1 + (len(documents) - len(docs) + 0.5) / (len(docs) + 0.5))
+            self.postings[term] = [(doc_id, idf * tf / (k1 + tf)) for doc_id, tf in docs.items()]
+
+    def __len__(self):
+        return len(self.titles)
+
+    def query_terms(self, fields, field_weights=QUIZ_FIELD_WEIGHTS):
+        """Weight each term by the quiz fields it appears in."""
+        weights = Counter()
+        for field, text in fields.items():
+            for term in set(tokenize(text or '')):
+                weights[term] += field_weights.get(field, 1.0)
+        return weights
+
+    def score_all(self, fields, field_weights=QUIZ_FIELD_WEIGHTS):
+        """Return {document index: score} for every document matching the query."""
+        scores = defaultdict(float)
+        for term, weight in self.query_terms(fields, field_weights).items():
+            for doc_id, contribution in self.postings.get(term, ()):
+                scores[doc_id] += weight * contribution
+        return scores
+
+    def search(self, fields, k=10, field_weights=QUIZ_FIELD_WEIGHTS):
+        """Return up to k (title, score) pairs for the best matching careers, best first."""
+        scores = self.score_all(fields, field_weights)
+        best = heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [(self.titles[doc_id], score) for doc_id, score in best]
@@ -0,0 +1,12 @@
+"""
+Loads the .env file into the environment.
+
+Modules read their settings from the environment when they are imported,
+so each of them imports this module first; whichever is imported first
+loads .env, before any setting is read. Variables already set in the
+environment take precedence over .env.
+"""
+
+from dotenv import load_dotenv
+
+load_dotenv()
@@ -0,0 +1,69 @@
+"""
+Single-flight coalescing of concurrent identical upstream lookups.
+"""
+
+import asyncio
+import os
+import settings
+
+# How long a caller waits on someone else's in-flight lookup before giving up
+FLIGHT_WAIT_TIMEOUT = float(os.getenv('CAREER_FLIGHT_WAIT_TIMEOUT', '30'))
+
+class AsyncSingleFlight:
+    """Run at most one lookup per key at a time and share its result with every waiter.
+
+    For coroutines sharing one event loop. Results are only shared while the
+    lookup is in flight; nothing is kept afterwards. If the leading call
+    raises, waiters don't inherit its error: the first of them starts a
+    fresh lookup and the rest join that one. A waiter that runs out of time
+    stops waiting without affecting the others. The shared lookup runs as its own task that every caller awaits through
+    asyncio.shield, so a caller being cancelled (for example by a page
+    deadline) never cancels the lookup for the others.
+    """
+
+    def __init__(self, wait_timeout=FLIGHT_WAIT_TIMEOUT):
+        self.wait_timeout = wait_timeout
+        self._tasks = {}
+        self.leaders = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.timeouts = 0
+
+    def _finished(self, key, task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if not task.cancelled() and task.exception() is not None:
+            self.errors += 1
+
+    async def do(self, key, func):
+        """Await func() for key, or the identical call already in flight."""
+        for attempt in range(2):
+            task = self._tasks.get(key)
+            if task is None:
+                self.leaders += 1
+                task = self._tasks[key] = asyncio.ensure_future(func())
+                task.add_done_callback(lambda done, key=key: self._finished(key, done))
+                return await asyncio.shield(task)
+
+            self.coalesced += 1
+            try:
+                return await asyncio.wait_for(asyncio.shield(task), self.wait_timeout)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                raise TimeoutError(f"Timed out waiting for in-flight lookup: {key}")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # The leader failed; start (or join) a fresh lookup instead of sharing its error
+                if attempt:
+                    raise
+
+    def stats(self):
+        """Return how many lookups ran and how many callers were coalesced onto them."""
+        return {
+            'in_flight': len(self._tasks),
+            'leaders': self.leaders,
+            'coalesced': self.coalesced,
+            'errors': self.errors,
+            'timeouts': self.timeouts
+        }
@@ -0,0 +1,169 @@
+"""
+Offline snapshot of CareerOneStop occupation data.
+
+The snapshot holds the `get_career_data` OccupationProfiles for every career the
+app links to (TECH_CAREERS, the career catalog and their related ONET
+titles) so the common request paths need no network calls. Rebuild it with:
+
+    python snapshot.py build [--output PATH] [--location ZIP]
+"""
+
+import argparse
+import gzip
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+import settings
+from circuit_breaker import UpstreamError
+from occupation import OccupationProfile
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_PATH = os.getenv(
+    'CAREER_SNAPSHOT_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'occupations.json.gz')
+)
+
+# \Z rather than $, which would also accept a trailing newline; codes end up in request URLs
+ONET_CODE_PATTERN = re.compile(r'\A\d{2}-\d{4}\.\d{2}\Z')
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+def normalize_title(title):
+    """Normalize a career title the same way it is stored in the snapshot."""
+    return ' '.join(str(title).lower().split())
+
+def related_onet_codes(career_data):
+    """Get the ONET codes from a career's related_careers mapping."""
+    codes = []
+    for key, value in (career_data.get('related_careers') or {}).items():
+        if ONET_CODE_PATTERN.match(str(key)):
+            codes.append(key)
+        elif ONET_CODE_PATTERN.match(str(value)):
+            codes.append(value)
+    return codes
+
+def load_snapshot(path=SNAPSHOT_PATH):
+    """Read a snapshot file, returning None if it is missing, unreadable or outdated."""
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            snapshot = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Error loading occupation snapshot: {str(e)}")
+        return None
+
+    if snapshot.get('version') != SNAPSHOT_VERSION:
+        print(f"Ignoring occupation snapshot with version {snapshot.get('version')}")
+        return None
+    snapshot['occupations'] = {onet_code: OccupationProfile.from_dict(career_data)
+                               for onet_code, career_data in snapshot['occupations'].items()}
+    return snapshot
+
+def get_snapshot():
+    """Get the app's snapshot, loading it on first use."""
+    global _snapshot
+    if _snapshot is None:
+        with _snapshot_lock:
+            if _snapshot is None:
+                _snapshot = load_snapshot() or {'version': SNAPSHOT_VERSION, 'titles': {}, 'occupations': {}}
+    return _snapshot
+
+def get_occupation(onet_code, location=None):
+    """Get snapshot data for an ONET code, or None if it isn't covered."""
+    snapshot = get_snapshot()
+    if location is not None and snapshot.get('location') != location:
+        return None
+    return snapshot['occupations'].get(onet_code)
+
+def get_onet_code(career_name):
+    """Get the ONET code the snapshot resolved a career title to, or None."""
+    return get_snapshot()['titles'].get(normalize_title(career_name))
+
+def build_snapshot(career_names, location, include_related=True, max_workers=4):
+    """Fetch every career (and optionally its related careers) and return a snapshot dict."""
+    import utils
+
+    titles = {}
+    occupations = {}
+
+    def resolve(career_name):
+        try:
+            careers = utils.get_career_match().find_career(career_name)
+        except UpstreamError as e:
+            print(f"Error searching for {career_name}: {str(e)}")
+            careers = None
+        return career_name, careers[0]['OnetCode'] if careers else None
+
+    def fetch(onet_code):
+        try:
+            career_data = utils.get_career_match().get_career_data(onet_code, location)
+        except UpstreamError as e:
+            print(f"Error fetching {onet_code}: {str(e)}")
+            return onet_code, None
+        # Stale fallbacks from an outage don't belong in a fresh snapshot
+        return onet_code, None if career_data and career_data.get('stale') else career_data
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        codes = []
+        for career_name, onet_code in pool.map(resolve, career_names):
+            if onet_code is None:
+                print(f"No occupation found for: {career_name}")
+                continue
+            titles[normalize_title(career_name)] = onet_code
+            codes.append(onet_code)
+
+        pending = list(dict.fromkeys(codes))
+        while pending:
+            next_codes = []
+            for onet_code, career_data in pool.map(fetch, pending):
+                if not career_data:
+                    print(f"No occupation data for: {onet_code}")
+                    continue
+                occupations[onet_code] = career_data
+                titles.setdefault(normalize_title(career_data['title']), onet_code)
+                if include_related:
+                    next_codes.extend(related_onet_codes(career_data))
+            # Related careers are followed one level deep
+            include_related = False
+            pending = [code for code in dict.fromkeys(next_codes) if code not in occupations]
+
+    return {
+        'version': SNAPSHOT_VERSION,
+        'built_at': datetime.now(timezone.utc).isoformat(),
+        'location': location,
+        'titles': titles,
+        'occupations': occupations
+    }
+
+def write_snapshot(snapshot, path=SNAPSHOT_PATH):
+    """Atomically write a snapshot as compact gzipped JSON."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+        json.dump(snapshot, f, separators=(',', ':'), sort_keys=True, default=OccupationProfile.to_dict)
+    os.replace(tmp_path, path)
+
+def main():
+    import utils
+    from catalog import catalog
+
+    parser = argparse.ArgumentParser(description='Build the offline CareerOneStop occupation snapshot.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build = subparsers.add_parser('build', help='fetch all known careers and write the snapshot')
+    build.add_argument('--output', default=SNAPSHOT_PATH, help='snapshot file to write')
+    build.add_argument('--location', default=utils.DEFAULT_LOCATION, help='ZIP code used for wages and projections')
+    build.add_argument('--no-related', action='store_true', help="don't follow RelatedOnetTitles")
+    args = parser.parse_args()
+
+    career_names = list(dict.fromkeys(utils.TECH_CAREERS + [c['title'] for c in catalog.careers]))
+    snapshot = build_snapshot(career_names, args.location, include_related=not args.no_related)
+    write_snapshot(snapshot, args.output)
+    print(f"Wrote {len(snapshot['occupations'])} occupations ({len(snapshot['titles'])} titles) to {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Keep the caches the app modules create at import time in memory
+os.environ['CAREER_CACHE_DIR'] = ''
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,150 @@
+import asyncio
+import os
+import time
+
+from cache import SQLiteCache, TieredCache, TTLCache, async_cached, normalize_key
+
+def make_cache(tmp_path, **kwargs):
+    return SQLiteCache(os.path.join(str(tmp_path), 'test.sqlite3'), **kwargs)
+
+def test_round_trips_json_keys_and_values(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.set(('detail', '15-1252.00', '95747'), {'title': 'Software Developers', 'tasks': ['a', 'b']})
+    assert cache.get(('detail', '15-1252.00', '95747')) == {'title': 'Software Developers', 'tasks': ['a', 'b']}
+    assert cache.get('missing', 'default') == 'default'
+
+def test_expired_entries_are_not_returned(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.set('old', 1, ttl=-1)
+    assert cache.get('old') is None
+
+def test_compact_drops_expired_entries(tmp_path):
+    cache = make_cache(tmp_path, compact_every=1000)
+    cache.set('live', 1)
+    cache.set('expired', 2, ttl=-1)
+    assert len(cache) == 2
+    cache.compact()
+    assert len(cache) == 1
+    assert cache.get('live') == 1
+
+def test_compact_keeps_the_latest_expiring_entries(tmp_path):
+    cache = make_cache(tmp_path, max_entries=3, compact_every=1000)
+    for i in range(6):
+        cache.set(f'key{i}', i, ttl=100 + i)
+    cache.compact()
+    assert len(cache) == 3
+    assert [cache.get(f'key{i}') for i in range(6)] == [None, None, None, 3, 4, 5]
+
+def test_writes_trigger_compaction(tmp_path):
+    cache = make_cache(tmp_path, max_entries=5, compact_every=4)
+    for i in range(8):
+        cache.set(f'key{i}', i)
+    # Compacted after the 4th and 8th writes
+    assert len(cache) == 5
+
+def test_survives_reopening(tmp_path):
+    make_cache(tmp_path).set('key', 'value')
+    assert make_cache(tmp_path).get('key') == 'value'
+
+def test_tiered_cache_promotes_disk_hits(tmp_path):
+    disk = make_cache(tmp_path)
+    disk.set('key', 'value', ttl=60)
+    memory = TTLCache(10, 3600)
+    cache = TieredCache(memory, disk)
+    assert cache.get('key') == 'value'
+    assert memory.get('key') == 'value'
+    # Promoted with the disk entry's remaining lifetime, not the memory default
+    assert memory._data['key'][1] - time.monotonic() <= 60
+
+def test_async_access_goes_through_both_tiers(tmp_path):
+    cache = TieredCache(TTLCache(10, 3600), make_cache(tmp_path))
+
+    async def run():
+        await cache.aset('key', [1, 2])
+        cache.memory.clear()
+        return await cache.aget('key')
+
+    assert asyncio.run(run()) == [1, 2]
+
+def test_stale_entries_outlive_their_ttl(tmp_path):
+    cache = make_cache(tmp_path, stale_ttl=60, compact_every=1000)
+    cache.set('recent', 1, ttl=-1)
+    cache.set('ancient', 2, ttl=-120)
+    assert cache.get('recent') is None
+    assert cache.get_stale('recent') == 1
+    assert cache.get_stale('ancient') is None
+    cache.compact()
+    assert len(cache) == 1
+
+def test_memory_cache_keeps_stale_entries():
+    cache = TTLCache(10, ttl=3600, stale_ttl=60)
+    cache.set('key', 'value', ttl=-1)
+    assert cache.get('key') is None
+    assert cache.get_stale('key') == 'value'
+    assert TTLCache(10, ttl=3600).get_stale('key') is None
+
+def test_contains_does_not_count_as_a_lookup(tmp_path):
+    memory = TTLCache(maxsize=2, ttl=60)
+    cache = TieredCache(memory, make_cache(tmp_path))
+    cache.set('a', 1)
+    cache.set('expired', 2, ttl=-1)
+    assert cache.contains('a')
+    assert not cache.contains('expired')
+    assert not cache.contains('missing')
+    assert memory.stats()['hits'] == memory.stats()['misses'] == 0
+    assert cache.disk.stats()['hits'] == cache.disk.stats()['misses'] == 0
+
+def test_memory_cache_evicts_the_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert cache.stats()['evictions'] == 1
+
+def test_memory_cache_counts_hits_misses_and_expirations():
+    cache = TTLCache(maxsize=4, ttl=60)
+    cache.set('a', 1)
+    cache.set('old', 2, ttl=-1)
+    cache.get('a')
+    cache.get('a')
+    cache.get('missing')
+    cache.get('old')
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['expirations']) == (2, 2, 1)
+    assert stats['hit_rate'] == 0.5
+    assert stats['size'] == 1
+
+def test_equivalent_keywords_share_one_entry():
+    cache = TTLCache()
+    calls = []
+
+    @async_cached(cache, lambda keyword: ('search', normalize_key(keyword)))
+    async def search(keyword):
+        calls.append(keyword)
+        return [keyword.strip()]
+
+    async def run():
+        first = await search(' Data  Scientist')
+        second = await search('data scientist')
+        return first, second
+
+    assert asyncio.run(run()) == (['Data  Scientist'], ['Data  Scientist'])
+    assert calls == [' Data  Scientist']
+    assert len(cache) == 1
+
+def test_none_results_are_not_cached():
+    cache = TTLCache()
+    calls = []
+
+    @async_cached(cache, lambda key: key)
+    async def lookup(key):
+        calls.append(key)
+        return None
+
+    asyncio.run(lookup('missing'))
+    asyncio.run(lookup('missing'))
+    assert calls == ['missing', 'missing']
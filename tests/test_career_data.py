@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+import utils
+
+@pytest.fixture
+def lookups(monkeypatch):
+    calls = []
+
+    async def get_career_data_async(career_name):
+        calls.append(career_name)
+        if career_name == 'Slow Career':
+            await asyncio.sleep(5)
+        if career_name == 'Broken Career':
+            raise RuntimeError('parse error')
+        if career_name == 'Unknown Career':
+            return None
+        return {'title': career_name}
+
+    monkeypatch.setattr(utils, 'get_career_data_async', get_career_data_async)
+    # A fresh bound on the background loop, unaffected by other tests
+    monkeypatch.setattr(utils, '_fetch_semaphore', None)
+    return calls
+
+def test_partial_results_within_the_deadline(lookups):
+    names = ['Data Scientist', 'Slow Career', 'Broken Career', 'Unknown Career']
+    results = utils.get_career_data_many(names, deadline=0.2)
+    assert results == {
+        'Data Scientist': {'title': 'Data Scientist'},
+        'Slow Career': None,
+        'Broken Career': None,
+        'Unknown Career': None
+    }
+    assert list(results) == names
+
+def test_duplicate_names_are_looked_up_once(lookups):
+    results = utils.get_career_data_many(['Web Developer', 'Data Scientist', 'Web Developer'])
+    assert sorted(lookups) == ['Data Scientist', 'Web Developer']
+    assert results == {'Web Developer': {'title': 'Web Developer'}, 'Data Scientist': {'title': 'Data Scientist'}}
+
+def test_lookups_share_the_concurrency_bound(lookups, monkeypatch):
+    monkeypatch.setattr(utils, 'FETCH_MAX_WORKERS', 2)
+    running = []
+    peak = []
+
+    async def get_career_data_async(career_name):
+        running.append(career_name)
+        peak.append(len(running))
+        await asyncio.sleep(0.02)
+        running.remove(career_name)
+        return {'title': career_name}
+
+    monkeypatch.setattr(utils, 'get_career_data_async', get_career_data_async)
+    results = utils.get_career_data_many([f'Career {i}' for i in range(6)])
+    assert len(results) == 6
+    assert max(peak) == 2
+
+def test_no_names():
+    assert utils.get_career_data_many([]) == {}
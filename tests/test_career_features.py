@@ -0,0 +1,44 @@
+import numpy as np
+
+import utils
+from career_features import QUIZ_OPTIONS, FeatureMatrix
+from recommender import CareerIndex
+
+DOCUMENTS = [
+    {'title': 'Frontend Developer', 'description': 'Build user-facing websites with JavaScript and React.'},
+    {'title': 'Data Engineer', 'description': 'Build systems to store data in SQL databases.'},
+    {'title': 'Game Designer', 'description': 'Create the concepts, rules, and story of video games.'},
+]
+
+def test_matrix_layout():
+    features = FeatureMatrix(CareerIndex(DOCUMENTS))
+    assert features.matrix.shape == (3, sum(len(options) for options in QUIZ_OPTIONS.values()))
+    assert features.matrix.dtype == np.float32
+    assert features.matrix.flags['C_CONTIGUOUS']
+    # Every feature is scaled so its best career scores 1
+    assert features.matrix.max() == 1.0
+
+def test_scores_rank_the_matching_career_first():
+    features = FeatureMatrix(CareerIndex(DOCUMENTS))
+    scores = features.scores({'interests': 'web', 'skills': 'frontend'})
+    assert features.top_k(scores, 1)[0][0] == 'Frontend Developer'
+    scores = features.scores({'interests': 'game', 'strengths': 'creative'})
+    assert features.top_k(scores, 1)[0][0] == 'Game Designer'
+
+def test_unknown_answers_are_ignored():
+    features = FeatureMatrix(CareerIndex(DOCUMENTS))
+    assert not features.has_option('interests', 'astronomy')
+    assert not features.vector({'interests': 'astronomy'}).any()
+    assert features.top_k(features.scores({'interests': 'astronomy'}), 3) == []
+
+def test_top_k_orders_best_first():
+    features = FeatureMatrix(CareerIndex(DOCUMENTS))
+    scores = np.array([0.5, 2.0, 0.5], dtype=np.float32)
+    assert [title for title, score in features.top_k(scores, 3)] == ['Data Engineer', 'Frontend Developer', 'Game Designer']
+    assert len(features.top_k(scores, 10)) == 3
+    assert FeatureMatrix(CareerIndex([])).top_k(np.zeros(0, dtype=np.float32), 5) == []
+
+def test_quiz_answers_and_free_text():
+    assert utils.get_career_recommendations('ai', 'research', 'ai', 'research')[0] in (
+        'Machine Learning Engineer', 'AI Research Scientist')
+    assert utils.get_career_recommendations('I love blockchain', '', '', '')[0] == 'Blockchain Developer'
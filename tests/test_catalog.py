@@ -0,0 +1,108 @@
+import json
+
+import pytest
+
+from catalog import CareerCatalog, catalog, load_catalog, title_key
+
+CAREERS = [
+    {'title': 'Software Developer', 'description': 'Design software.', 'category': 'Software', 'growth_rate': 25, 'avg_salary': 85000},
+    {'title': 'Data Scientist', 'description': 'Analyze data.', 'category': 'Data', 'growth_rate': 36, 'avg_salary': 100000},
+    {'title': 'Full Stack Developer', 'description': 'Build web applications.', 'category': 'Software', 'growth_rate': 28, 'avg_salary': 95000},
+    {'title': 'Data Engineer', 'description': 'Build data pipelines.', 'category': 'Data', 'growth_rate': 28, 'avg_salary': 110000},
+]
+
+def titles(careers):
+    return [career['title'] for career in careers]
+
+def test_indexes():
+    careers = CareerCatalog(CAREERS)
+    assert careers.categories == ('Software', 'Data')
+    assert titles(careers.by_category['Data']) == ['Data Scientist', 'Data Engineer']
+    assert titles(careers.by_growth_rate) == ['Data Scientist', 'Full Stack Developer', 'Data Engineer', 'Software Developer']
+    assert titles(careers.by_avg_salary) == ['Data Engineer', 'Data Scientist', 'Full Stack Developer', 'Software Developer']
+    assert careers.get('full-stack  developer')['avg_salary'] == 95000
+    assert careers.get('Astronaut') is None
+
+def test_records_are_read_only():
+    careers = CareerCatalog(CAREERS)
+    with pytest.raises(TypeError):
+        careers.careers[0]['title'] = 'Changed'
+    CAREERS[0]['title'] = 'Changed'
+    try:
+        assert careers.careers[0]['title'] == 'Software Developer'
+    finally:
+        CAREERS[0]['title'] = 'Software Developer'
+
+def test_query_filters_and_sorts():
+    careers = CareerCatalog(CAREERS)
+    assert titles(careers.query(category='Software')['careers']) == ['Software Developer', 'Full Stack Developer']
+    assert titles(careers.query(category='Data', sort='avg_salary')['careers']) == ['Data Engineer', 'Data Scientist']
+    assert titles(careers.query(text='BUILD', sort='growth_rate')['careers']) == ['Full Stack Developer', 'Data Engineer']
+    assert titles(careers.query(min_growth_rate=28, min_avg_salary=100000)['careers']) == ['Data Scientist', 'Data Engineer']
+    assert careers.query(category='Astronomy')['total'] == 0
+    with pytest.raises(ValueError):
+        careers.query(sort='title')
+
+def test_query_paginates():
+    careers = CareerCatalog(CAREERS)
+    page = careers.query(sort='growth_rate', page=2, per_page=3)
+    assert titles(page['careers']) == ['Software Developer']
+    assert (page['total'], page['page'], page['pages']) == (4, 2, 2)
+    # Out-of-range pages are clamped
+    assert careers.query(page=9, per_page=3)['page'] == 2
+    assert careers.query(page=0, per_page=3)['page'] == 1
+    assert CareerCatalog([]).query() == {'careers': (), 'total': 0, 'page': 1, 'pages': 1}
+
+def test_load_catalog(tmp_path, capsys):
+    path = tmp_path / 'careers.json'
+    path.write_text(json.dumps({'version': 1, 'careers': CAREERS}))
+    assert len(load_catalog(str(path))) == 4
+    path.write_text(json.dumps({'version': 0, 'careers': CAREERS}))
+    assert len(load_catalog(str(path))) == 0
+    assert len(load_catalog(str(tmp_path / 'missing.json'))) == 0
+    assert 'Error loading career catalog' in capsys.readouterr().out
+
+def test_shipped_catalog():
+    assert len(catalog) > 0
+    for career in catalog.careers:
+        assert set(career) == {'title', 'description', 'category', 'growth_rate', 'avg_salary'}
+    assert title_key('Machine Learning Engineer') in catalog.by_title
+
+def test_search_matches_every_term():
+    careers = CareerCatalog(CAREERS)
+    assert titles(careers.search('DATA')['careers']) == ['Data Scientist', 'Data Engineer']
+    assert titles(careers.search('build  pipe')['careers']) == ['Data Engineer']
+    # Long terms match anywhere; short terms only at the start of a word
+    assert titles(careers.search('eloper')['careers']) == ['Software Developer', 'Full Stack Developer']
+    assert titles(careers.search('de')['careers']) == ['Software Developer', 'Full Stack Developer']
+    assert careers.search('ta')['total'] == 0
+    assert careers.search('astronomy') == {'careers': (), 'total': 0, 'facets': [], 'next_cursor': None}
+
+def test_search_ranks_title_matches_first():
+    careers = CareerCatalog(CAREERS)
+    assert titles(careers.search('build')['careers']) == ['Full Stack Developer', 'Data Engineer']
+    assert titles(careers.search('software')['careers']) == ['Software Developer']
+    assert titles(careers.search('developer')['careers']) == ['Software Developer', 'Full Stack Developer']
+    assert titles(careers.search('full')['careers'])[0] == 'Full Stack Developer'
+
+def test_search_facets_and_category_filter():
+    careers = CareerCatalog(CAREERS)
+    results = careers.search('build', category='Data')
+    assert titles(results['careers']) == ['Data Engineer']
+    assert results['total'] == 1
+    assert results['facets'] == [{'category': 'Software', 'count': 1}, {'category': 'Data', 'count': 1}]
+
+def test_search_cursor_pagination():
+    careers = CareerCatalog(CAREERS)
+    seen = []
+    cursor = None
+    for _ in range(3):
+        results = careers.search(cursor=cursor, limit=3)
+        seen.extend(titles(results['careers']))
+        cursor = results['next_cursor']
+        if cursor is None:
+            break
+    assert seen == [career['title'] for career in CAREERS]
+    assert careers.search(limit=4)['next_cursor'] is None
+    with pytest.raises(ValueError):
+        careers.search(cursor='page-2')
@@ -0,0 +1,55 @@
+import threading
+from types import SimpleNamespace
+
+import career_app
+
+class StubModel:
+    """Records the generation calls made by the chatbot."""
+
+    def __init__(self, reply='Sure, here is how to start.'):
+        self.reply = reply
+        self.calls = []
+
+    async def generate_content_async(self, contents):
+        self.calls.append(contents)
+        return SimpleNamespace(text=self.reply)
+
+def install_model(monkeypatch, model):
+    built_on = []
+    def get_chat_model(career):
+        built_on.append(threading.current_thread().name)
+        return model
+    monkeypatch.setattr(career_app, 'get_chat_model', get_chat_model)
+    monkeypatch.setattr(career_app, 'chat_response_cache', career_app.ChatResponseCache())
+    return built_on
+
+def history(count):
+    return [{'role': 'user' if i % 2 == 0 else 'assistant', 'content': f'message {i}'} for i in range(count)]
+
+def test_model_is_built_off_the_upstream_loop(monkeypatch):
+    built_on = install_model(monkeypatch, StubModel())
+    career_app.get_chat_response('How do I start?', 'Data Scientist', [])
+    assert built_on and 'upstream-io' not in built_on
+
+def test_one_generation_call_per_message(monkeypatch):
+    model = StubModel()
+    install_model(monkeypatch, model)
+    reply = career_app.get_chat_response('How do I start?', 'Data Scientist', history(4))
+    assert reply == career_app.format_response(model.reply)
+    assert len(model.calls) == 1
+    # The system instruction is carried by the model, so the call holds only the conversation
+    assert model.calls[0][-1] == {'role': 'user', 'parts': ['How do I start?']}
+
+def test_chat_contents_keep_the_recent_window_with_gemini_roles():
+    contents = career_app.build_chat_contents('And then?', history(10))
+    assert len(contents) == career_app.CHAT_HISTORY_WINDOW + 1
+    assert [content['parts'][0] for content in contents[:-1]] == [f'message {i}' for i in range(4, 10)]
+    assert [content['role'] for content in contents[:-1]] == ['user', 'model'] * 3
+    assert contents[-1] == {'role': 'user', 'parts': ['And then?']}
+
+def test_repeated_question_is_answered_from_the_cache(monkeypatch):
+    model = StubModel()
+    install_model(monkeypatch, model)
+    career_app.get_chat_response('How do I start?', 'Data Scientist', [])
+    career_app.get_chat_response('how do I start', 'Data Scientist', [])
+    assert len(model.calls) == 1
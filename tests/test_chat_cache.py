@@ -0,0 +1,66 @@
+import chat_cache
+from chat_cache import ChatResponseCache, jaccard, tokenize
+
+HISTORY = [
+    {'role': 'user', 'content': 'Tell me about data science'},
+    {'role': 'assistant', 'content': 'Data science combines statistics and programming.'},
+]
+
+def test_tokenize_normalizes_rephrasings():
+    assert tokenize('What does a Data Scientist do?') == tokenize('what do data scientists do')
+
+def test_tokenize_keeps_interrogatives():
+    assert tokenize('How to become a nurse') != tokenize('Why become a nurse')
+
+def test_jaccard():
+    assert jaccard(frozenset('ab'), frozenset('ab')) == 1.0
+    assert jaccard(frozenset('ab'), frozenset('bc')) == 1 / 3
+    assert jaccard(frozenset(), frozenset('a')) == 0.0
+
+def test_exact_hit_for_equivalent_message():
+    cache = ChatResponseCache()
+    cache.set('Data Scientist', 'What does a Data Scientist do?', [], 'reply')
+    assert cache.get('data  scientist', 'what do data scientists do', []) == 'reply'
+    assert cache.stats()['exact_hits'] == 1
+
+def test_similar_hit_above_threshold():
+    cache = ChatResponseCache(similarity=0.8)
+    cache.set('Nurse', 'what skills do registered nurses need for hospital work', [], 'reply')
+    assert cache.get('Nurse', 'what skills do registered nurses need for hospital jobs', []) is None
+    assert cache.get('Nurse', 'what skills do registered nurses need for hospital work today', []) == 'reply'
+    stats = cache.stats()
+    assert stats['similar_hits'] == 1
+    assert stats['misses'] == 1
+
+def test_entries_are_scoped_to_career_and_history():
+    cache = ChatResponseCache()
+    cache.set('Nurse', 'what is the salary', HISTORY, 'reply')
+    assert cache.get('Teacher', 'what is the salary', HISTORY) is None
+    assert cache.get('Nurse', 'what is the salary', []) is None
+    assert cache.get('Nurse', 'what is the salary', HISTORY) == 'reply'
+
+def test_messages_without_tokens_are_not_cached():
+    cache = ChatResponseCache()
+    cache.set('Nurse', 'is it?', [], 'reply')
+    assert cache.get('Nurse', 'is it?', []) is None
+    assert cache.stats()['size'] == 0
+
+def test_least_recently_used_entries_are_evicted():
+    cache = ChatResponseCache(maxsize=2)
+    cache.set('Nurse', 'salary', [], 'a')
+    cache.set('Nurse', 'education', [], 'b')
+    assert cache.get('Nurse', 'salary', []) == 'a'
+    cache.set('Nurse', 'hours', [], 'c')
+    assert cache.get('Nurse', 'education', []) is None
+    assert cache.get('Nurse', 'salary', []) == 'a'
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['size'] == 2
+
+def test_expired_entries_are_not_served(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(chat_cache.time, 'monotonic', lambda: now[0])
+    cache = ChatResponseCache(ttl=10)
+    cache.set('Nurse', 'what is the salary', [], 'reply')
+    now[0] += 11
+    assert cache.get('Nurse', 'what is the salary', []) is None
+    assert cache.get('Nurse', 'what is the salary range', []) is None
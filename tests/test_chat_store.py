@@ -0,0 +1,36 @@
+import os
+import threading
+
+from cache import SQLiteCache, TTLCache
+from chat_store import ChatStore
+
+def test_append_keeps_the_most_recent_messages():
+    store = ChatStore(TTLCache(10, 60), max_messages=3)
+    store.append('c', 1, 2)
+    store.append('c', 3, 4)
+    assert store.get_history('c') == [2, 3, 4]
+    assert store.get_history(None) == []
+
+def test_concurrent_appends_are_not_lost(tmp_path):
+    path = os.path.join(str(tmp_path), 'chat.sqlite3')
+
+    def worker(i):
+        # A separate backend per thread, like separate worker processes
+        store = ChatStore(SQLiteCache(path), max_messages=1000)
+        for j in range(25):
+            store.append('c', f'{i}-{j}')
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    history = ChatStore(SQLiteCache(path)).get_history('c')
+    assert sorted(history) == sorted(f'{i}-{j}' for i in range(4) for j in range(25))
+
+def test_clear():
+    store = ChatStore(TTLCache(10, 60))
+    store.append('c', 1)
+    store.clear('c')
+    assert store.get_history('c') == []
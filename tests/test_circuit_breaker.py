@@ -0,0 +1,81 @@
+import asyncio
+import time
+
+import pytest
+
+from cache import TTLCache, async_cached
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, UpstreamError
+
+def fail(breaker, times):
+    for _ in range(times):
+        breaker.before_call()
+        breaker.record_failure()
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker('test', failure_threshold=3, reset_timeout=60)
+    fail(breaker, 2)
+    assert breaker.state == CLOSED
+    fail(breaker, 1)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert breaker.stats()['rejected'] == 1
+
+def test_successes_reset_the_failure_count():
+    breaker = CircuitBreaker('test', failure_threshold=3)
+    fail(breaker, 2)
+    breaker.before_call()
+    breaker.record_success(0.01)
+    fail(breaker, 2)
+    assert breaker.state == CLOSED
+
+def test_slow_calls_count_as_failures():
+    breaker = CircuitBreaker('test', failure_threshold=2, slow_call=1)
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_success(1.5)
+    assert breaker.state == OPEN
+    assert breaker.stats()['slow_calls'] == 2
+
+def test_half_open_probe_closes_the_circuit():
+    breaker = CircuitBreaker('test', failure_threshold=1, reset_timeout=0.05)
+    fail(breaker, 1)
+    time.sleep(0.06)
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+    # Only the probe goes through
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success(0.01)
+    assert breaker.state == CLOSED
+    breaker.before_call()
+
+def test_failed_probe_reopens_the_circuit():
+    breaker = CircuitBreaker('test', failure_threshold=3, reset_timeout=0.05)
+    fail(breaker, 3)
+    time.sleep(0.06)
+    fail(breaker, 1)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert breaker.stats()['opens'] == 1
+
+def test_stale_value_is_served_when_upstream_fails():
+    cache = TTLCache(10, ttl=60, stale_ttl=600)
+    calls = []
+
+    @async_cached(cache, lambda key: key, stale_on=(UpstreamError,), mark_stale=lambda value: dict(value, stale=True))
+    async def lookup(key):
+        calls.append(key)
+        if len(calls) > 1:
+            raise CircuitOpenError('down')
+        return {'title': 'Nurse'}
+
+    assert asyncio.run(lookup('nurse')) == {'title': 'Nurse'}
+    # Expire the entry without dropping it
+    cache._data['nurse'] = (cache._data['nurse'][0], time.monotonic() - 1)
+    assert cache.get('nurse') is None
+    assert asyncio.run(lookup('nurse')) == {'title': 'Nurse', 'stale': True}
+
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(lookup('unknown'))
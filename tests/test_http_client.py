@@ -0,0 +1,92 @@
+import asyncio
+import http.server
+import socket
+import threading
+
+import httpx
+import pytest
+
+import http_client
+from http_client import AsyncHttpClient, backoff_delay
+
+class FlakyHandler(http.server.BaseHTTPRequestHandler):
+    """Answers with the queued status codes, then 200."""
+
+    protocol_version = 'HTTP/1.1'
+    statuses = []
+    retry_after = None
+    calls = 0
+
+    def do_GET(self):
+        cls = type(self)
+        cls.calls += 1
+        status = cls.statuses.pop(0) if cls.statuses else 200
+        body = b'{"ok": true}'
+        self.send_response(status)
+        if status != 200 and cls.retry_after is not None:
+            self.send_header('Retry-After', cls.retry_after)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server():
+    FlakyHandler.statuses = []
+    FlakyHandler.retry_after = None
+    FlakyHandler.calls = 0
+    httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), FlakyHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{httpd.server_port}/'
+    httpd.shutdown()
+    httpd.server_close()
+
+def closed_port_url():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        port = s.getsockname()[1]
+    return f'http://127.0.0.1:{port}/'
+
+def test_backoff_delay_is_jittered_and_capped():
+    for attempt in range(10):
+        assert 0 <= backoff_delay(attempt, None, 0.25, 4) <= min(4, 0.25 * 2 ** attempt)
+
+def test_backoff_delay_honours_retry_after():
+    assert backoff_delay(0, '2', 0.25, 4) == 2
+    assert backoff_delay(0, '60', 0.25, 4) == 4
+    # HTTP-date values fall back to jittered backoff
+    assert backoff_delay(0, 'Wed, 21 Oct 2015 07:28:00 GMT', 0.25, 4) <= 0.25
+
+def test_async_client_retries_retryable_statuses(server, monkeypatch):
+    async def no_async_sleep(delay):
+        pass
+    monkeypatch.setattr(http_client.asyncio, 'sleep', no_async_sleep)
+    FlakyHandler.statuses = [500, 503]
+
+    async def run():
+        client = AsyncHttpClient(max_retries=2)
+        try:
+            return await client.get(server, params={'flag': True})
+        finally:
+            await client.close()
+
+    response = asyncio.run(run())
+    assert response.status_code == 200
+    assert FlakyHandler.calls == 3
+
+def test_async_client_raises_after_connect_errors(monkeypatch):
+    async def no_async_sleep(delay):
+        pass
+    monkeypatch.setattr(http_client.asyncio, 'sleep', no_async_sleep)
+
+    async def run():
+        client = AsyncHttpClient(max_retries=1)
+        try:
+            await client.get(closed_port_url())
+        finally:
+            await client.close()
+
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(run())
@@ -0,0 +1,39 @@
+import pytest
+
+from keyword_matcher import CORE_TECH_CATEGORIES, KeywordMatcher, tech_matcher, trie_pattern
+
+@pytest.mark.parametrize('title, categories', [
+    ('Software Developers', {'software'}),
+    ('Machine Learning Engineer', {'ai', 'engineering'}),
+    ('Machine  learning engineer', {'ai', 'engineering'}),
+    ('AI Research Scientist', {'ai'}),
+    ('Database Architects', {'data'}),
+    ('Cybersecurity Analyst', {'security'}),
+    ('Network and Computer Systems Administrators', {'computing'}),
+    ('IoT Solutions Architect', {'emerging'}),
+    ('Aerospace Engineering Technicians', {'engineering'}),
+])
+def test_categories(title, categories):
+    assert tech_matcher.categories(title) == categories
+
+@pytest.mark.parametrize('title', [
+    'Maintenance Workers', 'Aircraft Mechanics', 'Nursing Aides', 'Retail Salespersons', 'Registered Nurses'
+])
+def test_short_keywords_only_match_whole_words(title):
+    assert not tech_matcher.matches(title)
+
+def test_matches_within_categories():
+    assert tech_matcher.matches('Data Scientist', CORE_TECH_CATEGORIES)
+    assert tech_matcher.matches('Technical Product Manager')
+    assert not tech_matcher.matches('Technical Product Manager', CORE_TECH_CATEGORIES)
+
+def test_trie_pattern_prefers_longer_words():
+    import re
+    pattern = re.compile(trie_pattern(['data', 'database', 'devops']))
+    assert pattern.match('databases').group() == 'database'
+    assert pattern.match('data science').group() == 'data'
+
+def test_custom_matcher():
+    matcher = KeywordMatcher({'health': ('nurse', 'RN'), 'law': ('legal',)})
+    assert matcher.categories('Registered Nurse (RN), legal consultant') == {'health', 'law'}
+    assert matcher.categories('Burns unit') == frozenset()
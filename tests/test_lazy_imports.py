@@ -0,0 +1,21 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def imported_after(statement, modules):
+    """Run statement in a fresh interpreter and return which of modules it imported."""
+    check = f"import sys\n{statement}\nprint(','.join(m for m in {modules!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, '-c', check], cwd=ROOT, capture_output=True, text=True, check=True)
+    return [name for name in result.stdout.strip().split(',') if name]
+
+def test_app_import_defers_heavy_modules():
+    assert imported_after('import career_app', ('google.generativeai', 'httpx', 'numpy')) == []
+
+def test_app_import_creates_no_clients():
+    statement = 'import career_app, utils; assert utils._async_career_match is None and career_app._genai is None'
+    assert imported_after(statement, ()) == []
+
+def test_quiz_scoring_imports_numpy():
+    assert imported_after("import utils; utils.get_career_recommendations('ai', '', '', '')", ('numpy', 'httpx')) == ['numpy']
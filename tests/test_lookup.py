@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+import career_app
+import snapshot
+import utils
+from cache import TTLCache
+from occupation import OccupationProfile
+
+class StubCareerMatch:
+    """Records every CareerOneStop call; searches find one occupation."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def find_career(self, keyword):
+        self.calls.append(('search', keyword))
+        return [{'OnetTitle': 'Searched Title', 'OnetCode': '15-9999.00', 'OccupationDescription': ''}]
+
+    async def get_career_data(self, onet_code, location):
+        self.calls.append(('detail', onet_code))
+        return OccupationProfile(onet_code, 'Fetched')
+
+@pytest.fixture
+def upstream(monkeypatch):
+    career_match = StubCareerMatch()
+    monkeypatch.setattr(utils, 'get_async_career_match', lambda: career_match)
+    monkeypatch.setattr(utils, 'title_index', TTLCache())
+    monkeypatch.setattr(snapshot, '_snapshot', {
+        'version': snapshot.SNAPSHOT_VERSION,
+        'location': utils.DEFAULT_LOCATION,
+        'titles': {'data scientist': '15-2051.00'},
+        'occupations': {'15-2051.00': OccupationProfile('15-2051.00', 'Data Scientists')}
+    })
+    return career_match
+
+def test_onet_code_pattern_rejects_trailing_text():
+    assert snapshot.ONET_CODE_PATTERN.match('15-1252.00')
+    assert not snapshot.ONET_CODE_PATTERN.match('15-1252.00\n')
+    assert not snapshot.ONET_CODE_PATTERN.match('15-1252.00/../x')
+
+def test_snapshot_is_checked_before_the_title_index(upstream):
+    utils.title_index.set('data scientist', {'code': '15-0000.00', 'title': 'Indexed'})
+    assert utils.lookup_occupation(' Data  Scientist') == {'code': '15-2051.00', 'title': 'Data Scientists'}
+
+def test_title_index_is_checked_before_searching(upstream):
+    utils.title_index.set('web developer', {'code': '15-1254.00', 'title': 'Web Developers'})
+    occupation = asyncio.run(utils.resolve_occupation_async('Web Developer'))
+    assert occupation == {'code': '15-1254.00', 'title': 'Web Developers'}
+    assert upstream.calls == []
+
+def test_unknown_titles_are_searched_once_then_indexed(upstream):
+    assert utils.lookup_occupation('Game Designer') is None
+    occupation = asyncio.run(utils.resolve_occupation_async('Game Designer'))
+    assert occupation == {'code': '15-9999.00', 'title': 'Searched Title'}
+    assert asyncio.run(utils.resolve_occupation_async('game designer')) == occupation
+    assert upstream.calls == [('search', 'Game Designer')]
+
+def test_malformed_codes_are_never_looked_up(upstream):
+    assert utils.get_career_data_by_code('15-2051.00\n') is None
+    assert utils.get_career_data_by_code('../15-2051.00') is None
+    assert upstream.calls == []
+
+def test_career_page_ignores_a_malformed_code(upstream, monkeypatch):
+    by_code = []
+    async def get_career_data_by_code_async(onet_code):
+        by_code.append(onet_code)
+        return OccupationProfile(onet_code, 'Data Scientists')
+    monkeypatch.setattr(utils, 'get_career_data_by_code_async', get_career_data_by_code_async)
+    response = career_app.app.test_client().get('/career/Data-Scientist?code=15-2051.00%0A')
+    assert response.status_code == 200
+    # The page falls back to resolving the title, which the snapshot knows
+    assert by_code == ['15-2051.00']
+    assert upstream.calls == []
+
+def test_volunteer_page_makes_no_upstream_calls(upstream):
+    response = career_app.app.test_client().get('/volunteer?career=Game Designer&zip_code=95747&radius=25')
+    assert response.status_code == 200
+    assert b'Game Designer' in response.data
+    assert upstream.calls == []
@@ -0,0 +1,111 @@
+import threading
+import time
+
+import pytest
+
+import career_app
+import metrics
+from metrics import Counter, Gauge, Histogram, Registry
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram('latency_seconds', 'Latency.', ('route',), buckets=(0.1, 1.0), registry=Registry())
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.labels('/quiz').observe(value)
+    samples = {(name, labels[-1][1] if name.endswith('_bucket') else None): value
+               for name, labels, value in histogram.samples()}
+    assert samples[('latency_seconds_bucket', '0.1')] == 2
+    assert samples[('latency_seconds_bucket', '1.0')] == 3
+    assert samples[('latency_seconds_bucket', '+Inf')] == 4
+    assert samples[('latency_seconds_count', None)] == 4
+    assert samples[('latency_seconds_sum', None)] == pytest.approx(2.65)
+
+def test_counts_from_many_threads_survive_the_threads():
+    counter = Counter('events_total', 'Events.', registry=Registry())
+    gauge = Gauge('in_flight', 'In flight.', registry=Registry())
+
+    def work():
+        for _ in range(1000):
+            counter.inc()
+            gauge.inc()
+        gauge.dec(1000)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    del threads
+    assert counter.samples() == [('events_total', (), 8000)]
+    assert gauge.samples() == [('in_flight', (), 0)]
+
+def test_labels_must_match():
+    counter = Counter('errors_total', 'Errors.', ('route', 'method'), registry=Registry())
+    assert counter.labels('/quiz', 'GET') is counter.labels(route='/quiz', method='GET')
+    with pytest.raises(ValueError):
+        counter.labels('/quiz')
+
+def test_render_text_format():
+    registry = Registry()
+    Counter('errors_total', 'Errors.', ('route',), registry=registry).labels('/say "hi"').inc(2)
+    registry.add_collector(lambda: [('cache_entries', 'gauge', 'Entries.', [({'cache': 'search'}, 3)])])
+    assert registry.render() == (
+        '# HELP errors_total Errors.\n'
+        '# TYPE errors_total counter\n'
+        'errors_total{route="/say \\"hi\\""} 2\n'
+        '# HELP cache_entries Entries.\n'
+        '# TYPE cache_entries gauge\n'
+        'cache_entries{cache="search"} 3\n'
+    )
+
+def test_track_upstream_counts_failures():
+    def count(metric):
+        return dict(((name, labels), value) for name, labels, value in metric.samples())
+
+    with metrics.track_upstream('test-call'):
+        pass
+    with pytest.raises(RuntimeError):
+        with metrics.track_upstream('test-call'):
+            raise RuntimeError('upstream down')
+    labels = (('call', 'test-call'),)
+    assert count(metrics.UPSTREAM_DURATION)[('career_upstream_duration_seconds_count', labels)] == 2
+    assert count(metrics.UPSTREAM_ERRORS)[('career_upstream_errors_total', labels)] == 1
+    assert count(metrics.UPSTREAM_IN_FLIGHT)[('career_upstream_in_flight', labels)] == 0
+
+def test_metrics_endpoint(monkeypatch):
+    client = career_app.app.test_client()
+    client.get('/career-explorer')
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.content_type == metrics.CONTENT_TYPE
+    body = response.get_data(as_text=True)
+    assert 'career_request_duration_seconds_count{route="/career-explorer",method="GET"}' in body
+    assert 'career_template_render_duration_seconds_count{template="career_explorer.html"}' in body
+    assert 'career_cache_misses_total{cache="search",tier="memory"}' in body
+
+    monkeypatch.setenv('CAREER_METRICS_TOKEN', 'secret')
+    assert client.get('/metrics').status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer secret'}).status_code == 200
+
+def test_streamed_chat_is_measured_until_the_stream_ends(monkeypatch):
+    def stream_chat_response(message, career, chat_history):
+        time.sleep(0.2)
+        yield 'A slow reply.'
+    monkeypatch.setattr(career_app, 'stream_chat_response', stream_chat_response)
+    monkeypatch.setattr(career_app, 'chat_response_cache', career_app.ChatResponseCache())
+    route = '/chatbot/<career>/stream'
+    in_flight = metrics.REQUESTS_IN_FLIGHT.labels(route)
+    duration = metrics.REQUEST_DURATION.labels(route, 'POST')
+
+    def observed():
+        samples = duration.samples('d', ())
+        return samples[-1][2], samples[-2][2], in_flight.samples('g', ())[0][2]
+
+    count, total, flying = observed()
+    response = career_app.app.test_client().post('/chatbot/Nurse/stream', data={'message': 'Hello'})
+    assert observed() == (count, total, flying + 1)
+    assert b'A slow reply.' in response.get_data()
+    response.close()
+
+    new_count, new_total, new_flying = observed()
+    assert (new_count, new_flying) == (count + 1, flying)
+    assert new_total - total >= 0.2
@@ -0,0 +1,83 @@
+import os
+
+from cache import SQLiteCache
+from occupation import OccupationProfile
+from utils import OCCUPATION_DETAIL_PARAMS, parse_occupation_detail
+
+DETAIL = {
+    'RecordCount': 1,
+    'OccupationDetail': [{
+        'OnetTitle': 'Web Developers',
+        'OnetDescription': 'Develop and implement websites.',
+        'BrightOutlook': 'Bright',
+        'BrightOutlookCategory': 'Rapid Growth',
+        'EducationTraining': {'EducationTitle': "Bachelor's degree"},
+        'Wages': {'StateWagesList': [{'Median': '98000'}, {'Median': '47.12'}], 'NationalWagesList': [{}]},
+        'Projections': {'Projections': [
+            {'PerCentChange': '16', 'StateName': 'California'},
+            {'PerCentChange': '-2', 'StateName': 'United States'}
+        ]},
+        'Dwas': [{'DwaTitle': 'Write code.'}, {'DwaTitle': 'Test websites.'}],
+        'RelatedOnetTitles': {'15-1254.00': 'Web Developers', '15-1255.00': 'Web and Digital Interface Designers'},
+        'TrainingPrograms': ['Web Page Design']
+    }]
+}
+
+def parse(data=DETAIL):
+    return parse_occupation_detail(data, '15-1254.00', '95747', 'https://example.com/video.mp4')
+
+def test_parses_the_fields_the_templates_read():
+    profile = parse()
+    assert profile.title == 'Web Developers'
+    assert profile.salary_range == 'Annual: $98000, Hourly: $47.12'
+    assert profile.education_required == "Bachelor's degree"
+    assert profile.daily_tasks == ('Write code.', 'Test websites.')
+    assert profile.growth_projections == (
+        '\nWe predict the employment for this job to increase by 16% in California.'
+        '\nWe predict the employment for this job to decrease by -2% in United States.'
+    )
+    assert profile.related_careers['15-1255.00'] == 'Web and Digital Interface Designers'
+    assert profile.training_programs == ('Web Page Design',)
+    assert profile.video_url == 'https://example.com/video.mp4'
+    assert not profile.stale
+
+def test_parsing_leaves_the_response_untouched():
+    parse()
+    assert 'NationalWagesList' in DETAIL['OccupationDetail'][0]['Wages']
+
+def test_missing_sections_fall_back_to_placeholders():
+    profile = parse({'RecordCount': 1, 'OccupationDetail': [{'OnetTitle': 'Nurses'}]})
+    assert profile.salary_range == ('Annual: $(Annual Salary Data Not Available for this Occupation), '
+                                    'Hourly: $(Hourly Salary Data Not Available for this Occupation)')
+    assert profile.growth_projections == 'Projection Data Not Available for this Occupation'
+    assert profile.education_required == 'N/A'
+    assert parse({'RecordCount': 0}) is None
+
+def test_shared_strings_are_interned():
+    first = parse()
+    second = parse()
+    assert first.education_required is second.education_required
+    assert first.daily_tasks[0] is second.daily_tasks[0]
+
+def test_reads_like_the_old_dicts():
+    profile = parse()
+    assert profile['title'] == profile.get('title') == 'Web Developers'
+    assert profile.get('avg_salary') is None
+    assert profile.replace(stale=True).get('stale')
+    assert not profile.stale
+
+def test_round_trips_through_dicts_and_the_disk_cache(tmp_path):
+    profile = parse()
+    assert OccupationProfile.from_dict(profile.to_dict()) == profile
+
+    cache = SQLiteCache(os.path.join(str(tmp_path), 'detail.sqlite3'))
+    cache.set('quiz', {'careers': ['Web Developer'], 'career_data': {'Web Developer': profile}})
+    cached = cache.get('quiz')['career_data']['Web Developer']
+    assert isinstance(cached, OccupationProfile)
+    assert cached == profile
+
+def test_requests_only_the_sections_a_profile_uses():
+    requested = {section for section, wanted in OCCUPATION_DETAIL_PARAMS.items() if wanted}
+    assert requested == {'wages', 'training', 'dwas', 'projectedEmployment', 'relatedOnetTitles',
+                         'trainingPrograms', 'videos'}
+    assert OCCUPATION_DETAIL_PARAMS['ooh'] is False
@@ -0,0 +1,81 @@
+import threading
+
+import pytest
+from flask import template_rendered
+
+import career_app
+import utils
+
+@pytest.fixture
+def client(monkeypatch):
+    lookups = []
+
+    async def get_career_data_async(career_name):
+        lookups.append(career_name)
+        return {'description': f'All about {career_name}.', 'stale': career_name == 'Stale Career'}
+
+    async def get_career_data_by_code_async(onet_code):
+        return await get_career_data_async(onet_code)
+
+    monkeypatch.setattr(utils, 'get_career_data_async', get_career_data_async)
+    monkeypatch.setattr(utils, 'get_career_data_by_code_async', get_career_data_by_code_async)
+    client = career_app.app.test_client()
+    client.lookups = lookups
+    return client
+
+def test_career_page_is_shared_and_revalidated(client):
+    response = client.get('/career/Data-Scientist')
+    assert response.status_code == 200
+    assert response.headers['Cache-Control'] == 'public, max-age=300, s-maxage=3600'
+    assert 'Set-Cookie' not in response.headers
+    etag = response.headers['ETag']
+
+    response = client.get('/career/Data-Scientist', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+    assert response.headers['ETag'] == etag
+    assert client.lookups == ['Data Scientist']
+
+def test_etag_depends_on_the_page(client):
+    etag = client.get('/career/Data-Scientist').headers['ETag']
+    assert client.get('/career/Web-Developer').headers['ETag'] != etag
+    assert client.get('/career/Data-Scientist?code=15-2051.00', headers={'If-None-Match': etag}).status_code == 200
+
+def test_stale_career_pages_are_not_stored(client):
+    response = client.get('/career/Stale-Career')
+    assert response.status_code == 200
+    assert response.headers['Cache-Control'] == 'no-store'
+    assert 'ETag' not in response.headers
+
+def test_career_explorer_revalidation(client):
+    response = client.get('/career-explorer')
+    assert response.headers['Cache-Control'] == 'public, max-age=300, s-maxage=3600'
+    assert client.get('/career-explorer', headers={'If-None-Match': response.headers['ETag']}).status_code == 304
+    assert client.get('/career-explorer', headers={'If-None-Match': '"other"'}).status_code == 200
+
+def test_badges_are_awarded_separately(client):
+    response = client.post('/badges/career_researched')
+    assert response.get_json() == {'badge': 'career_researched', 'awarded': True}
+    assert client.post('/badges/career_researched').get_json()['awarded'] is False
+    assert client.post('/badges/quiz_completed').status_code == 404
+
+def test_async_views_render_off_the_upstream_loop(client):
+    rendered_on = []
+    def record(sender, template, context, **extra):
+        rendered_on.append(threading.current_thread().name)
+    template_rendered.connect(record, career_app.app)
+    try:
+        assert client.get('/career/Data-Scientist').status_code == 200
+        assert client.get('/quiz').status_code == 200
+    finally:
+        template_rendered.disconnect(record, career_app.app)
+    assert rendered_on and 'upstream-io' not in rendered_on
+
+def test_snapshot_is_read_off_the_upstream_loop(client, monkeypatch):
+    read_on = []
+    def get_snapshot():
+        read_on.append(threading.current_thread().name)
+        return {'built_at': '2026-01-01T00:00:00+00:00'}
+    monkeypatch.setattr(career_app, 'get_snapshot', get_snapshot)
+    assert client.get('/career/Data-Scientist').status_code == 200
+    assert read_on and 'upstream-io' not in read_on
@@ -0,0 +1,120 @@
+import asyncio
+import time
+
+import utils
+from cache import TTLCache
+from http_client import run_coroutine
+from occupation import OccupationProfile
+from prefetch import Prefetcher
+
+class Recorder:
+    """A fetch function that records its keys, optionally blocking until released."""
+
+    def __init__(self, blocked=False):
+        self.keys = []
+        self.blocked = blocked
+
+    async def __call__(self, key):
+        self.keys.append(key)
+        while self.blocked:
+            await asyncio.sleep(0.01)
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'timed out'
+        time.sleep(0.01)
+
+def settle(prefetcher):
+    """Wait until every submitted key has been fetched, skipped or dropped."""
+    def settled():
+        stats = prefetcher.stats()
+        return stats['submitted'] == stats['prefetched'] + stats['skipped'] + stats['dropped'] + stats['errors']
+    run_coroutine(asyncio.sleep(0))
+    wait_for(settled)
+
+def test_prefetches_each_submitted_key_once():
+    fetch = Recorder()
+    prefetcher = Prefetcher('test', fetch)
+    prefetcher.submit(['a', 'b', 'a'])
+    settle(prefetcher)
+    assert sorted(fetch.keys) == ['a', 'b']
+    assert prefetcher.stats()['prefetched'] == 2
+
+def test_skips_keys_that_are_already_cached():
+    async def cached(key):
+        return key == 'cached'
+    fetch = Recorder()
+    prefetcher = Prefetcher('test', fetch, skip=cached)
+    prefetcher.submit(['cached', 'new'])
+    settle(prefetcher)
+    assert fetch.keys == ['new']
+    assert prefetcher.stats()['skipped'] == 1
+    assert prefetcher.stats()['budget_left'] == 499
+
+def test_ignores_keys_already_queued_or_in_progress():
+    fetch = Recorder(blocked=True)
+    prefetcher = Prefetcher('test', fetch, workers=1)
+    prefetcher.submit(['a', 'b'])
+    wait_for(lambda: fetch.keys == ['a'])
+    prefetcher.submit(['a', 'b'])
+    fetch.blocked = False
+    settle(prefetcher)
+    assert fetch.keys == ['a', 'b']
+    assert prefetcher.stats()['submitted'] == 2
+
+def test_drops_the_oldest_keys_when_the_queue_is_full():
+    fetch = Recorder(blocked=True)
+    prefetcher = Prefetcher('test', fetch, workers=1, max_queued=2)
+    prefetcher.submit(['a'])
+    wait_for(lambda: fetch.keys == ['a'])
+    prefetcher.submit(['b', 'c', 'd'])
+    fetch.blocked = False
+    settle(prefetcher)
+    assert fetch.keys == ['a', 'c', 'd']
+    assert prefetcher.stats()['dropped'] == 1
+
+def test_stops_after_its_budget():
+    fetch = Recorder()
+    prefetcher = Prefetcher('test', fetch, workers=3, budget=2)
+    prefetcher.submit(['a', 'b', 'c', 'd'])
+    settle(prefetcher)
+    assert len(fetch.keys) == 2
+    assert prefetcher.stats()['budget_left'] == 0
+    prefetcher.submit(['e'])
+    run_coroutine(asyncio.sleep(0))
+    assert len(fetch.keys) == 2
+
+def test_drops_keys_while_the_upstream_stays_busy():
+    fetch = Recorder()
+    prefetcher = Prefetcher('test', fetch, idle=lambda: False, idle_timeout=0.05, idle_poll=0.01)
+    prefetcher.submit(['a'])
+    settle(prefetcher)
+    assert fetch.keys == []
+    assert prefetcher.stats()['dropped'] == 1
+
+def test_related_careers_are_prefetched_until_cached(monkeypatch):
+    cache = TTLCache()
+    fetched = []
+    class StubCareerMatch:
+        async def get_career_data(self, onet_code, location):
+            fetched.append(onet_code)
+            if onet_code == '15-0000.00':
+                return None
+            profile = OccupationProfile(onet_code, 'Related')
+            cache.set(('detail', onet_code, location), profile)
+            return profile
+    monkeypatch.setattr(utils, 'detail_cache', cache)
+    monkeypatch.setattr(utils, 'get_async_career_match', lambda: StubCareerMatch())
+
+    prefetcher = Prefetcher('test', utils.prefetch_occupation, skip=utils.is_occupation_cached_async)
+    prefetcher.submit(['15-1252.00', '15-0000.00'])
+    settle(prefetcher)
+    prefetcher.submit(['15-1252.00'])
+    settle(prefetcher)
+
+    assert sorted(fetched) == ['15-0000.00', '15-1252.00']
+    stats = prefetcher.stats()
+    assert (stats['prefetched'], stats['errors'], stats['skipped']) == (1, 1, 1)
+    # Checking the cache isn't a cache lookup
+    assert cache.stats()['hits'] == cache.stats()['misses'] == 0
@@ -0,0 +1,54 @@
+import pytest
+
+import utils
+from cache import TTLCache
+from http_client import run_coroutine
+
+@pytest.fixture
+def quiz(monkeypatch):
+    """Count recommendation and upstream calls behind get_quiz_results_async."""
+    calls = {'recommendations': 0, 'career_data': 0}
+    career_data = {'Data Scientist': {'description': 'Analyze data.'}, 'Web Developer': {'description': 'Build sites.'}}
+
+    def get_career_recommendations(*answers):
+        calls['recommendations'] += 1
+        return list(career_data)
+
+    async def get_career_data_many_async(careers):
+        calls['career_data'] += 1
+        return {career: career_data[career] for career in careers}
+
+    monkeypatch.setattr(utils, 'quiz_cache', TTLCache(8, 60))
+    monkeypatch.setattr(utils, 'get_career_recommendations', get_career_recommendations)
+    monkeypatch.setattr(utils, 'get_career_data_many_async', get_career_data_many_async)
+    return calls, career_data
+
+def get_results(*answers):
+    return run_coroutine(utils.get_quiz_results_async(*answers))
+
+def test_quiz_key_normalizes_answers():
+    assert utils.quiz_key(' AI', 'research', 'ai ', None) == utils.quiz_key('ai', 'Research', 'AI', '')
+    assert utils.quiz_key('ai', 'research', '', '') != utils.quiz_key('ai', '', 'research', '')
+
+def test_repeated_answers_are_served_from_the_cache(quiz):
+    calls, career_data = quiz
+    assert get_results('ai', 'research', 'ai', 'research') == (['Data Scientist', 'Web Developer'], career_data)
+    assert get_results('AI', 'research', 'ai ', 'Research') == (['Data Scientist', 'Web Developer'], career_data)
+    assert calls == {'recommendations': 1, 'career_data': 1}
+    assert utils.quiz_cache.stats()['hits'] == 1
+
+    get_results('web', 'creative', 'frontend', 'startup')
+    assert calls == {'recommendations': 2, 'career_data': 2}
+
+def test_partial_results_are_not_cached(quiz):
+    calls, career_data = quiz
+    career_data['Web Developer'] = None
+    assert get_results('ai', '', '', '')[1]['Web Developer'] is None
+    career_data['Web Developer'] = {'description': 'Build sites.', 'stale': True}
+    get_results('ai', '', '', '')
+    assert calls['career_data'] == 2
+
+    career_data['Web Developer'] = {'description': 'Build sites.'}
+    get_results('ai', '', '', '')
+    get_results('ai', '', '', '')
+    assert calls['career_data'] == 3
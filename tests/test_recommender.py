@@ -0,0 +1,71 @@
+import pytest
+
+import snapshot
+import utils
+from recommender import CareerIndex, stem, tokenize
+
+DOCUMENTS = [
+    {'title': 'Data Scientist', 'category': 'Data Science', 'description': 'Analyze complex data sets.'},
+    {'title': 'Web Developer', 'category': 'Web Development', 'description': 'Build websites and web applications.'},
+    {'title': 'Security Engineer', 'category': 'Cybersecurity', 'description': 'Protect networks and data.',
+     'tasks': ['Monitor networks for security breaches']},
+]
+
+def test_stem_and_tokenize():
+    assert stem('development') == stem('developer') == stem('developers') == 'develop'
+    assert stem('data') == 'data'
+    assert tokenize('The Data and the Web') == ['data', 'web']
+
+def test_title_matches_rank_above_description_matches():
+    index = CareerIndex(DOCUMENTS)
+    ranked = index.search({'interests': 'data'})
+    assert [title for title, score in ranked] == ['Data Scientist', 'Security Engineer']
+
+def test_quiz_field_weights():
+    index = CareerIndex(DOCUMENTS)
+    fields = {'interests': 'web', 'personality': 'security'}
+    assert index.search(fields, k=1)[0][0] == 'Web Developer'
+    assert index.search(fields, k=1, field_weights={'interests': 1, 'personality': 10})[0][0] == 'Security Engineer'
+
+def test_unmatched_queries_and_empty_index():
+    assert CareerIndex(DOCUMENTS).search({'interests': 'gardening'}) == []
+    assert CareerIndex([]).search({'interests': 'data'}) == []
+
+def test_recommendations_need_no_network(monkeypatch):
+    async def no_network(*args):
+        raise AssertionError('unexpected upstream call')
+    monkeypatch.setattr(utils.get_async_career_match(), 'find_career', no_network)
+
+    careers = utils.get_career_recommendations(
+        'artificial intelligence, machine learning', 'research', 'neural networks', 'research')
+    assert len(careers) == utils.RECOMMENDATION_COUNT
+    assert careers[0] in ('Machine Learning Engineer', 'AI Research Scientist')
+
+def test_recommendations_are_padded_with_tech_careers():
+    careers = utils.get_career_recommendations('blockchain', '', '', '')
+    assert len(careers) == utils.RECOMMENDATION_COUNT
+    assert careers[0] == 'Blockchain Developer'
+    assert len(set(careers)) == len(careers)
+
+def test_snapshot_occupations_are_indexed(monkeypatch):
+    monkeypatch.setattr(snapshot, '_snapshot', {
+        'version': snapshot.SNAPSHOT_VERSION,
+        'location': utils.DEFAULT_LOCATION,
+        'titles': {'data scientist': '15-2051.00'},
+        'occupations': {
+            '15-2051.00': {'title': 'Data Scientists', 'description': 'Develop and implement analytical methods.',
+                           'daily_tasks': ['Apply predictive modeling techniques']},
+            '15-1211.00': {'title': 'Computer Systems Analysts', 'description': 'Analyze computer systems.',
+                           'daily_tasks': []},
+            '29-1141.00': {'title': 'Registered Nurses', 'description': 'Assess patient health problems.',
+                           'daily_tasks': []}
+        }
+    })
+    titles = [document['title'] for document in utils.build_career_documents()]
+    # Merged into the explorer career, added as a tech career, skipped as non-tech
+    assert 'Data Scientists' not in titles
+    assert 'Computer Systems Analysts' in titles
+    assert 'Registered Nurses' not in titles
+
+    index = CareerIndex(utils.build_career_documents())
+    assert index.search({'skills': 'predictive techniques'}, k=1)[0][0] == 'Data Scientist'
@@ -0,0 +1,20 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_env_file_settings_reach_every_module(tmp_path):
+    env_file = tmp_path / '.env'
+    cache_dir = tmp_path / 'cache'
+    env_file.write_text(f'CAREER_CACHE_DIR={cache_dir}\nCHAT_STORE_BACKEND=memory\nCAREER_BREAKER_FAILURES=9\n')
+    check = (
+        'import dotenv.main\n'
+        f'dotenv.main.find_dotenv = lambda *args, **kwargs: {str(env_file)!r}\n'
+        'import career_app, cache, chat_store, circuit_breaker\n'
+        'print(cache.CACHE_DIR, chat_store.CHAT_STORE_BACKEND, circuit_breaker.BREAKER_FAILURE_THRESHOLD)\n'
+    )
+    env = {name: value for name, value in os.environ.items()
+           if name not in ('CAREER_CACHE_DIR', 'CHAT_STORE_BACKEND', 'CAREER_BREAKER_FAILURES')}
+    result = subprocess.run([sys.executable, '-c', check], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    assert result.stdout.split() == [str(cache_dir), 'memory', '9']
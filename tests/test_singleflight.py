@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+from singleflight import AsyncSingleFlight
+
+def test_async_calls_share_one_lookup():
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def lookup():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return 'result'
+
+    async def run():
+        return await asyncio.gather(*[flight.do('key', lookup) for _ in range(5)])
+
+    assert asyncio.run(run()) == ['result'] * 5
+    assert len(calls) == 1
+    assert flight.stats() == {'in_flight': 0, 'leaders': 1, 'coalesced': 4, 'errors': 0, 'timeouts': 0}
+
+def test_async_waiters_retry_when_the_leader_fails():
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def lookup():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        if len(calls) == 1:
+            raise ValueError('upstream down')
+        return 'recovered'
+
+    async def run():
+        return await asyncio.gather(*[flight.do('key', lookup) for _ in range(3)], return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert isinstance(results[0], ValueError)
+    assert results[1:] == ['recovered', 'recovered']
+    assert len(calls) == 2
+    assert flight.stats()['errors'] == 1
+
+def test_async_waiters_time_out():
+    flight = AsyncSingleFlight(wait_timeout=0.05)
+
+    async def lookup():
+        await asyncio.sleep(0.2)
+        return 'slow'
+
+    async def run():
+        leader = asyncio.ensure_future(flight.do('key', lookup))
+        await asyncio.sleep(0)
+        with pytest.raises(TimeoutError):
+            await flight.do('key', lookup)
+        return await leader
+
+    assert asyncio.run(run()) == 'slow'
+    assert flight.stats()['timeouts'] == 1
+
+def test_cancelling_a_caller_does_not_cancel_the_lookup():
+    flight = AsyncSingleFlight()
+
+    async def lookup():
+        await asyncio.sleep(0.05)
+        return 'result'
+
+    async def run():
+        first = asyncio.ensure_future(flight.do('key', lookup))
+        second = asyncio.ensure_future(flight.do('key', lookup))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == 'result'
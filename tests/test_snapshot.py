@@ -0,0 +1,112 @@
+import gzip
+import json
+import os
+
+import pytest
+
+import snapshot
+import utils
+from circuit_breaker import UpstreamError
+from occupation import OccupationProfile
+
+# code -> (title, related codes)
+OCCUPATIONS = {
+    '15-2051.00': ('Data Scientists', ['15-2041.00', '15-1252.00']),
+    '15-2041.00': ('Statisticians', ['15-2031.00']),
+    '15-1252.00': ('Software Developers', []),
+    '15-2031.00': ('Operations Research Analysts', []),
+}
+
+class StubCareerMatch:
+    """Blocking CareerMatch stand-in serving OCCUPATIONS."""
+
+    def __init__(self, stale=(), failing=()):
+        self.stale = stale
+        self.failing = failing
+        self.fetched = []
+
+    def find_career(self, keyword):
+        if keyword == 'Unknown Career':
+            return []
+        return [{'OnetTitle': 'Data Scientists', 'OnetCode': '15-2051.00', 'OccupationDescription': ''}]
+
+    def get_career_data(self, onet_code, location):
+        self.fetched.append(onet_code)
+        if onet_code in self.failing:
+            raise UpstreamError('detail request failed: 503')
+        title, related = OCCUPATIONS[onet_code]
+        return OccupationProfile(onet_code, title, related_careers={code: OCCUPATIONS[code][0] for code in related},
+                                 stale=onet_code in self.stale)
+
+@pytest.fixture
+def career_match(monkeypatch):
+    career_match = StubCareerMatch()
+    monkeypatch.setattr(utils, 'get_career_match', lambda: career_match)
+    return career_match
+
+def write_raw(path, data):
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        json.dump(data, f)
+
+def test_build_follows_related_careers_one_level_deep(career_match):
+    built = snapshot.build_snapshot(['Data Scientist', 'Unknown Career'], '95747')
+    assert sorted(built['occupations']) == ['15-1252.00', '15-2041.00', '15-2051.00']
+    assert built['titles']['data scientist'] == '15-2051.00'
+    assert built['titles']['statisticians'] == '15-2041.00'
+    assert sorted(career_match.fetched) == ['15-1252.00', '15-2041.00', '15-2051.00']
+
+def test_build_without_related_careers(career_match):
+    built = snapshot.build_snapshot(['Data Scientist'], '95747', include_related=False)
+    assert list(built['occupations']) == ['15-2051.00']
+
+def test_build_drops_stale_and_failed_occupations(career_match):
+    career_match.stale = ('15-2041.00',)
+    career_match.failing = ('15-1252.00',)
+    built = snapshot.build_snapshot(['Data Scientist'], '95747')
+    assert list(built['occupations']) == ['15-2051.00']
+
+def test_written_snapshot_round_trips(career_match, tmp_path):
+    path = str(tmp_path / 'occupations.json.gz')
+    built = snapshot.build_snapshot(['Data Scientist'], '95747')
+    snapshot.write_snapshot(built, path)
+    assert not os.path.exists(f'{path}.tmp')
+
+    loaded = snapshot.load_snapshot(path)
+    assert loaded['location'] == '95747'
+    assert loaded['titles'] == built['titles']
+    assert loaded['occupations'] == built['occupations']
+    assert isinstance(loaded['occupations']['15-2051.00'], OccupationProfile)
+
+def test_write_replaces_the_file_atomically(career_match, tmp_path, monkeypatch):
+    path = str(tmp_path / 'occupations.json.gz')
+    snapshot.write_snapshot(snapshot.build_snapshot(['Data Scientist'], '95747', include_related=False), path)
+
+    def fail(*args, **kwargs):
+        raise OSError('disk full')
+    monkeypatch.setattr(snapshot.json, 'dump', fail)
+    with pytest.raises(OSError):
+        snapshot.write_snapshot({'version': snapshot.SNAPSHOT_VERSION}, path)
+    # The old snapshot is still intact
+    assert list(snapshot.load_snapshot(path)['occupations']) == ['15-2051.00']
+
+def test_missing_unreadable_and_outdated_files_are_ignored(tmp_path):
+    assert snapshot.load_snapshot(str(tmp_path / 'missing.json.gz')) is None
+
+    corrupt = tmp_path / 'corrupt.json.gz'
+    corrupt.write_bytes(b'not gzip')
+    assert snapshot.load_snapshot(str(corrupt)) is None
+
+    outdated = str(tmp_path / 'outdated.json.gz')
+    write_raw(outdated, {'version': snapshot.SNAPSHOT_VERSION + 1, 'titles': {}, 'occupations': {}})
+    assert snapshot.load_snapshot(outdated) is None
+
+def test_occupations_are_only_served_for_the_snapshot_location(monkeypatch):
+    profile = OccupationProfile('15-2051.00', 'Data Scientists')
+    monkeypatch.setattr(snapshot, '_snapshot', {
+        'version': snapshot.SNAPSHOT_VERSION, 'location': '95747',
+        'titles': {'data scientist': '15-2051.00'}, 'occupations': {'15-2051.00': profile}
+    })
+    assert snapshot.get_occupation('15-2051.00') is profile
+    assert snapshot.get_occupation('15-2051.00', '95747') is profile
+    assert snapshot.get_occupation('15-2051.00', '10001') is None
+    assert snapshot.get_onet_code('Data  Scientist') == '15-2051.00'
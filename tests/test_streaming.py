@@ -0,0 +1,48 @@
+import json
+import random
+
+import pytest
+
+from career_app import StreamingFormatter, format_response, format_sse
+
+SAMPLES = [
+    '',
+    'Hello',
+    '**Bold** answer with `code` and _emphasis_',
+    'First paragraph.\nSecond paragraph.\n\n\nThird after blank lines.',
+    '  leading spaces\n   \n trailing spaces   \n',
+    '1. Step one\n2. Step two\n\nResource: https://example.com/a_b',
+    'Tabs\tand  double  spaces\r\nWindows line endings\r\n',
+    '\n\n\n',
+]
+
+def stream(text, sizes):
+    formatter = StreamingFormatter()
+    out, pos = [], 0
+    for size in sizes:
+        out.append(formatter.feed(text[pos:pos + size]))
+        pos += size
+    out.append(formatter.feed(text[pos:]))
+    return ''.join(out)
+
+@pytest.mark.parametrize('text', SAMPLES)
+def test_single_chunk_matches_format_response(text):
+    assert stream(text, []) == format_response(text)
+
+@pytest.mark.parametrize('text', SAMPLES)
+def test_character_chunks_match_format_response(text):
+    assert stream(text, [1] * len(text)) == format_response(text)
+
+def test_random_chunking_matches_format_response():
+    rng = random.Random(1234)
+    alphabet = 'ab *_`\n\t\r'
+    for _ in range(500):
+        text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        sizes = [rng.randint(1, 5) for _ in range(rng.randint(0, 10))]
+        assert stream(text, sizes) == format_response(text), repr(text)
+
+def test_format_sse():
+    assert format_sse({'text': 'hi'}) == 'data: {"text": "hi"}\n\n'
+    event = format_sse({'time': '10:00 AM'}, event='done')
+    assert event.startswith('event: done\n')
+    assert json.loads(event.split('data: ')[1]) == {'time': '10:00 AM'}
@@ -2,189 +2,308 @@
 Utility functions for the CareerPath Navigator application.
 """
 
+import asyncio
 import os
-import requests
-from dotenv import load_dotenv
+import threading
+import time
+import settings
+from cache import async_cached, create_cache, normalize_key
+from catalog import catalog
+from circuit_breaker import CLOSED, CircuitBreaker, UpstreamError
+from http_client import RETRY_STATUS_CODES, AsyncHttpClient, run_blocking, run_coroutine
+from keyword_matcher import tech_matcher
+from metrics import REGISTRY, track_upstream
+from occupation import PROFILE_SECTIONS, OccupationProfile
+from prefetch import Prefetcher
+from recommender import QUIZ_FIELD_WEIGHTS, CareerIndex
+from singleflight import AsyncSingleFlight
+import snapshot
 
-# Load environment variables
-load_dotenv()
+# Location used for wages and projections when none is given
+DEFAULT_LOCATION = '95747'
+
+# Root of the CareerOneStop API; the load test points it at a local stand-in
+CAREER_API_BASE_URL = os.getenv('CAREER_API_BASE_URL', 'https://api.careeronestop.org/v1/')
+
+# Bounds for the concurrent per-career lookups: at most FETCH_MAX_WORKERS at once per process,
+# and each quiz results page gets FETCH_DEADLINE seconds for its batch
+FETCH_MAX_WORKERS = int(os.getenv('CAREER_FETCH_WORKERS', '32'))
+FETCH_DEADLINE = float(os.getenv('CAREER_FETCH_DEADLINE', '10'))
+
+# Per-endpoint response caches (memory in front of disk); occupation data only changes a few times a year
+# Expired search and detail responses are kept CACHE_STALE_TTL seconds longer to serve during outages
+CACHE_MAX_ENTRIES = int(os.getenv('CAREER_CACHE_MAX_ENTRIES', '512'))
+CACHE_STALE_TTL = int(os.getenv('CAREER_STALE_TTL', '604800'))
+search_cache = create_cache('search', CACHE_MAX_ENTRIES, ttl=int(os.getenv('CAREER_SEARCH_TTL', '86400')), stale_ttl=CACHE_STALE_TTL)
+video_cache = create_cache('videos', CACHE_MAX_ENTRIES, ttl=int(os.getenv('CAREER_VIDEO_TTL', '604800')))
+DETAIL_CACHE_TTL = int(os.getenv('CAREER_DETAIL_TTL', '86400'))
+detail_cache = create_cache('detail', CACHE_MAX_ENTRIES, ttl=DETAIL_CACHE_TTL, stale_ttl=CACHE_STALE_TTL)
+
+# Concurrent identical lookups share one upstream call, whether they come from sync or async callers
+search_flight = AsyncSingleFlight()
+video_flight = AsyncSingleFlight()
+detail_flight = AsyncSingleFlight()
+
+# Each endpoint fails fast on its own while CareerOneStop is down or slow
+search_breaker = CircuitBreaker('search')
+video_breaker = CircuitBreaker('videos')
+detail_breaker = CircuitBreaker('detail')
+
+# Every optional section of the occupation detail endpoint. Only the ones an
+# OccupationProfile field is built from are requested, which keeps the
+# response (and its parse) small; the rest, including the OOH text and the
+# response metadata, are turned off.
+OCCUPATION_DETAIL_SECTIONS = (
+    "training", "interest", "videos", "tasks", "dwas", "wages", "alternateOnetTitles",
+    "projectedEmployment", "ooh", "stateLMILinks", "relatedOnetTitles", "skills", "knowledge",
+    "ability", "trainingPrograms", "industryEmpPattern", "toolsAndTechnology", "workValues",
+    "enableMetaData"
+)
+OCCUPATION_DETAIL_PARAMS = {
+    section: any(section in sections for sections in PROFILE_SECTIONS.values())
+    for section in OCCUPATION_DETAIL_SECTIONS
+}
+
+# Suggested instead of the API's training programs for data and machine learning careers
+DATA_TRAINING_PROGRAMS = (
+    "Data Science Bootcamp (e.g., DataCamp, Springboard)",
+    "Machine Learning Specialization (Coursera)",
+    "Data Engineering Certification (AWS, Google Cloud)",
+    "Python for Data Science (DataCamp)",
+    "SQL and Database Management",
+    "Big Data Technologies (Hadoop, Spark)",
+    "Data Visualization (Tableau, Power BI)",
+    "Statistical Analysis and Mathematics",
+    "Deep Learning Specialization",
+    "Cloud Data Platforms (AWS, Azure, GCP)"
+)
+
+# Persistent career title -> ONET code index, filled from every search response
+title_index = create_cache('titles', CACHE_MAX_ENTRIES * 4, ttl=int(os.getenv('CAREER_TITLE_INDEX_TTL', '2592000')))
+
+# Number of careers recommended for a quiz submission
+RECOMMENDATION_COUNT = 7
+
+# Complete quiz results (careers and their details) per normalized set of answers
+QUIZ_CACHE_MAX_ENTRIES = int(os.getenv('CAREER_QUIZ_CACHE_ENTRIES', '256'))
+quiz_cache = create_cache('quiz', QUIZ_CACHE_MAX_ENTRIES, ttl=int(os.getenv('CAREER_QUIZ_TTL', '3600')))
+quiz_flight = AsyncSingleFlight()
+
+# Background warming of the occupations a career page links to: at most PREFETCH_WORKERS lookups
+# at once, PREFETCH_QUEUE codes waiting, and PREFETCH_BUDGET lookups per process (0 workers turns it off)
+PREFETCH_WORKERS = int(os.getenv('CAREER_PREFETCH_WORKERS', '2'))
+PREFETCH_QUEUE = int(os.getenv('CAREER_PREFETCH_QUEUE', '16'))
+PREFETCH_BUDGET = int(os.getenv('CAREER_PREFETCH_BUDGET', '500'))
+
+# The CareerOneStop client and its blocking wrapper, created on first use
+_async_career_match = None
+_career_match = None
+_career_match_lock = threading.Lock()
+
+# Shared bound on in-flight career lookups, created on the background loop on first use
+_fetch_semaphore = None
+
+# Recommendation index and feature matrix over every known career, built on first use
+_career_index = None
+_career_features = None
+_career_index_lock = threading.Lock()
+
+class AsyncCareerMatch:
+    """Client for the CareerOneStop occupation API.
+
+    Its coroutines must run on the background event loop (see
+    http_client.run_coroutine); CareerMatch wraps them for blocking callers.
+    """
 
-class CareerMatch:
     def __init__(self):
-        self.base_url = 'https://api.careeronestop.org/v1/occupation/'
+        self.base_url = f'{CAREER_API_BASE_URL}occupation/'
         self.user_id = os.getenv('CAREER_USER_ID')
         self.token = os.getenv('CAREER_API_TOKEN')
 
-    def find_career(self, keyword):
+        # All calls share one pooled keep-alive client with the auth headers built once
+        self.client = AsyncHttpClient(headers={
+            'Content-Type': 'application/json',
+            'Authorization': 'Bearer ' + (self.token or '')
+        })
+
+    async def _get(self, breaker, url, params=None):
+        """GET through an endpoint's circuit breaker.
+
+        Raises CircuitOpenError while the circuit is open and UpstreamError if
+        the request fails, so the cached methods can fall back to stale data.
+        """
+        breaker.before_call()
+        start = time.monotonic()
+        with track_upstream(breaker.name):
+            try:
+                response = await self.client.get(url, params=params)
+            except Exception as e:
+                breaker.record_failure()
+                raise UpstreamError(f"{breaker.name} request failed: {str(e)}") from e
+            if response.status_code in RETRY_STATUS_CODES:
+                breaker.record_failure()
+                raise UpstreamError(f"{breaker.name} request failed: {response.status_code}")
+        breaker.record_success(time.monotonic() - start)
+        return response
+
+    @async_cached(search_cache, lambda self, keyword: ('search', normalize_key(keyword)), search_flight, stale_on=(UpstreamError,))
+    async def find_career(self, keyword):
         """Search for careers based on a keyword."""
         jobs_url = f'{self.base_url}{self.user_id}/{keyword}/N/0/10'
-        
-        headers = {
-            'Content-Type': 'application/json',
-            'Authorization': 'Bearer ' + self.token
-        }
 
-        response = requests.get(jobs_url, headers=headers)
+        response = await self._get(search_breaker, jobs_url)
 
         if response.status_code == 200:
-            data = response.json()
-            occupations = data.get("OccupationList", [])
-            return [{"OnetTitle": item["OnetTitle"], "OnetCode": item["OnetCode"], "OccupationDescription": item["OccupationDescription"]} for item in occupations]
+            careers = parse_occupation_list(response.json())
+            await run_blocking(index_occupations, careers)
+            return careers
         else:
             print(f"Error fetching occupation details: {response.status_code}")
             return None
 
-    def get_career_videos(self, onetCode):
+    @async_cached(video_cache, lambda self, onetCode: ('videos', normalize_key(onetCode)), video_flight)
+    async def get_career_videos(self, onetCode):
         """Get videos specifically for a career."""
-        videos_url = f'https://api.careeronestop.org/v1/video/{self.user_id}/{onetCode}'
-        
-        headers = {
-            'Content-Type': 'application/json',
-            'Authorization': 'Bearer ' + self.token
-        }
+        videos_url = f'{CAREER_API_BASE_URL}video/{self.user_id}/{onetCode}'
 
         try:
-            response = requests.get(videos_url, headers=headers)
+            response = await self._get(video_breaker, videos_url)
             if response.status_code == 200:
-                data = response.json()
-                videos = data.get("Videos", [])
-                if videos and len(videos) > 0:
-                    video = videos[0]
-                    if video.get("URL"):
-                        return video.get("URL")
+                return parse_video_url(response.json())
             return None
         except Exception as e:
             print(f"Error fetching videos: {str(e)}")
             return None
 
+    @async_cached(detail_cache, lambda self, onetID, location: ('detail', normalize_key(onetID), normalize_key(location)), detail_flight,
+                  stale_on=(UpstreamError,), mark_stale=lambda career_data: career_data.replace(stale=True))
+    async def get_career_data(self, onetID, location):
+        """Get detailed information about a specific career (videos and details fetched concurrently)."""
+        occupation_url = f'{self.base_url}{self.user_id}/{onetID}/{location}'
+
+        video_url, response = await asyncio.gather(
+            self.get_career_videos(onetID),
+            self._get(detail_breaker, occupation_url, params=OCCUPATION_DETAIL_PARAMS)
+        )
+
+        if response.status_code == 200:
+            return parse_occupation_detail(response.json(), onetID, location, video_url)
+
+        return None
+
+class CareerMatch:
+    """Blocking interface to the CareerOneStop API.
+
+    Each method runs the matching AsyncCareerMatch coroutine on the background
+    event loop, so sync and async callers share one client, one set of caches
+    and the same in-flight lookups. Don't call these from the loop itself.
+    """
+
+    def find_career(self, keyword):
+        """Search for careers based on a keyword."""
+        return run_coroutine(get_async_career_match().find_career(keyword))
+
+    def get_career_videos(self, onetCode):
+        """Get videos specifically for a career."""
+        return run_coroutine(get_async_career_match().get_career_videos(onetCode))
+
     def get_career_data(self, onetID, location):
         """Get detailed information about a specific career."""
-        video_url = self.get_career_videos(onetID)
+        return run_coroutine(get_async_career_match().get_career_data(onetID, location))
 
-        occupation_url = f'{self.base_url}{self.user_id}/{onetID}/{location}'
-        
-        headers = {
-            'Content-Type': 'application/json',
-            'Authorization': 'Bearer ' + self.token
-        }
+def parse_occupation_list(data):
+    """Keep the fields we use from an OccupationList search response."""
+    occupations = data.get("OccupationList", [])
+    return [{"OnetTitle": item["OnetTitle"], "OnetCode": item["OnetCode"], "OccupationDescription": item["OccupationDescription"]} for item in occupations]
 
-        params = {
-            "training": True,
-            "interest": False,
-            "videos": True,
-            "tasks": False,
-            "dwas": True,
-            "wages": True,
-            "alternateOnetTitles": False,
-            "projectedEmployment": True,
-            "ooh": True,
-            "stateLMILinks": False,
-            "relatedOnetTitles": True,
-            "skills": False,
-            "knowledge": False,
-            "ability": False,
-            "trainingPrograms": True,
-            "industryEmpPattern": False,
-            "toolsAndTechnology": False,
-            "workValues": False,
-            "enableMetaData": True
-        }
+def parse_video_url(data):
+    """Get the first video URL from a Videos response, or None."""
+    videos = data.get("Videos", [])
+    if videos and len(videos) > 0:
+        video = videos[0]
+        if video.get("URL"):
+            return video.get("URL")
+    return None
 
-        response = requests.get(occupation_url, headers=headers, params=params)
-
-        if response.status_code == 200:
-            data = response.json()
-            if data.get("RecordCount", 0) > 0:
-                occupation_detail = data['OccupationDetail'][0]
-
-                # Process wages
-                entries_to_remove = ("NationalWagesList", "BLSAreaWagesList", "WageYear", "SocData", "SocWageInfo", "SocTitle", "SocDescription")
-                for k in entries_to_remove:
-                    occupation_detail["Wages"].pop(k, None)
-
-                if len(occupation_detail.get("Wages", {}).get("StateWagesList", [])) > 1:
-                    annualWage = occupation_detail.get("Wages", {}).get("StateWagesList")[0].get("Median", "Data Not Available")
-                    hourlyWage = occupation_detail.get("Wages", {}).get("StateWagesList")[1].get("Median", "Data Not Available")
-                elif len(occupation_detail.get("Wages", {}).get("StateWagesList", [])) == 1:
-                    annualWage = occupation_detail.get("Wages", {}).get("StateWagesList")[0].get("Median", "Data Not Available")
-                    hourlyWage = "(Hourly Salary Data Not Available for this Occupation)"
-                else:
-                    annualWage, hourlyWage = "(Annual Salary Data Not Available for this Occupation)", "(Hourly Salary Data Not Available for this Occupation)"
-
-                # Process projections
-                if len(occupation_detail.get("Projections", {}).get("Projections", [])) > 1:
-                    stateGrowthProjection = int(occupation_detail.get("Projections").get("Projections")[0]["PerCentChange"])
-                    stateName = occupation_detail.get("Projections").get("Projections")[0].get("StateName", "")
-                    nationGrowthProjection = int(occupation_detail.get("Projections").get("Projections")[1]["PerCentChange"])
-                    nationName = occupation_detail.get("Projections").get("Projections")[1].get("StateName", "")
-
-                    stateGrowth = "increase" if stateGrowthProjection > 0 else "not change" if stateGrowthProjection == 0 else "decrease"
-                    nationGrowth = "increase" if nationGrowthProjection > 0 else "not change" if nationGrowthProjection == 0 else "decrease"
-
-                    statement = f"\nWe predict the employment for this job to {stateGrowth} by {stateGrowthProjection}% in {stateName}.\nWe predict the employment for this job to {nationGrowth} by {nationGrowthProjection}% in {nationName}."
-                
-                elif len(occupation_detail.get("Projections", {}).get("Projections", [])) == 1:
-                    stateGrowthProjection = int(occupation_detail.get("Projections").get("Projections")[0]["PerCentChange"])
-                    stateName = occupation_detail.get("Projections").get("Projections")[0].get("StateName", "")
-
-                    stateGrowth = "increase" if stateGrowthProjection > 0 else "not change" if stateGrowthProjection == 0 else "decrease"
-                    statement = f"\nWe predict the employment for this job to {stateGrowth} by {stateGrowthProjection}% in {stateName}."
-                
-                else:
-                    statement = "Projection Data Not Available for this Occupation"
-
-                # Get tasks
-                tasks = []
-                for dwa in occupation_detail.get("Dwas", {})[:10]:
-                    tasks.append(dwa.get("DwaTitle"))
-
-                # Get related careers
-                relatedCareers = dict(list(occupation_detail.get("RelatedOnetTitles", {}).items())[:8])
-
-                # Format links
-                volunteer_link = f"https://www.volunteermatch.org/search/?l={location}&k={occupation_detail.get('OnetTitle')}&v=true"
-                
-                # Try alternate video source if primary not available
-                if not video_url:
-                    video_url = occupation_detail.get("COSVideoURL")
-
-                # If still no video, try getting from multimedia
-                if not video_url and occupation_detail.get("Multimedia"):
-                    multimedia = occupation_detail.get("Multimedia", [])
-                    if multimedia and len(multimedia) > 0:
-                        video_url = multimedia[0].get("URL")
-
-                return {
-                    "title": occupation_detail.get("OnetTitle"),
-                    "description": occupation_detail.get("OnetDescription"),
-                    "salary_range": f"Annual: ${annualWage}, Hourly: ${hourlyWage}",
-                    "education_required": occupation_detail.get("EducationTraining", {}).get("EducationTitle", "N/A"),
-                    "daily_tasks": tasks,
-                    "growth_potential": str(occupation_detail.get("BrightOutlook")) + ". This job is/has " + str(occupation_detail.get("BrightOutlookCategory")) + " in employment.",
-                    "growth_projections": statement,
-                    "related_careers": relatedCareers,
-                    "training_programs": [
-                        "Data Science Bootcamp (e.g., DataCamp, Springboard)",
-                        "Machine Learning Specialization (Coursera)",
-                        "Data Engineering Certification (AWS, Google Cloud)",
-                        "Python for Data Science (DataCamp)",
-                        "SQL and Database Management",
-                        "Big Data Technologies (Hadoop, Spark)",
-                        "Data Visualization (Tableau, Power BI)",
-                        "Statistical Analysis and Mathematics",
-                        "Deep Learning Specialization",
-                        "Cloud Data Platforms (AWS, Azure, GCP)"
-                    ] if "data" in occupation_detail.get("OnetTitle", "").lower() or "machine learning" in occupation_detail.get("OnetTitle", "").lower() else occupation_detail.get("TrainingPrograms", [])[:10],
-                    "volunteer_link": volunteer_link,
-                    "video_url": video_url
-                }
+def growth_direction(percent):
+    return "increase" if percent > 0 else "not change" if percent == 0 else "decrease"
 
+def parse_occupation_detail(data, onetID, location, video_url):
+    """Build the OccupationProfile the templates use from an OccupationDetail response, or None."""
+    if data.get("RecordCount", 0) <= 0:
         return None
+    occupation_detail = data['OccupationDetail'][0]
+    title = occupation_detail.get("OnetTitle") or ""
+
+    # Wages: the state's annual median, then its hourly median
+    state_wages = (occupation_detail.get("Wages") or {}).get("StateWagesList") or []
+    annualWage = state_wages[0].get("Median", "Data Not Available") if state_wages else "(Annual Salary Data Not Available for this Occupation)"
+    hourlyWage = state_wages[1].get("Median", "Data Not Available") if len(state_wages) > 1 else "(Hourly Salary Data Not Available for this Occupation)"
+
+    # Projections: the state's, then the nation's
+    statement = ""
+    for projection in ((occupation_detail.get("Projections") or {}).get("Projections") or [])[:2]:
+        percent = int(projection["PerCentChange"])
+        statement += f"\nWe predict the employment for this job to {growth_direction(percent)} by {percent}% in {projection.get('StateName', '')}."
+    statement = statement or "Projection Data Not Available for this Occupation"
+
+    tasks = [dwa.get("DwaTitle") for dwa in (occupation_detail.get("Dwas") or [])[:10]]
+    relatedCareers = dict(list((occupation_detail.get("RelatedOnetTitles") or {}).items())[:8])
+
+    # Try alternate video sources if the Videos endpoint had none
+    if not video_url:
+        video_url = occupation_detail.get("COSVideoURL")
+    if not video_url and occupation_detail.get("Multimedia"):
+        video_url = occupation_detail["Multimedia"][0].get("URL")
+
+    if "data" in title.lower() or "machine learning" in title.lower():
+        training_programs = DATA_TRAINING_PROGRAMS
+    else:
+        training_programs = (occupation_detail.get("TrainingPrograms") or [])[:10]
+
+    return OccupationProfile(
+        onet_code=onetID,
+        title=occupation_detail.get("OnetTitle"),
+        description=occupation_detail.get("OnetDescription"),
+        salary_range=f"Annual: ${annualWage}, Hourly: ${hourlyWage}",
+        education_required=(occupation_detail.get("EducationTraining") or {}).get("EducationTitle", "N/A"),
+        daily_tasks=tasks,
+        growth_potential=str(occupation_detail.get("BrightOutlook")) + ". This job is/has " + str(occupation_detail.get("BrightOutlookCategory")) + " in employment.",
+        growth_projections=statement,
+        related_careers=relatedCareers,
+        training_programs=training_programs,
+        volunteer_link=build_volunteer_link(occupation_detail.get('OnetTitle'), location),
+        video_url=video_url
+    )
 
-# Create a global instance of CareerMatch
-career_match = CareerMatch()
+def build_volunteer_link(title, location):
+    """Build the VolunteerMatch search link for a career title."""
+    return f"https://www.volunteermatch.org/search/?l={location}&k={title}&v=true"
 
-# Add this after the career_match initialization
+def index_occupations(careers):
+    """Record the ONET code of every occupation in a search response."""
+    for career in careers:
+        title_index.set(normalize_key(career["OnetTitle"]), {"code": career["OnetCode"], "title": career["OnetTitle"]})
+
+def get_async_career_match():
+    """Get the shared CareerOneStop client, creating it on first use."""
+    global _async_career_match
+    if _async_career_match is None:
+        with _career_match_lock:
+            if _async_career_match is None:
+                _async_career_match = AsyncCareerMatch()
+    return _async_career_match
+
+def get_career_match():
+    """Get the blocking wrapper around the shared CareerOneStop client."""
+    global _career_match
+    if _career_match is None:
+        with _career_match_lock:
+            if _career_match is None:
+                _career_match = CareerMatch()
+    return _career_match
+
+# Default careers for recommendations and the snapshot
 TECH_CAREERS = [
     "Software Developer",
     "Data Scientist",
@@ -213,73 +332,355 @@ TECH_CAREERS = [
     "Quantum Computing Engineer"
 ]
 
+def get_cache_stats():
+    """Get hit/miss/eviction counters for each CareerOneStop response cache and the quiz results cache."""
+    return {
+        'search': search_cache.stats(),
+        'videos': video_cache.stats(),
+        'detail': detail_cache.stats(),
+        'quiz': quiz_cache.stats()
+    }
+
+def get_breaker_stats():
+    """Get the state of each CareerOneStop endpoint's circuit breaker."""
+    return {
+        'search': search_breaker.stats(),
+        'videos': video_breaker.stats(),
+        'detail': detail_breaker.stats()
+    }
+
+def get_singleflight_stats():
+    """Get how many CareerOneStop calls and quiz submissions were coalesced onto an identical in-flight one."""
+    return {
+        'search': search_flight.stats(),
+        'videos': video_flight.stats(),
+        'detail': detail_flight.stats(),
+        'quiz': quiz_flight.stats()
+    }
+
+def get_prefetch_stats():
+    """Get how many related careers were prefetched, skipped as cached or dropped."""
+    return {'related': related_prefetcher.stats()}
+
+BREAKER_STATE_VALUES = {'closed': 0, 'half_open': 1, 'open': 2}
+
+def collect_metrics():
+    """Report the cache, circuit breaker, single-flight and prefetch counters as metric families."""
+    hits, misses, entries = [], [], []
+    for name, stats in get_cache_stats().items():
+        tiers = stats.items() if 'memory' in stats else [('memory', stats)]
+        for tier, tier_stats in tiers:
+            labels = {'cache': name, 'tier': tier}
+            hits.append((labels, tier_stats['hits']))
+            misses.append((labels, tier_stats['misses']))
+            if tier_stats['size'] is not None:
+                entries.append((labels, tier_stats['size']))
+
+    breakers = get_breaker_stats()
+    flights = get_singleflight_stats()
+    prefetches = [({'prefetcher': name, 'outcome': outcome}, stats[outcome])
+                  for name, stats in get_prefetch_stats().items()
+                  for outcome in ('prefetched', 'skipped', 'dropped', 'errors')]
+    return [
+        ('career_cache_hits_total', 'counter', 'Cache lookups answered from the cache.', hits),
+        ('career_cache_misses_total', 'counter', 'Cache lookups that missed.', misses),
+        ('career_cache_entries', 'gauge', 'Entries held by a cache.', entries),
+        ('career_breaker_state', 'gauge', 'Circuit breaker state (0 closed, 1 half-open, 2 open).',
+         [({'endpoint': name}, BREAKER_STATE_VALUES[stats['state']]) for name, stats in breakers.items()]),
+        ('career_breaker_rejected_total', 'counter', 'Calls failed fast by an open circuit.',
+         [({'endpoint': name}, stats['rejected']) for name, stats in breakers.items()]),
+        ('career_singleflight_coalesced_total', 'counter', 'Lookups that shared an identical in-flight call.',
+         [({'flight': name}, stats['coalesced']) for name, stats in flights.items()]),
+        ('career_prefetch_total', 'counter', 'Background lookups of related careers, by outcome.', prefetches)
+    ]
+
+REGISTRY.add_collector(collect_metrics)
+
+def build_career_documents():
+    """Collect the careers the recommendation engine ranks.
+
+    These are the Career Explorer careers and TECH_CAREERS, with the ONET
+    description and daily tasks from the snapshot merged in where the title
+    resolves to a snapshot occupation, plus the snapshot's other tech
+    occupations (e.g. related careers).
+    """
+    documents = {}
+    for career in catalog.careers:
+        document = documents.setdefault(normalize_key(career['title']), {
+            'title': career['title'], 'category': [], 'description': [], 'tasks': []
+        })
+        document['category'].append(career['category'])
+        document['description'].append(career['description'])
+    for title in TECH_CAREERS:
+        documents.setdefault(normalize_key(title), {'title': title, 'category': [], 'description': [], 'tasks': []})
+
+    occupations = snapshot.get_snapshot()['occupations']
+    merged = set()
+    for document in documents.values():
+        onet_code = snapshot.get_onet_code(document['title'])
+        occupation = occupations.get(onet_code)
+        if occupation and onet_code not in merged:
+            document['description'].append(occupation.get('description') or '')
+            document['tasks'].extend(occupation.get('daily_tasks') or [])
+            merged.add(onet_code)
+
+    for onet_code, occupation in occupations.items():
+        key = normalize_key(occupation.get('title') or '')
+        if onet_code in merged or not key or key in documents or not tech_matcher.matches(occupation['title']):
+            continue
+        documents[key] = {
+            'title': occupation['title'],
+            'category': [],
+            'description': [occupation.get('description') or ''],
+            'tasks': occupation.get('daily_tasks') or []
+        }
+    return list(documents.values())
+
+def get_career_index():
+    """Get the recommendation index, building it on first use."""
+    global _career_index
+    if _career_index is None:
+        with _career_index_lock:
+            if _career_index is None:
+                _career_index = CareerIndex(build_career_documents())
+    return _career_index
+
+def get_career_features():
+    """Get the careers x quiz-option feature matrix, building it on first use."""
+    global _career_features
+    if _career_features is None:
+        # NumPy is only imported once a quiz needs scoring
+        from career_features import FeatureMatrix
+
+        index = get_career_index()
+        with _career_index_lock:
+            if _career_features is None:
+                _career_features = FeatureMatrix(index)
+    return _career_features
+
 def get_career_recommendations(interests, strengths, skills, personality):
-    """Get career recommendations based on user inputs."""
+    """Get career recommendations based on user inputs.
+
+    Each answer is one of the quiz's options (see career_features) or free
+    text. Careers are scored locally with no network call; their details
+    are fetched (and cached) separately.
+    """
     try:
-        # First, get API-based recommendations
-        search_query = f"{interests} {strengths} {skills} {personality}"
-        api_careers = career_match.find_career(search_query)
-        
-        # Initialize results with tech careers
-        recommended_careers = TECH_CAREERS.copy()
-        
-        # Add API-based careers if they exist
-        if api_careers:
-            api_career_titles = [career["OnetTitle"] for career in api_careers]
-            # Add unique API careers to our list
-            for career in api_career_titles:
-                if career not in recommended_careers:
-                    recommended_careers.append(career)
-        
-        # Filter for tech-related careers
-        tech_keywords = [
-            'software', 'programming', 'developer', 'engineer', 'data', 'security',
-            'cloud', 'devops', 'ai', 'machine learning', 'cyber', 'web', 'mobile',
-            'computer', 'information', 'technology', 'system', 'network', 'database',
-            'application', 'code', 'digital', 'technical', 'robotics', 'automation',
-            'blockchain', 'quantum', 'virtual', 'augmented', 'reality', 'iot'
-        ]
-        
-        filtered_careers = []
-        for career in recommended_careers:
-            career_lower = career.lower()
-            if any(keyword in career_lower for keyword in tech_keywords):
-                filtered_careers.append(career)
-        
-        # If we have filtered careers, return them; otherwise return the original list
-        return filtered_careers[:7] if filtered_careers else recommended_careers[:7]
-        
+        answers = {
+            'interests': interests,
+            'strengths': strengths,
+            'skills': skills,
+            'personality': personality
+        }
+        features = get_career_features()
+        scores = features.scores(answers)
+
+        # Free-text answers are matched against the careers' text instead
+        free_text = {field: value for field, value in answers.items() if value and not features.has_option(field, value)}
+        if free_text:
+            text_scores = features.dense(get_career_index().score_all(free_text))
+            if text_scores.max() > 0:
+                # On the same scale as the features: the best match scores its fields' weights
+                weight = sum(QUIZ_FIELD_WEIGHTS.get(field, 1.0) for field in free_text)
+                scores = scores + text_scores * (weight / text_scores.max())
+
+        careers = [title for title, score in features.top_k(scores, RECOMMENDATION_COUNT)]
+
+        # Fill up with the default tech careers when only a few careers match
+        for career in TECH_CAREERS:
+            if len(careers) >= RECOMMENDATION_COUNT:
+                break
+            if career not in careers:
+                careers.append(career)
+        return careers
+
     except Exception as e:
         print(f"Error getting career recommendations: {str(e)}")
-        return TECH_CAREERS[:7]  # Return top 7 tech careers as fallback
+        return TECH_CAREERS[:RECOMMENDATION_COUNT]  # Return top tech careers as fallback
 
-def get_career_data(career_name):
+def lookup_occupation(career_name):
+    """Resolve a career title to its ONET code and title without any network call.
+
+    Checks the offline snapshot, then the title index. Returns a dict with
+    "code" and "title", or None if the title isn't known yet.
+    """
+    key = normalize_key(career_name)
+
+    onet_code = snapshot.get_onet_code(key)
+    if onet_code:
+        occupation = snapshot.get_occupation(onet_code) or {}
+        return {"code": onet_code, "title": occupation.get("title", career_name)}
+
+    return title_index.get(key)
+
+async def resolve_occupation_async(career_name):
+    """Resolve a career title to its ONET code and title, searching if it isn't known yet."""
+    occupation = await run_blocking(lookup_occupation, career_name)
+    if occupation:
+        return occupation
+
+    careers = await get_async_career_match().find_career(career_name)
+    if not careers:
+        return None
+
+    # Remember which occupation this exact title resolved to
+    occupation = {"code": careers[0]["OnetCode"], "title": careers[0]["OnetTitle"]}
+    await title_index.aset(normalize_key(career_name), occupation)
+    return occupation
+
+async def get_career_data_by_code_async(onet_code):
+    """Get detailed information about a career from its ONET code."""
+    # The code ends up in the request URL, so only well-formed ones are looked up
+    if not snapshot.ONET_CODE_PATTERN.match(str(onet_code)):
+        print(f"Invalid ONET code: {onet_code}")
+        return None
+    try:
+        # The first snapshot lookup reads and unzips the file, so it runs off the loop
+        career_data = await run_blocking(snapshot.get_occupation, onet_code, DEFAULT_LOCATION)
+        if career_data:
+            return career_data
+        return await get_async_career_match().get_career_data(onet_code, DEFAULT_LOCATION)
+    except Exception as e:
+        print(f"Error getting career data: {str(e)}")
+        return None
+
+def is_occupation_cached(onet_code):
+    """Check whether a career page for this ONET code would need no detail lookup.
+
+    Doesn't count as a detail cache lookup in the cache stats.
+    """
+    if snapshot.get_occupation(onet_code, DEFAULT_LOCATION):
+        return True
+    return detail_cache.contains(('detail', normalize_key(onet_code), normalize_key(DEFAULT_LOCATION)))
+
+async def is_occupation_cached_async(onet_code):
+    """is_occupation_cached() for the prefetcher; the snapshot and disk reads run off the loop."""
+    return await run_blocking(is_occupation_cached, onet_code)
+
+async def prefetch_occupation(onet_code):
+    """Fetch an occupation into the detail cache, raising UpstreamError if no fresh data came back."""
+    career_data = await get_async_career_match().get_career_data(onet_code, DEFAULT_LOCATION)
+    if not career_data or career_data.get('stale'):
+        raise UpstreamError(f"No occupation data for {onet_code}")
+
+def upstream_idle():
+    """Whether background lookups may run: the detail endpoint is healthy and request lookups have room."""
+    return detail_breaker.state == CLOSED and not get_fetch_semaphore().locked()
+
+related_prefetcher = Prefetcher('related', prefetch_occupation, workers=PREFETCH_WORKERS,
+                                max_queued=PREFETCH_QUEUE, budget=PREFETCH_BUDGET,
+                                skip=is_occupation_cached_async, idle=upstream_idle)
+
+def prefetch_related_careers(career_data):
+    """Warm the cache with the careers a career page links to, in the background."""
+    related_prefetcher.submit(snapshot.related_onet_codes(career_data)[:PREFETCH_QUEUE])
+
+async def get_career_data_async(career_name):
     """Get detailed information about a specific career."""
     try:
-        # First find the career to get its OnetCode
-        careers = career_match.find_career(career_name)
-        if not careers:
+        occupation = await resolve_occupation_async(career_name)
+        if not occupation:
             return None
-            
-        # Get the first matching career's OnetCode
-        onetCode = careers[0]["OnetCode"]
-        
-        # Get detailed data using the OnetCode
-        return career_match.get_career_data(onetCode, "95747")  # Default to my area code if no location specified
+        return await get_career_data_by_code_async(occupation["code"])
     except Exception as e:
         print(f"Error getting career data: {str(e)}")
         return None
 
+def get_fetch_semaphore():
+    """Get the process-wide bound on concurrent career lookups (call on the background loop)."""
+    global _fetch_semaphore
+    if _fetch_semaphore is None:
+        _fetch_semaphore = asyncio.Semaphore(FETCH_MAX_WORKERS)
+    return _fetch_semaphore
+
+async def get_career_data_many_async(career_names, deadline=FETCH_DEADLINE):
+    """Get detailed information about several careers concurrently.
+
+    Lookups from every request share one semaphore, so at most
+    FETCH_MAX_WORKERS run at once per process, and the whole batch is given
+    `deadline` seconds. Careers whose lookup failed or did not finish in time
+    map to None, so callers always get a partial result back.
+    """
+    semaphore = get_fetch_semaphore()
+
+    async def fetch(career_name):
+        async with semaphore:
+            return await get_career_data_async(career_name)
+
+    tasks = {}
+    for name in career_names:
+        if name not in tasks:
+            tasks[name] = asyncio.ensure_future(fetch(name))
+    if not tasks:
+        return {}
+
+    done, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+    for task in pending:
+        task.cancel()
+
+    results = {}
+    for name, task in tasks.items():
+        if task in done and task.exception() is not None:
+            print(f"Error getting career data for {name}: {str(task.exception())}")
+            results[name] = None
+        elif task in done:
+            results[name] = task.result()
+        else:
+            print(f"Timed out getting career data for: {name}")
+            results[name] = None
+    return results
+
+def quiz_key(interests, strengths, skills, personality):
+    """Normalize a set of quiz answers into one cache key."""
+    return '|'.join(normalize_key(answer or '') for answer in (interests, strengths, skills, personality))
+
+async def get_quiz_results_async(interests, strengths, skills, personality):
+    """Get the recommended careers for a set of quiz answers and the data for each.
+
+    Returns (careers, career_data). Results are cached per normalized set of
+    answers, so a repeated combination needs neither the recommendation
+    engine nor CareerOneStop. Only complete results are cached: a career
+    whose lookup failed, timed out or came from stale data is fetched again
+    next time.
+    """
+    key = quiz_key(interests, strengths, skills, personality)
+    results = await quiz_cache.aget(key)
+    if results is None:
+        async def load():
+            careers = await run_blocking(get_career_recommendations, interests, strengths, skills, personality)
+            career_data = await get_career_data_many_async(careers)
+            results = {'careers': careers, 'career_data': career_data}
+            if all(data and not data.get('stale') for data in career_data.values()):
+                await quiz_cache.aset(key, results)
+            return results
+
+        results = await quiz_flight.do(key, load)
+    return results['careers'], results['career_data']
+
+# Synchronous wrappers running the async lookups on the shared background event loop
+
+def resolve_occupation(career_name):
+    """Resolve a career title to its ONET code and title, searching if it isn't known yet."""
+    return run_coroutine(resolve_occupation_async(career_name))
+
+def get_career_data_by_code(onet_code):
+    """Get detailed information about a career from its ONET code."""
+    return run_coroutine(get_career_data_by_code_async(onet_code))
+
+def get_career_data(career_name):
+    """Get detailed information about a specific career."""
+    return run_coroutine(get_career_data_async(career_name))
+
+def get_career_data_many(career_names, deadline=FETCH_DEADLINE):
+    """Get detailed information about several careers concurrently (see get_career_data_many_async)."""
+    return run_coroutine(get_career_data_many_async(career_names, deadline))
+
 def get_volunteer_opportunities(career, zip_code, radius):
     """Get volunteer opportunities based on career interest and location."""
     try:
-        # Get career data to use the title for volunteer search
-        career_data = get_career_data(career)
-        if not career_data:
-            return []
-            
-        # Use the volunteer link from career data
-        volunteer_link = career_data.get("volunteer_link", "")
+        # Use the ONET title for the volunteer search when we already know it
+        occupation = lookup_occupation(career)
+        volunteer_link = build_volunteer_link(occupation["title"] if occupation else career, DEFAULT_LOCATION)
         
         # Return a list of sample opportunities
         # In a production environment, this would be replaced with actual API calls to volunteer platforms